@@ -6,6 +6,7 @@ Parses given arguments and option and converting them into a config object
 @author: henrik.pilz
 '''
 
+import codecs
 import getopt
 import logging
 from error import HelpCalledException
@@ -23,6 +24,20 @@ class ArgumentParser():
         self.manufacturer = None
         self.dateformat = None
         self.separatorMode = None
+        self.importEngine = 'sax'
+        self.processes = 1
+        self.dtdMode = 'load'
+        self.validators = 0
+        self.progressInterval = 10
+        self.readSize = 1024 * 1024
+        self.excelReader = 'openpyxl'
+        self.encoding = 'utf-8-sig'
+        self.delimiter = None
+        self.preflight = 'none'
+        self.excelExport = 'memory'
+        self.workbookMode = 'cells'
+        self.dryRun = False
+        self.xmlStyle = 'pretty'
 
     def parse(self, argv):
         """
@@ -35,7 +50,21 @@ class ArgumentParser():
                                 ["validation=",
                                  "manufacturer=",
                                  "dateformat=",
-                                 "separators="])
+                                 "separators=",
+                                 "engine=",
+                                 "processes=",
+                                 "dtd=",
+                                 "validators=",
+                                 "progress=",
+                                 "readsize=",
+                                 "excelreader=",
+                                 "encoding=",
+                                 "delimiter=",
+                                 "preflight=",
+                                 "excelexport=",
+                                 "workbook=",
+                                 "dry-run",
+                                 "xmlstyle="])
 
         logging.debug("Options: %s", opts)
 
@@ -84,7 +113,10 @@ class ArgumentParser():
     def _checkForOptions(self, opt, arg):
         """
         check for options, manufacturer, validation mode,
-        separators and date format
+        separators, date format, import engine, processes, dtd mode,
+        validators, progress interval, read size, excel reader,
+        encoding, delimiter, preflight mode, excel export mode, dry run
+        and xml style
 
         @param opt: options
         @param args: arguments
@@ -97,6 +129,102 @@ class ArgumentParser():
             self.separatorMode = arg
         if opt == "--dateformat":
             self.dateformat = arg
+        if opt == "--engine":
+            self.importEngine = arg
+        if opt == "--processes":
+            self.processes = self._parseNumberOfProcesses(arg)
+        if opt == "--dtd":
+            self.dtdMode = arg
+        if opt == "--validators":
+            self.validators = self._parseNumberOfValidators(arg)
+        if opt == "--progress":
+            self.progressInterval = self._parseProgressInterval(arg)
+        if opt == "--readsize":
+            self.readSize = self._parseReadSize(arg)
+        if opt == "--excelreader":
+            self.excelReader = arg
+        if opt == "--encoding":
+            self.encoding = self._parseEncoding(arg)
+        if opt == "--delimiter":
+            self.delimiter = self._parseDelimiter(arg)
+        if opt == "--preflight":
+            self.preflight = arg
+        if opt == "--excelexport":
+            self.excelExport = arg
+        if opt == "--workbook":
+            self.workbookMode = arg
+        if opt == "--dry-run":
+            self.dryRun = True
+        if opt == "--xmlstyle":
+            self.xmlStyle = arg
+
+    def _parseNumberOfProcesses(self, arg):
+        """
+        number of processes has to be a positive integer
+        """
+        try:
+            processes = int(arg)
+        except ValueError:
+            raise MissingArgumentException("Number of processes has to be a positive integer: {0}".format(arg))
+        if processes < 1:
+            raise MissingArgumentException("Number of processes has to be a positive integer: {0}".format(arg))
+        return processes
+
+    def _parseNumberOfValidators(self, arg):
+        """
+        number of validators has to be zero or a positive integer
+        """
+        try:
+            validators = int(arg)
+        except ValueError:
+            raise MissingArgumentException("Number of validators has to be zero or a positive integer: {0}".format(arg))
+        if validators < 0:
+            raise MissingArgumentException("Number of validators has to be zero or a positive integer: {0}".format(arg))
+        return validators
+
+    def _parseProgressInterval(self, arg):
+        """
+        progress interval in seconds has to be zero or a positive number
+        """
+        try:
+            progressInterval = float(arg)
+        except ValueError:
+            raise MissingArgumentException("Progress interval has to be zero or a positive number of seconds: {0}".format(arg))
+        if progressInterval < 0:
+            raise MissingArgumentException("Progress interval has to be zero or a positive number of seconds: {0}".format(arg))
+        return progressInterval
+
+    def _parseReadSize(self, arg):
+        """
+        read size in bytes has to be a positive integer
+        """
+        try:
+            readSize = int(arg)
+        except ValueError:
+            raise MissingArgumentException("Read size has to be a positive number of bytes: {0}".format(arg))
+        if readSize < 1:
+            raise MissingArgumentException("Read size has to be a positive number of bytes: {0}".format(arg))
+        return readSize
+
+    def _parseEncoding(self, arg):
+        """
+        encoding has to be known to python
+        """
+        try:
+            codecs.lookup(arg)
+        except LookupError:
+            raise MissingArgumentException("Unknown encoding: {0}".format(arg))
+        return arg
+
+    def _parseDelimiter(self, arg):
+        """
+        delimiter has to be a single character, 'tab' stands for the tabulator
+        """
+        if arg == "tab":
+            return "\t"
+        if len(arg) != 1:
+            raise MissingArgumentException("Delimiter has to be a single character or 'tab': {0}".format(arg))
+        return arg
 
     def _validateArguments(self):
         """
@@ -128,5 +256,19 @@ class ArgumentParser():
             'dateFormat' : self.dateformat,
             'separatorMode' : self.separatorMode,
             'manufacturerName': self.manufacturer,
-            'validation' : self.validation
+            'validation' : self.validation,
+            'importEngine' : self.importEngine,
+            'processes' : self.processes,
+            'dtdMode' : self.dtdMode,
+            'validators' : self.validators,
+            'progressInterval' : self.progressInterval,
+            'readSize' : self.readSize,
+            'excelReader' : self.excelReader,
+            'encoding' : self.encoding,
+            'delimiter' : self.delimiter,
+            'preflight' : self.preflight,
+            'excelExport' : self.excelExport,
+            'workbookMode' : self.workbookMode,
+            'dryRun' : self.dryRun,
+            'xmlStyle' : self.xmlStyle
         }
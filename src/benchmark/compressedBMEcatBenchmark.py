@@ -0,0 +1,59 @@
+'''
+Created on 18.10.2026
+
+Benchmark fuer komprimierte BMEcats: schreibt einen synthetischen Katalog mit dem BMEcatExporter unkomprimiert, als
+*.xml.gz und, falls das Paket zstandard installiert ist, als *.xml.zst und liest jede Datei wieder mit dem SAX-Import.
+Gemessen werden Laufzeit und die Bytes auf der Platte. Geschrieben und gelesen wird jeweils die ganze Datei, die Bytes
+auf der Platte entsprechen damit ihrer Groesse.
+
+Aufruf aus dem Verzeichnis 'src':
+    python -m benchmark.compressedBMEcatBenchmark [Artikel]
+
+@author: henrik.pilz
+'''
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from benchmark.pyxelExporterMemoryBenchmark import createArticle
+import compressedFile
+from exporter import BMEcatExporter
+from importer import BMEcatImportHandler
+from importer import BMEcatSaxImporter
+from transformer import SeparatorTransformer
+
+
+def measureExport(articles, filename):
+    t1 = time.perf_counter()
+    BMEcatExporter(articles, filename, "nonstrict").writeBMEcatAsXML()
+    return time.perf_counter() - t1
+
+
+def measureImport(filename):
+    importHandler = BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect"))
+    t1 = time.perf_counter()
+    BMEcatSaxImporter(importHandler, loadDTD=False).parse(filename)
+    return time.perf_counter() - t1, len(importHandler.articles['new'])
+
+
+def runBenchmark(numberOfArticles):
+    articles = { 'new' : [ createArticle(index) for index in range(numberOfArticles) ] }
+    extensions = [ "", ".gz" ]
+    if compressedFile.zstandard is not None:
+        extensions.append(".zst")
+    else:
+        print("Paket zstandard nicht installiert, *.xml.zst wird nicht gemessen.")
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in extensions:
+            filename = os.path.join(directory, "benchmark.xml" + extension)
+            exportDuration = measureExport(articles, filename)
+            importDuration, importedArticles = measureImport(filename)
+            print("[benchmark.xml{0}] {1:.1f} MB auf der Platte, Schreiben: {2:.1f} s, Lesen: {3:.1f} s ({4} Artikel)"
+                  .format(extension, os.path.getsize(filename) / 1048576, exportDuration, importDuration, importedArticles))
+
+
+if __name__ == '__main__':
+    logging.disable(logging.CRITICAL)
+    runBenchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,120 @@
+'''
+Created on 18.10.2026
+
+Benchmark fuer den ExcelImporter: erstellt ein synthetisches Mapping-Master-Blatt und misst das Einlesen der Datei
+mit openpyxl und mit dem SpreadsheetMLReader sowie getrennt davon das Erstellen der Artikel aus den bereits gelesenen
+Zeilen entlang des Spaltenplans.
+
+Aufruf aus dem Verzeichnis 'src':
+    python -m benchmark.excelImporterBenchmark [Zeilen] [Spalten] [Wiederholungen]
+
+@author: henrik.pilz
+'''
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from openpyxl import Workbook
+from openpyxl import load_workbook
+
+from importer import ExcelImporter
+from transformer import SeparatorTransformer
+
+
+def createHeader(columns):
+    header = [ "supplierArticleId", "descriptionShort", "descriptionLong", "ean", "manufacturerArticleId", "manufacturerName",
+               "deliveryTime", "orderUnit", "contentUnit", "priceQuantity" ]
+    for order in range(1, 11):
+        header += [ "priceType{0}".format(order), "priceAmount{0}".format(order), "tax{0}".format(order),
+                    "currency{0}".format(order), "lowerBound{0}".format(order) ]
+    for order in range(1, 11):
+        header += [ "mimeType{0}".format(order), "mimeSource{0}".format(order), "mimeDescription{0}".format(order),
+                    "mimePurpose{0}".format(order) ]
+    order = 1
+    while len(header) < columns:
+        header += [ "attributeName{0}".format(order), "attributeValue{0}".format(order) ]
+        order += 1
+    return header[:columns]
+
+
+def createValue(fieldname, rowIndex):
+    if fieldname.startswith("priceType"):
+        return "net_customer"
+    if fieldname.startswith("priceAmount"):
+        return 10.5
+    if fieldname.startswith("tax"):
+        return 0.19
+    if fieldname.startswith("currency"):
+        return "EUR"
+    if fieldname.startswith("lowerBound"):
+        return int(fieldname[len("lowerBound"):])
+    if fieldname.startswith("mimeType"):
+        return "image/jpeg"
+    if fieldname.startswith("mimeSource"):
+        return "bilder/{0}_{1}.jpg".format(rowIndex, fieldname[len("mimeSource"):])
+    if fieldname.startswith("mimePurpose"):
+        return "normal"
+    if fieldname in ("deliveryTime", "priceQuantity"):
+        return 1
+    if fieldname in ("orderUnit", "contentUnit"):
+        return "C62"
+    if fieldname == "ean":
+        return "4006381333931"
+    return "{0} {1}".format(fieldname, rowIndex)
+
+
+def createWorkbook(filename, rows, columns):
+    header = createHeader(columns)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Mapping-Master")
+    sheet.append(header)
+    for rowIndex in range(2, rows + 2):
+        sheet.append([ createValue(fieldname, rowIndex) for fieldname in header ])
+    workbook.save(filename)
+
+
+def readRows(filename):
+    workbook = load_workbook(filename, read_only=True)
+    rows = list(workbook["Mapping-Master"].iter_rows(min_row=2, values_only=True))
+    workbook.close()
+    return rows
+
+
+def measureCreateProducts(importer, rows, repetitions):
+    durations = []
+    for _ in range(repetitions):
+        t1 = time.perf_counter()
+        for rowIndex, row in enumerate(rows, start=2):
+            importer._createProduct(rowIndex, row)
+        durations.append(time.perf_counter() - t1)
+    return min(durations)
+
+
+def runBenchmark(rows, columns, repetitions):
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "benchmark.xlsx")
+        t1 = time.perf_counter()
+        createWorkbook(filename, rows, columns)
+        print("Synthetisches Blatt mit {0} Zeilen und {1} Spalten erstellt: {2:.1f} s".format(rows, columns, time.perf_counter() - t1))
+
+        for reader in [ "openpyxl", "spreadsheetml" ]:
+            importer = ExcelImporter(SeparatorTransformer("english"), reader=reader)
+            t2 = time.perf_counter()
+            importer.readWorkbook(filename)
+            duration = time.perf_counter() - t2
+            print("[readWorkbook, {0}] Laufzeit: {1:.3f} s, Zeilen pro Sekunde: {2:.0f}".format(reader, duration, rows / duration))
+
+        cachedRows = readRows(filename)
+        best = measureCreateProducts(importer, cachedRows, repetitions)
+        print("[Spaltenplan] Beste Laufzeit aus {0} Durchlaeufen: {1:.3f} s".format(repetitions, best))
+        print("[Spaltenplan] Zeilen pro Sekunde: {0:.0f}".format(rows / best))
+
+
+if __name__ == '__main__':
+    logging.disable(logging.CRITICAL)
+    numberOfRows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    numberOfColumns = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    numberOfRepetitions = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    runBenchmark(numberOfRows, numberOfColumns, numberOfRepetitions)
@@ -0,0 +1,104 @@
+'''
+Created on 18.10.2026
+
+Micro-Benchmark fuer den BMEcatImportHandler: misst die verarbeiteten Start- und Endtags pro Sekunde mit der
+Dispatch-Tabelle je Tag und ohne sie, d.h. wenn der Handler fuer jeden Tag bei jedem Aufruf neu ermittelt wird.
+
+Aufruf aus dem Verzeichnis 'src':
+    python -m benchmark.importHandlerBenchmark [Dateiname in test_data] [Wiederholungen]
+
+@author: henrik.pilz
+'''
+from xml.sax import make_parser
+from xml.sax import handler
+import logging
+import os
+import sys
+import time
+
+from importer import BMEcatImportHandler
+from importer import BMEcatIterparseImporter
+from resolver import DTDResolver
+
+
+testDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "test_data")
+
+
+class _NoCache(dict):
+    '''
+    Cache, der nichts behaelt: jeder Zugriff schlaegt fehl und der Handler wird erneut ermittelt
+    '''
+
+    def __setitem__(self, key, value):
+        pass
+
+
+class UncachedImportHandler(BMEcatImportHandler):
+    '''
+    BMEcatImportHandler ohne Dispatch-Tabelle: Kleinschreibung, Alias, Handlername, getattr und Debug-Meldung werden
+    wie vor der Tabelle fuer jeden Start- und Endtag neu ausgefuehrt
+    '''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._BMEcatImportHandler__startHandlerCache = _NoCache()
+        self._BMEcatImportHandler__endHandlerCache = _NoCache()
+
+
+class TagCounter(handler.ContentHandler):
+    '''
+    zaehlt die Start- und Endtags einer Datei
+    '''
+
+    def __init__(self):
+        self.events = 0
+
+    def startElement(self, name, attrs):
+        self.events += 1
+
+    def endElement(self, name):
+        self.events += 1
+
+
+def parse(filename, contentHandler):
+    parser = make_parser()
+    parser.setContentHandler(contentHandler)
+    parser.setEntityResolver(DTDResolver())
+    parser.parse("file:" + filename)
+
+
+def countEvents(filename):
+    counter = TagCounter()
+    parse(filename, counter)
+    return counter.events
+
+
+def parseWithIterparse(filename, importHandler):
+    BMEcatIterparseImporter(importHandler).parse(filename)
+
+
+def measure(filename, repetitions, parseMethod, handlerClass):
+    durations = []
+    for _ in range(repetitions):
+        t1 = time.perf_counter()
+        parseMethod(filename, handlerClass("%Y-%m-%d"))
+        durations.append(time.perf_counter() - t1)
+    return min(durations)
+
+
+def runBenchmark(filename, repetitions):
+    events = countEvents(filename)
+    print("Datei: {0}".format(os.path.basename(filename)))
+    print("Tags (Start + Ende): {0}".format(events))
+    for engine, parseMethod in [("sax", parse), ("lxml", parseWithIterparse)]:
+        for dispatch, handlerClass in [("ohne Dispatch-Tabelle", UncachedImportHandler), ("mit Dispatch-Tabelle", BMEcatImportHandler)]:
+            best = measure(filename, repetitions, parseMethod, handlerClass)
+            print("[{0}, {1}] Beste Laufzeit aus {2} Durchlaeufen: {3:.3f} s, Tags pro Sekunde: {4:.0f}"
+                  .format(engine, dispatch, repetitions, best, events / best))
+
+
+if __name__ == '__main__':
+    logging.disable(logging.CRITICAL)
+    inputfile = sys.argv[1] if len(sys.argv) > 1 else "testCreateExcelUserDefinedExtensionHaveFeatures.xml"
+    numberOfRepetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    runBenchmark(os.path.join(testDataPath, inputfile), numberOfRepetitions)
@@ -0,0 +1,110 @@
+'''
+Created on 18.10.2026
+
+Speicher-Benchmark fuer den PyxelExporter: erstellt einen synthetischen Katalog und misst den maximalen
+Speicherverbrauch (peak RSS) des Prozesses nach dem Aufbau des Katalogs, nach dem Erstellen des Exporters und nach dem
+Schreiben der Excel-Datei. Zum Vergleich wird der Katalog in einem zweiten Prozess vorher einmal tief kopiert, wie es der
+Exporter frueher selbst getan hat. Ausserdem wird die Mappe einmal im write_only-Modus und einmal als normale Mappe
+geschrieben.
+
+Jede Messung laeuft in einem eigenen Prozess, da peak RSS nur waechst. Nur unter Unix (Modul resource).
+
+Aufruf aus dem Verzeichnis 'src':
+    python -m benchmark.pyxelExporterMemoryBenchmark [Artikel]
+
+@author: henrik.pilz
+'''
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import logging
+import os
+import resource
+import sys
+import tempfile
+
+from datamodel import Feature
+from datamodel import FeatureSet
+from datamodel import Mime
+from datamodel import OrderDetails
+from datamodel import Price
+from datamodel import PriceDetails
+from datamodel import Product
+from datamodel import ProductDetails
+from exporter import PyxelExporter
+
+
+def createArticle(index):
+    article = Product()
+    article.productId = "{0:08d}".format(index)
+    article.details = ProductDetails()
+    article.details.title = "Artikel {0}".format(index)
+    article.details.description = "Beschreibung des Artikels {0} ".format(index) * 5
+    article.details.ean = "4006381333931"
+    article.details.manufacturerName = "Hersteller"
+    article.details.deliveryTime = 3
+    article.orderDetails = OrderDetails()
+    article.orderDetails.orderUnit = "C62"
+    article.orderDetails.contentUnit = "C62"
+    article.orderDetails.priceQuantity = 1
+    article.orderDetails.quantityMin = 1
+    article.orderDetails.quantityInterval = 1
+    priceDetails = PriceDetails()
+    for priceType in [ "net_customer", "net_list" ]:
+        price = Price()
+        price.priceType = priceType
+        price.amount = 10.5
+        price.tax = 0.19
+        price.currency = "EUR"
+        price.lowerBound = 1
+        priceDetails.addPrice(price)
+    article.addPriceDetails(priceDetails)
+    for order in range(1, 4):
+        mime = Mime()
+        mime.mimeType = "image/jpeg"
+        mime.source = "bilder/{0}_{1}.jpg".format(index, order)
+        mime.purpose = "normal"
+        mime.order = order
+        article.addMime(mime)
+    featureSet = FeatureSet()
+    for order in range(1, 21):
+        feature = Feature()
+        feature.name = "Attribut {0}".format(order)
+        feature.addValue("Wert {0}".format(order))
+        featureSet.addFeature(feature)
+    article.addFeatureSet(featureSet)
+    return article
+
+
+def peakRssInMB():
+    # ru_maxrss ist unter Linux in Kilobyte angegeben
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(numberOfArticles, copyCatalog, writeOnly):
+    logging.disable(logging.CRITICAL)
+    start = peakRssInMB()
+    articles = { 'new' : [ createArticle(index) for index in range(numberOfArticles) ] }
+    catalog = peakRssInMB()
+    if copyCatalog:
+        articles = copy.deepcopy(articles)
+    with tempfile.TemporaryDirectory() as directory:
+        exporter = PyxelExporter(articles, os.path.join(directory, "benchmark.xlsx"), writeOnly=writeOnly)
+        created = peakRssInMB()
+        exporter.createNewWorkbook()
+        written = peakRssInMB()
+    return start, catalog, created, written
+
+
+def runBenchmark(numberOfArticles):
+    for copyCatalog, writeOnly in [ (True, False), (False, False), (False, True) ]:
+        # jede Messung in einem frischen Prozess
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            start, catalog, created, written = executor.submit(measure, numberOfArticles, copyCatalog, writeOnly).result()
+        catalogSize = catalog - start
+        label = "{0}, {1}".format("mit Kopie" if copyCatalog else "ohne Kopie", "write_only" if writeOnly else "normale Mappe")
+        print("[{0}] Katalog: {1:.0f} MB, Exporter erstellt: +{2:.0f} MB ({3:.2f}x Katalog), nach dem Schreiben: +{4:.0f} MB ({5:.2f}x Katalog)"
+              .format(label, catalogSize, created - catalog, (created - start) / catalogSize, written - catalog, (written - start) / catalogSize))
+
+
+if __name__ == '__main__':
+    runBenchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,83 @@
+'''
+Created on 18.10.2026
+
+Benchmark fuer den Export von BMEcat nach Excel: erstellt aus dem Artikel einer Testdatei einen grossen BMEcat und misst
+Laufzeit und maximalen Speicherverbrauch (peak RSS) der Konvertierung mit --excelexport=memory und
+--excelexport=streaming. Jede Messung laeuft in einem eigenen Prozess, da peak RSS nur waechst. Nur unter Unix
+(Modul resource).
+
+Der BMEcat wird per mmap gelesen, die gelesenen Seiten der Datei zaehlen mit zum RSS. Sie gehoeren zum Dateicache und
+koennen vom Betriebssystem jederzeit freigegeben werden.
+
+Aufruf aus dem Verzeichnis 'src':
+    python -m benchmark.xmlToExcelStreamingBenchmark [Artikel]
+
+@author: henrik.pilz
+'''
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+
+from argumentParser import ArgumentParser
+from converter import Converter
+
+
+testDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "test_data")
+articleTemplateFile = "testCreateExcelFromBMEcatFullDataStrictValidation.xml"
+
+
+def createBMEcat(filename, numberOfArticles):
+    with open(os.path.join(testDataPath, articleTemplateFile), encoding="UTF-8") as file:
+        content = file.read()
+    articleStart = content.index("<ARTICLE ")
+    articleEnd = content.index("</ARTICLE>") + len("</ARTICLE>")
+    article = content[articleStart:articleEnd]
+    with open(filename, "w", encoding="UTF-8") as file:
+        file.write(content[:articleStart])
+        for index in range(numberOfArticles):
+            file.write(re.sub(r"<SUPPLIER_AID>[^<]*</SUPPLIER_AID>", "<SUPPLIER_AID>{0:08d}</SUPPLIER_AID>".format(index), article))
+            file.write("\n    ")
+        file.write(content[articleEnd:])
+
+
+def peakRssInMB():
+    # ru_maxrss ist unter Linux in Kilobyte angegeben
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(inputfile, outputfile, excelExport):
+    logging.disable(logging.CRITICAL)
+    argumentParser = ArgumentParser()
+    argumentParser.parse(['-i', inputfile, '-o', outputfile, '--dateformat=%Y-%m-%d', '--separators=detect', '--progress=0', '--excelexport=' + excelExport])
+    start = peakRssInMB()
+    t1 = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        # die Zeitangaben des Converters nicht mit ausgeben
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            Converter(argumentParser.getConfig()).convert()
+        finally:
+            sys.stdout = stdout
+    return time.perf_counter() - t1, start, peakRssInMB()
+
+
+def runBenchmark(numberOfArticles):
+    with tempfile.TemporaryDirectory() as directory:
+        inputfile = os.path.join(directory, "benchmark.xml")
+        createBMEcat(inputfile, numberOfArticles)
+        print("BMEcat: {0} Artikel, {1:.1f} MB".format(numberOfArticles, os.path.getsize(inputfile) / 1048576))
+        for excelExport in [ "memory", "streaming" ]:
+            # jede Messung in einem frischen Prozess
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                duration, start, peak = executor.submit(measure, inputfile, os.path.join(directory, excelExport + ".xlsx"), excelExport).result()
+            print("[{0}] Laufzeit: {1:.1f} s, Speicher: +{2:.0f} MB".format(excelExport, duration, peak - start))
+
+
+if __name__ == '__main__':
+    logging.disable(logging.CRITICAL)
+    runBenchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,77 @@
+'''
+Created on 18.10.2026
+
+Komprimierte BMEcats: das Verfahren wird an der Dateiendung erkannt, z.B. katalog.xml.gz oder katalog.xml.zst.
+Gelesen und geschrieben wird als Datenstrom, ohne unkomprimierte Kopie auf der Platte.
+
+@author: henrik.pilz
+'''
+import gzip
+import os
+
+from error import ConversionModeException
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+compressedExtensions = [".gz", ".zst"]
+
+''' wie gzip auf der Kommandozeile, Stufe 9 kostet bei XML viel Zeit und spart kaum Platz '''
+gzipCompressLevel = 6
+
+
+def compressionOf(filename):
+    '''
+    @return: Endung des Kompressionsverfahrens oder None fuer unkomprimierte Dateien
+    '''
+    extension = os.path.splitext(filename)[1].lower()
+    return extension if extension in compressedExtensions else None
+
+
+def isCompressed(filename):
+    return compressionOf(filename) is not None
+
+
+def withoutCompressionExtension(filename):
+    '''
+    Dateiname ohne die Endung des Kompressionsverfahrens, z.B. um den Dateityp zu bestimmen
+    '''
+    if isCompressed(filename):
+        return os.path.splitext(filename)[0]
+    return filename
+
+
+def checkCompressionSupported(filename):
+    '''
+    *.zst benoetigt das optionale Paket zstandard
+
+    @raise ConversionModeException: wenn das Paket fuer das Verfahren nicht installiert ist
+    '''
+    if compressionOf(filename) == ".zst" and zstandard is None:
+        raise ConversionModeException("Fuer die Datei '{0}' wird das Paket 'zstandard' benoetigt, es ist nicht installiert.".format(filename))
+
+
+def wrapFile(file, filename, mode="rb"):
+    '''
+    Binaer geoeffnete Datei je nach Endung des Dateinamens in einen (de)komprimierenden Datenstrom einbetten.
+    Die Datei selbst muss weiterhin vom Aufrufer geschlossen werden.
+
+    @param file: binaer geoeffnete Datei
+    @param filename: Dateiname, dessen Endung das Verfahren bestimmt
+    @param mode: 'rb' oder 'wb'
+    @return: Datenstrom oder file selbst, wenn die Datei nicht komprimiert ist
+    '''
+    checkCompressionSupported(filename)
+    compression = compressionOf(filename)
+    if compression == ".gz":
+        if mode == "wb":
+            return gzip.GzipFile(fileobj=file, mode=mode, compresslevel=gzipCompressLevel)
+        return gzip.GzipFile(fileobj=file, mode=mode)
+    if compression == ".zst":
+        if mode == "wb":
+            return zstandard.ZstdCompressor().stream_writer(file, closefd=False)
+        return zstandard.ZstdDecompressor().stream_reader(file, closefd=False)
+    return file
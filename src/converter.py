@@ -3,19 +3,26 @@ Created on 01.09.2017
 
 @author: henrik.pilz
 '''
-from xml.sax import make_parser
 import logging
 import os
 import time
-import urllib.error
 
+from compressedFile import checkCompressionSupported
+from compressedFile import withoutCompressionExtension
 from error import ConversionModeException
+from error import DataErrorException
 from error import DateFormatMissingException
 from exporter import BMEcatExporter
+from exporter import DryRunExporter
 from exporter import PyxelExporter
+from importer import ArticleValidationPipeline
 from importer import BMEcatImportHandler
+from importer import BMEcatIterparseImporter
+from importer import BMEcatLayoutScanner
+from importer import BMEcatParallelImporter
+from importer import BMEcatSaxImporter
 from importer import ExcelImporter
-from resolver import DTDResolver
+from importer import ImportProgress
 from transformer import SeparatorTransformer
 
 
@@ -26,6 +33,22 @@ class Converter(object):
 
     allowedExcelFormats = [".xlsx", ".xlsm", ".xltx", ".xltm"]
 
+    allowedDelimitedTextFormats = [".csv", ".tsv"]
+
+    allowedImportEngines = ["sax", "lxml"]
+
+    allowedDtdModes = ["load", "skip"]
+
+    allowedExcelReaders = ["openpyxl", "spreadsheetml"]
+
+    allowedPreflightModes = ["none", "check", "only"]
+
+    allowedExcelExportModes = ["memory", "streaming"]
+
+    allowedWorkbookModes = ["cells", "writeonly"]
+
+    allowedXmlStyles = ["pretty", "compact", "canonical"]
+
     def __init__(self, config):
         '''
         Constructor
@@ -36,6 +59,20 @@ class Converter(object):
         self._manufacturerName = config['manufacturerName']
         self._validation = config['validation']
         self._separatorTransformer = SeparatorTransformer(config['separatorMode'])
+        self._importEngine = config['importEngine']
+        self._processes = config['processes']
+        self._dtdMode = config['dtdMode']
+        self._validators = config['validators']
+        self._progressInterval = config['progressInterval']
+        self._readSize = config['readSize']
+        self._excelReader = config['excelReader']
+        self._encoding = config['encoding']
+        self._delimiter = config['delimiter']
+        self._preflight = config['preflight']
+        self._excelExport = config['excelExport']
+        self._workbookMode = config['workbookMode']
+        self._dryRun = config['dryRun']
+        self._xmlStyle = config['xmlStyle']
 
     def _relativePathToAbsolutePath(self, filename):
         if filename.startswith(".") or filename.startswith(".."):
@@ -48,24 +85,26 @@ class Converter(object):
         '''
         if self._dateFormat is None or len(self._dateFormat.strip()) == 0:
             raise DateFormatMissingException("Zum Konvertieren von XML in Excel muss ein Datumsformat angegeben werden.")
-
-        parser = make_parser()
-
-        importer = BMEcatImportHandler(self._dateFormat, self._separatorTransformer)
-        parser.setContentHandler(importer)
-        parser.setEntityResolver(DTDResolver())
+        if self._dryRun:
+            self._checkBMEcat()
+            return
+        if self._excelExport == "streaming":
+            self._streamBMEcatToExcel()
+            return
 
         t1 = time.clock()
-        try:
-            parser.parse("file:" + self._inputfile)
-        except urllib.error.URLError as urlError:
-            raise FileNotFoundError(urlError)
+        if self._validators > 0:
+            with ArticleValidationPipeline(self._validators) as validationPipeline:
+                importer = self._readBMEcat(validationPipeline)
+        else:
+            importer = self._readBMEcat()
         t2 = time.clock()
         print("Einlesen:")
         self.computeDuration(t1, t2)
+        print("Datumsangaben: {0} aus dem Cache, {1} neu eingelesen".format(importer.dateTransformer.hits, importer.dateTransformer.misses))
         logging.info("Daten eingelesen")
 
-        exporter = PyxelExporter(importer.articles, self._outputfile, self._manufacturerName)
+        exporter = PyxelExporter(importer.articles, self._outputfile, self._manufacturerName, self._workbookMode == "writeonly", importer.layout)
         logging.info("Erstelle Excel-Datei")
         t3 = time.clock()
         exporter.createNewWorkbook()
@@ -74,16 +113,95 @@ class Converter(object):
         self.computeDuration(t3, t4)
         logging.info("Fertig.")
 
+    def _streamBMEcatToExcel(self):
+        '''
+        Export in zwei Durchlaeufen: der erste zaehlt nur die Elemente fuer die Spalten der Kopfzeile, der zweite
+        schreibt jeden Artikel direkt nach dem Einlesen in die Mappe. Der Speicherbedarf haengt damit nicht von der
+        Groesse des Katalogs ab. Die Artikel stehen in der Reihenfolge des BMEcats, auch bei unterschiedlichen Modi.
+        '''
+        t1 = time.clock()
+        scanner = BMEcatLayoutScanner()
+        self._createBMEcatEngine(scanner, self._createProgress(lambda: scanner.articleCount)).parse(self._inputfile)
+        t2 = time.clock()
+        print("Spalten ermitteln:")
+        self.computeDuration(t1, t2)
+        logging.info("Spalten ermittelt")
+
+        # ohne write_only wuerden alle Zellen bis zum Speichern im Speicher bleiben
+        exporter = PyxelExporter({}, self._outputfile, self._manufacturerName, writeOnly=True, layout=scanner.layout)
+        logging.info("Erstelle Excel-Datei")
+        exporter.startWorkbook()
+        try:
+            if self._validators > 0:
+                with ArticleValidationPipeline(self._validators) as validationPipeline:
+                    importer = self._readBMEcat(validationPipeline, exporter.addArticle)
+            else:
+                importer = self._readBMEcat(articleSink=exporter.addArticle)
+        except Exception:
+            exporter.discardWorkbook()
+            raise
+        exporter.finishWorkbook()
+        t3 = time.clock()
+        print("Einlesen und Wegschreiben:")
+        self.computeDuration(t2, t3)
+        print("Datumsangaben: {0} aus dem Cache, {1} neu eingelesen".format(importer.dateTransformer.hits, importer.dateTransformer.misses))
+        logging.info("Fertig.")
+
+    def _checkBMEcat(self):
+        '''
+        Trockenlauf: jeder Artikel wird direkt nach dem Einlesen geprueft und nicht gespeichert
+        '''
+        t1 = time.clock()
+        exporter = DryRunExporter(self._validation)
+        if self._validators > 0:
+            with ArticleValidationPipeline(self._validators) as validationPipeline:
+                self._readBMEcat(validationPipeline, exporter.addArticle)
+        else:
+            self._readBMEcat(articleSink=exporter.addArticle)
+        t2 = time.clock()
+        print("Einlesen und Pruefen:")
+        self.computeDuration(t1, t2)
+        exporter.finish()
+        logging.info("Fertig.")
+
+    def _readBMEcat(self, validationPipeline=None, articleSink=None):
+        importer = BMEcatImportHandler(self._dateFormat, self._separatorTransformer, articleSink, validationPipeline)
+        progress = self._createProgress(lambda: importer.articleCount)
+        if self._processes > 1:
+            loadDTD = self._dtdMode == "load"
+            BMEcatParallelImporter(importer, self._processes, self._importEngine, loadDTD, readSize=self._readSize, progress=progress).parse(self._inputfile)
+        else:
+            self._createBMEcatEngine(importer, progress).parse(self._inputfile)
+        return importer
+
+    def _createBMEcatEngine(self, importHandler, progress):
+        loadDTD = self._dtdMode == "load"
+        if self._importEngine == "lxml":
+            return BMEcatIterparseImporter(importHandler, loadDTD, self._readSize, progress)
+        return BMEcatSaxImporter(importHandler, loadDTD, self._readSize, progress)
+
+    def _createProgress(self, articleCounter):
+        return ImportProgress(self._progressInterval, articleCounter) if self._progressInterval > 0 else None
+
     def excelToXml(self):
         '''
         convert Excel-File to XML BMEcat
         '''
 
-        importer = ExcelImporter(self._separatorTransformer)
+        importer = ExcelImporter(self._separatorTransformer, self._processes, reader=self._excelReader)
 
         if os.path.isfile(self._inputfile):
+            if self._preflight != "none":
+                self._runPreflight(importer)
+                if self._preflight == "only":
+                    logging.info("Vorpruefung ohne Fehler beendet.")
+                    print("Vorpruefung ohne Fehler beendet.")
+                    return
             t1 = time.clock()
-            importer.readWorkbook(self._inputfile)
+            if self._isDelimitedText(self._inputfile):
+                importer.readDelimitedText(self._inputfile, self._encoding, self._delimiter)
+            else:
+                importer.readWorkbook(self._inputfile)
             t2 = time.clock()
             print("Einlesen:")
             self.computeDuration(t1, t2)
@@ -93,7 +211,13 @@ class Converter(object):
             logging.info("Daten eingelesen")
             print("Daten eingelesen")
 
-            exporter = BMEcatExporter(articles, self._outputfile, self._validation)
+            if self._dryRun:
+                exporter = DryRunExporter(self._validation)
+                exporter.addArticles(articles)
+                exporter.finish()
+                return
+
+            exporter = BMEcatExporter(articles, self._outputfile, self._validation, self._processes, outputStyle=self._xmlStyle)
 
             logging.info("Erstelle XML-Datei")
             print("Erstelle XML-Datei")
@@ -107,12 +231,45 @@ class Converter(object):
         logging.info("Fertig.")
         print("Fertig.")
 
+    def _runPreflight(self, importer):
+        '''
+        Datei einmal auf Formeln und fehlerhafte Trennzeichen pruefen und alle Funde auf einmal melden
+        '''
+        t1 = time.clock()
+        if self._isDelimitedText(self._inputfile):
+            findings = importer.checkDelimitedText(self._inputfile, self._encoding, self._delimiter)
+        else:
+            findings = importer.checkWorkbook(self._inputfile)
+        t2 = time.clock()
+        print("Vorpruefung:")
+        self.computeDuration(t1, t2)
+        for finding in findings:
+            logging.error(str(finding))
+        if len(findings) > 0:
+            raise DataErrorException("Die Vorpruefung hat {0} Fehler gefunden.".format(len(findings)))
+
     def convert(self):
+        if self._importEngine not in self.allowedImportEngines:
+            raise ConversionModeException("Import engine '{0}' not supported".format(self._importEngine))
+        if self._dtdMode not in self.allowedDtdModes:
+            raise ConversionModeException("DTD mode '{0}' not supported".format(self._dtdMode))
+        if self._excelReader not in self.allowedExcelReaders:
+            raise ConversionModeException("Excel reader '{0}' not supported".format(self._excelReader))
+        if self._preflight not in self.allowedPreflightModes:
+            raise ConversionModeException("Preflight mode '{0}' not supported".format(self._preflight))
+        if self._excelExport not in self.allowedExcelExportModes:
+            raise ConversionModeException("Excel export mode '{0}' not supported".format(self._excelExport))
+        if self._workbookMode not in self.allowedWorkbookModes:
+            raise ConversionModeException("Workbook mode '{0}' not supported".format(self._workbookMode))
+        if self._xmlStyle not in self.allowedXmlStyles:
+            raise ConversionModeException("XML style '{0}' not supported".format(self._xmlStyle))
+        checkCompressionSupported(self._inputfile)
+        checkCompressionSupported(self._outputfile)
         self._inputfile = self._relativePathToAbsolutePath(self._inputfile)
         self._outputfile = self._relativePathToAbsolutePath(self._outputfile)
-        if self._inputfile.endswith(".xml") and self._isExcel(self._outputfile):
+        if self._isBMEcat(self._inputfile) and self._isExcel(self._outputfile):
             self.__runConverterMethod(self.xmlToExcel)
-        elif self._isExcel(self._inputfile) and self._outputfile.endswith(".xml"):
+        elif (self._isExcel(self._inputfile) or self._isDelimitedText(self._inputfile)) and self._isBMEcat(self._outputfile):
             self.__runConverterMethod(self.excelToXml)
         else:
             raise ConversionModeException("Mode not supported")
@@ -125,9 +282,16 @@ class Converter(object):
                 os.remove(self._outputfile)
             raise e
 
+    def _isBMEcat(self, filename):
+        # BMEcats duerfen mit gzip oder zstd komprimiert sein
+        return withoutCompressionExtension(filename).endswith(".xml")
+
     def _isExcel(self, filename):
         return str(filename[-5:]) in self.allowedExcelFormats
 
+    def _isDelimitedText(self, filename):
+        return os.path.splitext(filename)[1].lower() in self.allowedDelimitedTextFormats
+
     def computeDuration(self, t1, t2):
         duration = t2 - t1
         if duration < 60:
@@ -2,6 +2,7 @@
 Module for the datastructures
 '''
 
+from datamodel.articleLayout import ArticleLayout
 from datamodel.comparableEqual import ComparableEqual
 from datamodel.feature import Feature
 from datamodel.featureSet import FeatureSet
@@ -19,7 +20,8 @@ from datamodel.variantSet import VariantSet
 from datamodel.xmlObject import ValidatingXMLObject
 from datamodel.xmlObject import XMLObject
 
-__all__ = ['Feature',
+__all__ = ['ArticleLayout',
+           'Feature',
            'FeatureSet',
            'Mime',
            'Product',
@@ -0,0 +1,59 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+
+
+class ArticleLayout(object):
+    '''
+    Spaltenaufteilung des Mapping-Masters: wie viele Preise, Bilder, Attribute und Spezialbehandlungsklassen ein Artikel
+    hoechstens hat. Die Importer fuehren sie beim Speichern der Artikel mit, so dass der Exporter die Kopfzeile ohne
+    eigenen Zaehldurchlauf schreiben kann.
+    '''
+
+    def __init__(self):
+        self.maxNumberOfPrices = 0
+        self.maxNumberOfMimes = 0
+        self.maxNumberOfAttributes = 0
+        self.maxNumberOfSpecialTreatmentClasses = 0
+        self.numberOfArticles = 0
+
+    @classmethod
+    def fromArticles(cls, articles):
+        '''
+        Aufteilung fuer bereits vorhandene Artikel ermitteln
+
+        @param articles: Dictionary Artikeltyp -> Liste der Artikel
+        '''
+        layout = cls()
+        for articleSet in articles.values():
+            for article in articleSet:
+                layout.addArticle(article)
+        return layout
+
+    def addArticle(self, article):
+        self.add(self.__countEntries(article.priceDetails), len(article.mimeInfo), self.__countEntries(article.featureSets),
+                 self.__countSpecialTreatmentClasses(article), article.numberOfVariants)
+
+    def add(self, numberOfPrices, numberOfMimes, numberOfAttributes, numberOfSpecialTreatmentClasses, numberOfVariants=1):
+        '''
+        Anzahlen eines Artikels uebernehmen, z.B. aus einer Zaehlung der Elemente ohne Datenobjekte
+        '''
+        self.maxNumberOfPrices = max(self.maxNumberOfPrices, numberOfPrices)
+        self.maxNumberOfMimes = max(self.maxNumberOfMimes, numberOfMimes)
+        self.maxNumberOfAttributes = max(self.maxNumberOfAttributes, numberOfAttributes)
+        self.maxNumberOfSpecialTreatmentClasses = max(self.maxNumberOfSpecialTreatmentClasses, numberOfSpecialTreatmentClasses)
+        self.numberOfArticles += numberOfVariants
+
+    def __countEntries(self, entryList):
+        countEntries = 0
+        for entry in entryList:
+            countEntries += len(entry)
+        return countEntries
+
+    def __countSpecialTreatmentClasses(self, article):
+        # Artikel aus dem Mapping-Master haben nicht zwingend Artikeldetails
+        if article.details is None:
+            return 0
+        return len(article.details.specialTreatmentClasses)
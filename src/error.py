@@ -58,3 +58,9 @@ class NumberFormatException(DataErrorException):
     '''
     If the format of the number is wrong
     '''
+
+
+class DTDEntityException(DataErrorException):
+    '''
+    Exception if the BMEcat uses entities, which are only defined in its DTD.
+    '''
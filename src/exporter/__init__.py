@@ -1,2 +1,3 @@
 from exporter.excel import PyxelExporter
 from exporter.xml import BMEcatExporter
+from exporter.dryRunExporter import DryRunExporter
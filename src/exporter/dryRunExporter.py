@@ -0,0 +1,49 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+import logging
+
+from error import DataErrorException
+
+
+class DryRunExporter(object):
+    '''
+    Ersetzt beim Trockenlauf den Exporter: jeder Artikel wird nur mit Product.validate geprueft, es werden weder
+    XML-Elemente noch Zellen erstellt und keine Datei geschrieben. Die Fehler werden wie im BMEcatExporter gesammelt
+    und am Ende gemeinsam gemeldet.
+    '''
+
+    __strict_validation = 'strict'
+
+    def __init__(self, validation=__strict_validation):
+        self._strict = validation.lower() == DryRunExporter.__strict_validation
+        self.numberOfArticles = 0
+        self._exceptions = []
+
+    def addArticles(self, articles):
+        '''
+        @param articles: Dictionary Artikeltyp -> Liste der Artikel
+        '''
+        for articleType, articleSet in articles.items():
+            for article in articleSet:
+                self.addArticle(articleType, article)
+
+    def addArticle(self, articleType, article):
+        self.numberOfArticles += 1
+        try:
+            article.validate(self._strict)
+        except Exception as e:
+            self._exceptions.append(e)
+
+    def finish(self):
+        '''
+        Ergebnis ausgeben, bei Fehlern mit derselben Anzahl wie beim Export abbrechen
+        '''
+        for entry in self._exceptions:
+            logging.error(str(entry))
+        logging.info("Trockenlauf: %d Artikel geprueft, %d fehlerhaft.", self.numberOfArticles, len(self._exceptions))
+        print("Trockenlauf: {0} Artikel geprueft, {1} fehlerhaft.".format(self.numberOfArticles, len(self._exceptions)))
+        if len(self._exceptions) > 0:
+            raise DataErrorException("Dry run not successful. Found {0} errors.".format(len(self._exceptions)))
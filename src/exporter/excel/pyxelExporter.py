@@ -3,11 +3,12 @@ Created on 05.05.2017
 
 @author: henrik.pilz
 '''
-import copy
 import logging
 
 from openpyxl.workbook import Workbook
 
+from datamodel import ArticleLayout
+
 
 class PyxelExporter(object):
     '''
@@ -39,59 +40,87 @@ class PyxelExporter(object):
 
     __treatmentClassFields = [ "classType", "className" ]
 
-    __headerRowIndex = 1
-
-    def __init__(self, articles, filename, defaultManufacturerName=None):
+    def __init__(self, articles, filename, defaultManufacturerName=None, writeOnly=False, layout=None):
         '''
         Constructor
+
+        Die Artikel werden nicht kopiert. Der Exporter liest sie nur und veraendert sie nicht, der Aufrufer darf sie
+        seinerseits bis zum Ende von createNewWorkbook nicht veraendern.
+
+        @param articles: Dictionary Artikeltyp -> Liste der Artikel
+        @param filename: Name der Excel-Datei
+        @param defaultManufacturerName: Herstellername fuer Artikel ohne Hersteller
+        @param writeOnly: Mappe im write_only-Modus von openpyxl schreiben, die Zeilen werden dann direkt in die Datei
+                          gestreamt statt als Zellobjekte im Speicher gehalten zu werden. Standard ist die normale Mappe.
+        @param layout: ArticleLayout der Artikel, wie es die Importer beim Einlesen mitfuehren. Ohne Layout werden die
+                       Artikel einmal durchgezaehlt. Werden die Artikel einzeln mit addArticle geschrieben, muss das
+                       Layout sie alle abdecken.
         '''
         self._filename = filename
+        self._writeOnly = writeOnly
         self._workbook = None
+        self._articleSheet = None
+        self._additionalSheets = []
+        self._currentRow = []
         self._defaultManufacturerName = defaultManufacturerName
-        self._maxNumberOfPrices = None
         self._currentColumnIndex = 0
-        self._currentRowIndex = 0
-        self._articles = copy.deepcopy(articles)
+        self._articles = articles
         self._firstPriceColumIndex = -1
         self._firstAttributeColumIndex = -1
         self._firstMimeColumIndex = -1
         self._firstSpecialTreatmentColumIndex = -1
         ''' Anzahl Preise, Attribute, Bilder, TreatmentClasses, Artikel'''
-        self._maxNumberOfPrices = 0
-        self._maxNumberOfAttributes = 0
-        self._maxNumberOfMimes = 0
-        self._maxNumberOfSpecialTreatmentClasses = 0
-        self._numberOfArticlesProcessed = 0
+        if layout is None:
+            layout = ArticleLayout.fromArticles(self._articles)
+        self._maxNumberOfPrices = layout.maxNumberOfPrices
+        self._maxNumberOfAttributes = layout.maxNumberOfAttributes
+        self._maxNumberOfMimes = layout.maxNumberOfMimes
+        self._maxNumberOfSpecialTreatmentClasses = layout.maxNumberOfSpecialTreatmentClasses
+        self._numberOfArticlesProcessed = layout.numberOfArticles
         self._numberOfArticlesWithKeywords = 0
         self._numberOfArticlereferences = 0
 
-        for articleSet in self._articles.values():
-            self.__countValuesForArticleSet(articleSet)
-
-    def __countValuesForArticleSet(self, articleSet):
-        for article in articleSet:
-            self.__extractNumbersFromArticle(article)
+    ''' ExcelMappe erstellen'''
+    def createNewWorkbook(self):
+        '''
+        Alle Tabellenblaetter werden in einem Durchlauf ueber die Artikel zeilenweise befuellt und die Mappe einmal
+        gespeichert.
+        '''
+        self.startWorkbook()
+        for articleType, articles in self._articles.items():
+            for article in articles:
+                self.addArticle(articleType, article)
+        self.finishWorkbook()
 
-    def __extractNumbersFromArticle(self, article):
-        self._maxNumberOfPrices = max(self._maxNumberOfPrices, self.__extractCount(article.priceDetails))
-        self._maxNumberOfAttributes = max(self._maxNumberOfAttributes, self.__extractCount(article.featureSets))
-        self._numberOfArticlesProcessed += article.numberOfVariants
-        self._maxNumberOfMimes = max(self._maxNumberOfMimes, len(article.mimeInfo))
-        self._maxNumberOfSpecialTreatmentClasses = max(self._maxNumberOfSpecialTreatmentClasses, len(article.details.specialTreatmentClasses))
+    def startWorkbook(self):
+        '''
+        Mappe mit den Kopfzeilen anlegen. Die Spalten ergeben sich aus dem Layout, danach koennen die Artikel einzeln
+        mit addArticle geschrieben werden, z.B. direkt beim Einlesen.
+        '''
+        self._workbook = Workbook(write_only=self._writeOnly)
+        self.__createSheets()
+        logging.info("Übertrage Artikel, {0}.".format(", ".join(sheetName for sheetName, _, _, _ in self.__additionalSheetsMapping)))
 
-    def __extractCount(self, entryList):
-        countEntries = 0
-        for entry in entryList:
-            countEntries += len(entry)
+    def addArticle(self, articleType, article):
+        '''
+        Zeile des Artikels und seine Referenzen und Suchbegriffe schreiben
+        '''
+        self.__writeOneArticleToRow(articleType, article)
+        for sheet, dataTransferMethod in self._additionalSheets:
+            dataTransferMethod(sheet, article)
 
-        return countEntries
+    def discardWorkbook(self):
+        '''
+        Angefangene Mappe nach einem Fehler verwerfen, ohne sie zu speichern. Die Tabellenblaetter im write_only-Modus
+        werden dabei geschlossen, damit ihre Ausgabestroeme nicht offen bleiben.
+        '''
+        if self._writeOnly and self._workbook is not None:
+            for sheet in self._workbook.worksheets:
+                if not sheet.closed:
+                    sheet.close()
+        self._workbook = None
 
-    ''' ExcelMappe erstellen'''
-    def createNewWorkbook(self):
-        self._workbook = Workbook()
-        self.__createArtikelSheet()
-        self._workbook.save(self._filename)
-        self.__createAdditionalSheets()
+    def finishWorkbook(self):
         self._workbook.save(self._filename)
         logging.info("Anzahl zu verarbeitender Artikel: " + str(self._numberOfArticlesProcessed))
         logging.info("Maximale Anzahl Preise: " + str(self._maxNumberOfPrices))
@@ -101,16 +130,21 @@ class PyxelExporter(object):
         logging.info("Anzahl Artikelreferenzen: " + str(self._numberOfArticlereferences))
         logging.info("Anzahl Artikel mit Suchworteinträgen: " + str(self._numberOfArticlesWithKeywords))
 
-    def __createArtikelSheet(self):
-        logging.info("Übertrage Artikel.")
-        self._currentSheet = self._workbook.create_sheet("Artikel", 0)
+    def __createSheets(self):
+        self._articleSheet = self._workbook.create_sheet("Artikel", 0)
         self.__createArtikelHeader()
-        self.__writeArticlesToSheet()
+        self._additionalSheets = []
+        for sheetName, index, columnNames, dataTransferMethodName in self.__additionalSheetsMapping:
+            sheet = self._workbook.create_sheet(sheetName, index)
+            self.__createAdditionalSheetHeader(sheet, columnNames)
+            self._additionalSheets.append((sheet, getattr(self, dataTransferMethodName)))
+        if self._writeOnly:
+            # die normale Mappe bringt ein leeres Blatt 'Sheet' mit, das in beiden Modi erhalten bleibt
+            self._workbook.create_sheet("Sheet")
 
     ''' Artikelheader '''
     def __createArtikelHeader(self):
-        self._currentColumnIndex = 1
-        self._currentRowIndex = self.__headerRowIndex
+        self.__startRow()
 
         for fieldName in self.__baseFields:
             self.__writeValueToCurrentCellAndIncreaseColumnIndex(fieldName)
@@ -119,6 +153,7 @@ class PyxelExporter(object):
         self._firstMimeColumIndex = self.__addArticlePartIfNecessary(self._maxNumberOfMimes, self.__mimeFields)
         self._firstAttributeColumIndex = self.__addArticlePartIfNecessary(self._maxNumberOfAttributes, self.__attributeFields)
         self._firstSpecialTreatmentColumIndex = self.__addArticlePartIfNecessary(self._maxNumberOfSpecialTreatmentClasses, self.__treatmentClassFields)
+        self.__appendRow(self._articleSheet)
 
     def __addArticlePartIfNecessary(self, maxCount, entryList):
         startingColumnIndex = 0
@@ -137,22 +172,14 @@ class PyxelExporter(object):
             self.__writeValueToCurrentCellAndIncreaseColumnIndex(fieldName + str(i))
 
     ''' Artikeldaten transferieren '''
-    def __writeArticlesToSheet(self):
-        self._currentRowIndex = self.__headerRowIndex + 1
-        for articleType, articles in self._articles.items():
-            self.__transferArticleSet(articleType, articles)
-
-    def __transferArticleSet(self, articleType, articles):
-        for article in articles:
-            self.__writeOneArticleToRow(articleType, article)
-
     def __writeOneArticleToRow(self, articleType, article):
+        self.__startRow()
         self.__addBaseFieldsToArticle(articleType, article)
         self.__addMimesToArticle(article.mimeInfo)
         self.__addPriceDetailsToArticle(article.priceDetails)
         self.__addAttributesToArticle(article.featureSets)
         self.__addTreatmentClassesToArticle(article.details.specialTreatmentClasses)
-        self._currentRowIndex += 1
+        self.__appendRow(self._articleSheet)
 
     def __addBaseFieldsToArticle(self, articleType, article):
         self._currentColumnIndex = 1
@@ -251,51 +278,43 @@ class PyxelExporter(object):
             self.__writeValueToCurrentCellAndIncreaseColumnIndex(treatmentClass.classType)
             self.__writeValueToCurrentCellAndIncreaseColumnIndex(treatmentClass.value)
 
-    ''' create additional sheets '''
-    def __createAdditionalSheets(self):
-        for sheetName, index, columnNames, dataTransferMethodName in self.__additionalSheetsMapping:
-            logging.info("Übertrage {0}".format(sheetName))
-            self._currentSheet = self._workbook.create_sheet(sheetName, index)
-            self.__createAdditionalSheetHeader(sheetName, columnNames)
-            self.__writeAdditionalDataToSheet(dataTransferMethodName)
-
     ''' create additional sheets - Header '''
-    def __createAdditionalSheetHeader(self, sheetName, additionalSheetMapping):
-        self._currentColumnIndex = 1
-        self._currentRowIndex = self.__headerRowIndex
+    def __createAdditionalSheetHeader(self, sheet, additionalSheetMapping):
+        self.__startRow()
         for columnName in additionalSheetMapping:
             self.__writeValueToCurrentCellAndIncreaseColumnIndex(columnName)
-
-    ''' create additional sheets - Transferdata '''
-    def __writeAdditionalDataToSheet(self, dataTransferMethodName):
-        self._currentRowIndex = self.__headerRowIndex + 1
-        for articles in self._articles.values():
-            self.__writeAdditionalDataForArticleSet(articles, dataTransferMethodName)
-
-    def __writeAdditionalDataForArticleSet(self, articles, dataTransferMethodName):
-        for article in articles:
-            dataTransferMethod = getattr(self, dataTransferMethodName)
-            dataTransferMethod(article)
+        self.__appendRow(sheet)
 
     ''' Datetransfermethods '''
-    def _writeReferencesForOneArticle(self, article):
+    def _writeReferencesForOneArticle(self, sheet, article):
         for reference in article.references:
-            self._currentColumnIndex = 1
+            self.__startRow()
             self.__writeValueToCurrentCellAndIncreaseColumnIndex(article.productId)
             self.__writeValueToCurrentCellAndIncreaseColumnIndex(reference.referenceType)
             self.__writeValueToCurrentCellAndIncreaseColumnIndex(reference.supplierArticleId)
-            self._currentRowIndex += 1
+            self.__appendRow(sheet)
             self._numberOfArticlereferences += 1
 
-    def _writeKeywordsForOneArticle(self, article):
-        self._currentColumnIndex = 1
+    def _writeKeywordsForOneArticle(self, sheet, article):
         if len(article.details.keywords) > 0:
+            self.__startRow()
             self.__writeValueToCurrentCellAndIncreaseColumnIndex(article.productId)
             self.__writeValueToCurrentCellAndIncreaseColumnIndex(",".join(['"{0}"'.format(keyword) for keyword in article.details.keywords]))
-            self._currentRowIndex += 1
+            self.__appendRow(sheet)
             self._numberOfArticlesWithKeywords += 1
 
-    ''' Basic write to cell '''
+    ''' Basic write to row '''
+    def __startRow(self):
+        self._currentRow = []
+        self._currentColumnIndex = 1
+
     def __writeValueToCurrentCellAndIncreaseColumnIndex(self, valueToWrite):
-        self._currentSheet.cell(row=self._currentRowIndex, column=self._currentColumnIndex, value=valueToWrite)
+        # die Abschnitte einer Zeile beginnen an festen Spalten und werden nicht in Spaltenreihenfolge geschrieben
+        missingColumns = self._currentColumnIndex - len(self._currentRow)
+        if missingColumns > 0:
+            self._currentRow.extend([ None ] * missingColumns)
+        self._currentRow[self._currentColumnIndex - 1] = valueToWrite
         self._currentColumnIndex += 1
+
+    def __appendRow(self, sheet):
+        sheet.append(self._currentRow)
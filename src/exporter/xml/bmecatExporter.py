@@ -3,6 +3,8 @@ Created on 12.05.2017
 
 @author: henrik.pilz
 '''
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import getpass
 import logging
@@ -10,74 +12,196 @@ import logging
 from lxml import etree
 from lxml.etree import Element
 from lxml.etree import SubElement
+from compressedFile import wrapFile
 from error import DataErrorException
+from workerLogging import emitLogRecords
+from workerLogging import initializeWorkerLogging
+from workerLogging import takeLogRecords
 
 
 class BMEcatExporter(object):
+    '''
+    Schreibt die Artikel als BMEcat 1.2.
+
+    Die Datei wird mit lxml.etree.xmlfile geschrieben: erst der Header, dann jeder Artikel, sobald Product.toXml ihn
+    erstellt hat, und zuletzt die Zuordnung der Artikel zur Kataloggruppe. Im Speicher liegt dabei immer nur das
+    Element eines Artikels.
+
+    Drei Ausgabestile sind moeglich: pretty rueckt ein wie etree.tostring mit pretty_print, compact schreibt ohne
+    Leerraum zwischen den Elementen und canonical schreibt Canonical XML 2.0. Header, Kataloggruppen und die Zuordnung
+    der Artikel werden je Stil einmal serialisiert und danach nur noch mit ihren Werten gefuellt.
+
+    Endet der Dateiname auf .gz oder .zst, wird beim Schreiben komprimiert.
+
+    Mit mehr als einem Prozess erstellen Arbeitsprozesse die Artikel in Teilstuecken und geben sie fertig serialisiert
+    zurueck. Sie werden in der Reihenfolge der Artikel in die Datei uebernommen.
+    '''
 
     __strict_validation = 'strict'
 
-    def __init__(self, articles, filename, validation=__strict_validation):
+    __namespace = "http://www.bmecat.org/bmecat/1.2/bmecat_new_catalog"
+
+    __indentation = "  "
+
+    ''' serialisierte Bloecke je (Name, eingerueckt) '''
+    __templates = {}
+
+    def __init__(self, articles, filename, validation=__strict_validation, processes=1, chunkSize=1000, outputStyle="pretty"):
+        '''
+        Constructor
+
+        @param articles: Dictionary Artikeltyp -> Liste der Artikel
+        @param processes: Anzahl der Prozesse, mit mehr als einem werden die Artikel in einem Prozesspool erstellt
+        @param chunkSize: Anzahl Artikel, die ein Arbeitsprozess am Stueck erhaelt
+        @param outputStyle: pretty, compact oder canonical
+        '''
         self._articles = articles  # dict!
         self._filename = filename
         self._validation = validation
+        self._processes = processes
+        self._chunkSize = chunkSize
+        self._outputStyle = outputStyle
+
+    def writeBMEcatAsXML(self):
+        with open(self._filename, "wb") as rawFile, wrapFile(rawFile, self._filename, "wb") as file:
+            if self._outputStyle == "canonical":
+                file = _CanonicalWriter(file)
+            with etree.xmlfile(file, encoding="UTF-8") as xmlFile:
+                xmlFile.write_declaration()
+                # das Praefix xml ist immer gebunden und wird deshalb direkt angegeben
+                with xmlFile.element("{" + self.__namespace + "}BMECAT", { "version" : "1.2", "xml:lang" : "de" },
+                                     nsmap={ None : self.__namespace }):
+                    self.__writeRaw(file, xmlFile, self.__createHeader())
+                    self.__writeIndentation(xmlFile, 1)
+                    with xmlFile.element("T_NEW_CATALOG"):
+                        self.__writeNewCatalog(file, xmlFile)
+                        self.__writeIndentation(xmlFile, 1)
+                    self.__writeIndentation(xmlFile, 0)
+            if self.__isPretty():
+                file.write(b"\n")
+            if self._outputStyle == "canonical":
+                file.close()
+
+    def __writeNewCatalog(self, file, xmlFile):
+        self.__writeRaw(file, xmlFile, self.__template("CATALOG_GROUP_SYSTEM", self.__createCatalogGroupSystemElement, 2))
+        if self._processes > 1:
+            self.__writeArticlesInParallel(file, xmlFile)
+        else:
+            self.__writeArticles(xmlFile)
+        self.__writeArticleCatalogMappings(file, xmlFile)
+
+    def __writeArticleCatalogMappings(self, file, xmlFile):
+        template = self.__template("ARTICLE_TO_CATALOGGROUP_MAP", self.__createArticleCatalogMappingElement, 2)
+        mappings = []
+        for articles in self._articles.values():
+            for article in articles:
+                mappings.append(template.format(articleId=_escapeText(str(article.productId))))
+                if len(mappings) == self._chunkSize:
+                    self.__writeRaw(file, xmlFile, "".join(mappings))
+                    mappings = []
+        self.__writeRaw(file, xmlFile, "".join(mappings))
 
-    def __createArticleElements(self):
-        articleElements = []
+    def __writeArticles(self, xmlFile):
+        '''
+        Fehlerhafte Artikel werden gesammelt, damit alle Fehler gemeldet werden, bevor der Export abbricht.
+        '''
+        exceptions = []
         for articleType, articles in self._articles.items():
-            articleElements.extend(self.__createArticleElementsForSet(articles, articleType))
-        return articleElements
+            for article in articles:
+                try:
+                    articleElement = article.toXml(articleType, self.__isStrict())
+                except Exception as e:
+                    exceptions.append(e)
+                    continue
+                if len(exceptions) == 0:
+                    self.__writeElement(xmlFile, articleElement, 2)
+        self.__raiseCollectedExceptions(exceptions)
 
-    def __createArticleElementsForSet(self, articles, articleType='new'):
-        articleElements = []
+    def __writeArticlesInParallel(self, file, xmlFile):
+        '''
+        Es sind hoechstens zwei Teilstuecke je Prozess in Arbeit. Meldungen und Fehler der Arbeitsprozesse werden in der
+        Reihenfolge der Artikel uebernommen, nach dem ersten Fehler wird nichts mehr in die Datei geschrieben.
+        '''
         exceptions = []
-        for article in articles:
-            try:
-                articleElement = article.toXml(articleType, self._validation.lower() == BMEcatExporter.__strict_validation)
-                articleElements.append(articleElement)
-            except Exception as e:
-                exceptions.append(e)
+        pendingChunks = deque()
+        with ProcessPoolExecutor(max_workers=self._processes, initializer=initializeWorkerLogging,
+                                 initargs=(logging.getLogger().getEffectiveLevel(),)) as executor:
+            for articleType, articles in self._articles.items():
+                for start in range(0, len(articles), self._chunkSize):
+                    pendingChunks.append(executor.submit(_serializeArticles, articles[start:start + self._chunkSize], articleType,
+                                                         self.__isStrict(), self.__indentation if self.__isPretty() else None, 2))
+                    if len(pendingChunks) > self._processes * 2:
+                        self.__writeSerializedChunk(file, xmlFile, pendingChunks.popleft(), exceptions)
+            while len(pendingChunks) > 0:
+                self.__writeSerializedChunk(file, xmlFile, pendingChunks.popleft(), exceptions)
+        self.__raiseCollectedExceptions(exceptions)
+
+    def __writeSerializedChunk(self, file, xmlFile, future, exceptions):
+        serializedArticles, logRecords, chunkExceptions = future.result()
+        emitLogRecords(logRecords)
+        exceptions.extend(chunkExceptions)
+        if len(exceptions) == 0:
+            # xmlfile puffert, die fertigen Bytes duerfen erst danach in die Datei
+            xmlFile.flush()
+            file.write(serializedArticles)
+
+    def __isStrict(self):
+        return self._validation.lower() == BMEcatExporter.__strict_validation
+
+    def __isPretty(self):
+        return self._outputStyle == "pretty"
+
+    def __raiseCollectedExceptions(self, exceptions):
         if len(exceptions) > 0:
             for entry in exceptions:
                 logging.error(str(entry))
             raise DataErrorException("BMEcat not complete. Found {0} errors.".format(len(exceptions)))
-        return articleElements
 
-    def writeBMEcatAsXML(self):
-        with open(self._filename, "wb") as file:
-            bmecat = self.__createBMEcatRootElement()
-            bmecat.append(self.__createHeaderElement())
-
-            newCatalog = Element("T_NEW_CATALOG")
-            newCatalog.append(self.__createCatalogGroupSystemElement())
-            bmecat.append(newCatalog)
-            newCatalog.extend(self.__createArticleElements())
-            newCatalog.extend(self.__createArticleCatalogMapping())
-            file.write(self.__prettyFormattedOutput(bmecat))
-            file.close()
-
-    def __createBMEcatRootElement(self):
-        return etree.XML('<!DOCTYPE BMECAT SYSTEM "bmecat_new_catalog.dtd">' +
-                         '<BMECAT version="1.2" xml:lang="de" ' +
-                         'xmlns="http://www.bmecat.org/bmecat/1.2/bmecat_new_catalog" />')
+    def __writeElement(self, xmlFile, element, level):
+        self.__writeIndentation(xmlFile, level)
+        if self.__isPretty():
+            etree.indent(element, space=self.__indentation, level=level)
+        xmlFile.write(element)
+
+    def __writeIndentation(self, xmlFile, level):
+        if self.__isPretty():
+            xmlFile.write("\n" + self.__indentation * level)
+
+    def __writeRaw(self, file, xmlFile, text):
+        # xmlfile puffert, die fertigen Bytes duerfen erst danach in die Datei
+        xmlFile.flush()
+        file.write(text.encode("UTF-8"))
+
+    def __template(self, name, createElement, level):
+        '''
+        Block je Stil nur einmal erstellen und serialisieren. Platzhalter wie {articleId} werden mit str.format gefuellt,
+        die Werte muessen dafuer mit _escapeText maskiert sein.
+        '''
+        key = (name, self.__isPretty())
+        if key not in BMEcatExporter.__templates:
+            element = createElement()
+            prefix = ""
+            if self.__isPretty():
+                etree.indent(element, space=self.__indentation, level=level)
+                prefix = "\n" + self.__indentation * level
+            BMEcatExporter.__templates[key] = prefix + etree.tostring(element, encoding="unicode")
+        return BMEcatExporter.__templates[key]
 
     def __createCatalogGroupSystemElement(self):
-        return etree.XML("<CATALOG_GROUP_SYSTEM>" +
-                         "<GROUP_SYSTEM_ID>1</GROUP_SYSTEM_ID>" +
-                         "<GROUP_SYSTEM_NAME>Default Groupsystem</GROUP_SYSTEM_NAME>" +
-                         '<CATALOG_STRUCTURE type="root">' +
-                         "<GROUP_ID>1</GROUP_ID>" +
-                         "<GROUP_NAME>Katalog</GROUP_NAME>" +
-                         "<PARENT_ID>0</PARENT_ID>" +
-                         "<GROUP_ORDER>1</GROUP_ORDER>" +
-                         "</CATALOG_STRUCTURE>" +
-                         '<CATALOG_STRUCTURE type="leaf">' +
-                         "<GROUP_ID>2</GROUP_ID>" +
-                         "<GROUP_NAME>Produkte</GROUP_NAME>" +
-                         "<PARENT_ID>1</PARENT_ID>" +
-                         "<GROUP_ORDER>2</GROUP_ORDER>" +
-                         "</CATALOG_STRUCTURE>" +
-                         "</CATALOG_GROUP_SYSTEM>")
+        catalogGroupSystem = Element("CATALOG_GROUP_SYSTEM")
+        SubElement(catalogGroupSystem, "GROUP_SYSTEM_ID").text = "1"
+        SubElement(catalogGroupSystem, "GROUP_SYSTEM_NAME").text = "Default Groupsystem"
+        catalogGroupSystem.append(self.__createCatalogStructure("root", "1", "Katalog", "0", "1"))
+        catalogGroupSystem.append(self.__createCatalogStructure("leaf", "2", "Produkte", "1", "2"))
+        return catalogGroupSystem
+
+    def __createCatalogStructure(self, structureType, groupId, groupName, parentId, groupOrder):
+        catalogStructure = Element("CATALOG_STRUCTURE", { "type" : structureType })
+        SubElement(catalogStructure, "GROUP_ID").text = groupId
+        SubElement(catalogStructure, "GROUP_NAME").text = groupName
+        SubElement(catalogStructure, "PARENT_ID").text = parentId
+        SubElement(catalogStructure, "GROUP_ORDER").text = groupOrder
+        return catalogStructure
 
     def __extractInitials(self, usplit):
         initials = ""
@@ -108,15 +232,22 @@ class BMEcatExporter(object):
         return self.__extractInitials(usplit)
 
     def __createGenerationDate(self):
-        now = datetime.now()
-        generationDate = now.strftime("%Y-%m-%d")
-        generationTime = now.strftime("%H:%M:%S")
         dateTime = Element("DATETIME", { "type" : "generation_date" })
-        SubElement(dateTime, "DATE").text = generationDate
-        SubElement(dateTime, "TIME").text = generationTime
+        SubElement(dateTime, "DATE").text = "{generationDate}"
+        SubElement(dateTime, "TIME").text = "{generationTime}"
         return dateTime
 
     def __createCatalogInfo(self):
+        catalog = Element("CATALOG")
+        SubElement(catalog, "LANGUAGE").text = "deu"
+        SubElement(catalog, "CATALOG_ID").text = "{catalogId}"
+        SubElement(catalog, "CATALOG_VERSION").text = "1.0"
+        SubElement(catalog, "CATALOG_NAME").text = "{catalogName}"
+        catalog.append(self.__createGenerationDate())
+        SubElement(catalog, "CURRENCY").text = "EUR"
+        return catalog
+
+    def __createHeader(self):
         initials = "NotSet"
         try:
             initials = self.__determineInitials()
@@ -125,17 +256,13 @@ class BMEcatExporter(object):
 
         logging.debug("Initialen: {0}".format(initials))
 
-        dateYMD = datetime.now().strftime("%Y%m%d")
-        catalogId = datetime.now().strftime("%Y%m%d%H%M%S")
-
-        catalog = Element("CATALOG")
-        SubElement(catalog, "LANGUAGE").text = "deu"
-        SubElement(catalog, "CATALOG_ID").text = catalogId + "_" + initials
-        SubElement(catalog, "CATALOG_VERSION").text = "1.0"
-        SubElement(catalog, "CATALOG_NAME").text = dateYMD + "-" + self._validation.title() + "-Update_" + initials
-        catalog.append(self.__createGenerationDate())
-        SubElement(catalog, "CURRENCY").text = "EUR"
-        return catalog
+        now = datetime.now()
+        values = { "catalogId" : now.strftime("%Y%m%d%H%M%S") + "_" + initials,
+                   "catalogName" : now.strftime("%Y%m%d") + "-" + self._validation.title() + "-Update_" + initials,
+                   "generationDate" : now.strftime("%Y-%m-%d"),
+                   "generationTime" : now.strftime("%H:%M:%S") }
+        template = self.__template("HEADER", self.__createHeaderElement, 1)
+        return template.format(**{ name : _escapeText(value) for name, value in values.items() })
 
     def __createSubElement(self, tag):
         element = Element(tag)
@@ -153,18 +280,62 @@ class BMEcatExporter(object):
 
         return header
 
-    def __prettyFormattedOutput(self, elem):
-        """Return a pretty-printed XML string for the Element.
-        """
-        return etree.tostring(elem, encoding="UTF-8", pretty_print=True, xml_declaration=True)
+    def __createArticleCatalogMappingElement(self):
+        parent = Element("ARTICLE_TO_CATALOGGROUP_MAP")
+        SubElement(parent, "ART_ID").text = "{articleId}"
+        SubElement(parent, "CATALOG_GROUP_ID").text = "2"
+        SubElement(parent, "ARTICLE_TO_CATALOGGROUP_MAP_ORDER").text = "2"
+        return parent
 
-    def __createArticleCatalogMapping(self):
-        mapping = []
-        for _, articles in self._articles.items():
-            for article in articles:
-                parent = Element("ARTICLE_TO_CATALOGGROUP_MAP")
-                SubElement(parent, "ART_ID").text = str(article.productId)
-                SubElement(parent, "CATALOG_GROUP_ID").text = "2"
-                SubElement(parent, "ARTICLE_TO_CATALOGGROUP_MAP_ORDER").text = "2"
-                mapping.append(parent)
-        return mapping
+
+def _escapeText(value):
+    '''
+    Text wie libxml2 beim Serialisieren maskieren
+    '''
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace("\r", "&#13;")
+
+
+class _CanonicalWriter(object):
+    '''
+    Nimmt die kompakte Ausgabe des BMEcatExporters entgegen und schreibt sie als Canonical XML 2.0 in die Datei.
+    Die Daten werden beim Schreiben geparst, der Baum wird dabei nicht aufgebaut.
+    '''
+
+    def __init__(self, file):
+        self.__file = file
+        self.__parts = []
+        self.__parser = etree.XMLParser(target=etree.C14NWriterTarget(self.__parts.append), huge_tree=True)
+
+    def write(self, data):
+        self.__parser.feed(data)
+        self.__flushParts()
+
+    def close(self):
+        self.__parser.close()
+        self.__flushParts()
+
+    def __flushParts(self):
+        if len(self.__parts) > 0:
+            self.__file.write("".join(self.__parts).encode("UTF-8"))
+            self.__parts.clear()
+
+
+def _serializeArticles(articles, articleType, strict, indentation, level):
+    '''
+    Erstellt die Artikel eines Teilstuecks im Arbeitsprozess und gibt sie als UTF-8 zurueck, mit indentation
+    eingerueckt. Fehler werden je Artikel gesammelt, damit der Hauptprozess alle melden kann.
+    '''
+    takeLogRecords()
+    serializedArticles = []
+    exceptions = []
+    for article in articles:
+        try:
+            articleElement = article.toXml(articleType, strict)
+        except Exception as e:
+            exceptions.append(e)
+            continue
+        if indentation is not None:
+            etree.indent(articleElement, space=indentation, level=level)
+            serializedArticles.append(("\n" + indentation * level).encode("UTF-8"))
+        serializedArticles.append(etree.tostring(articleElement, encoding="UTF-8"))
+    return b"".join(serializedArticles), takeLogRecords(), exceptions
@@ -1,2 +1,12 @@
+from importer.excel import DelimitedTextReader
 from importer.excel import ExcelImporter
+from importer.excel import PreflightFinding
+from importer.excel import SpreadsheetMLReader
+from importer.xml import ArticleValidationPipeline
 from importer.xml import BMEcatImportHandler
+from importer.xml import BMEcatInputStream
+from importer.xml import BMEcatIterparseImporter
+from importer.xml import BMEcatLayoutScanner
+from importer.xml import BMEcatParallelImporter
+from importer.xml import BMEcatSaxImporter
+from importer.xml import ImportProgress
@@ -1 +1,4 @@
+from importer.excel.delimitedTextReader import DelimitedTextReader
 from importer.excel.excelImporter import ExcelImporter
+from importer.excel.spreadsheetMLReader import SpreadsheetMLReader
+from importer.excel.excelImporter import PreflightFinding
@@ -0,0 +1,48 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+import csv
+from itertools import islice
+import os
+
+
+class DelimitedTextReader(object):
+    '''
+    Liest ein als CSV bzw. TSV exportiertes Mapping-Master-Blatt zeilenweise mit dem csv-Modul.
+
+    Die Zeilen werden wie von openpyxl als Tupel der Werte geliefert, die erste Zeile enthaelt die Feldnamen.
+    Leere Felder werden zu None, so dass sie wie leere Zellen behandelt werden. Alle anderen Werte bleiben Zeichenketten.
+    '''
+
+    defaultDelimiters = { ".csv" : ",", ".tsv" : "\t" }
+
+    def __init__(self, filename, encoding="utf-8-sig", delimiter=None):
+        '''
+        Constructor
+
+        @param filename: Name der CSV- oder TSV-Datei
+        @param encoding: Zeichenkodierung der Datei, utf-8-sig liest UTF-8 mit und ohne BOM
+        @param delimiter: Trennzeichen der Felder, Standard ist Komma bei .csv und Tabulator bei .tsv
+        '''
+        self._filename = filename
+        self._encoding = encoding
+        self._delimiter = delimiter or self.defaultDelimiters.get(os.path.splitext(filename)[1].lower(), ",")
+
+    def iter_rows(self, min_row=None, max_row=None, values_only=True):
+        '''
+        Liefert die Zeilen ab min_row bis max_row in derselben Form wie ein Tabellenblatt von openpyxl.
+
+        @param values_only: nur True ist moeglich, der Parameter steht nur fuer die Aufrufe wie bei openpyxl da
+        @raise ValueError: bei values_only=False, Zellobjekte werden nicht erstellt
+        '''
+        if not values_only:
+            raise ValueError("DelimitedTextReader erstellt keine Zellobjekte und liefert nur die Werte der Zellen, "
+                             "iter_rows ist nur mit values_only=True moeglich.")
+        return self.__rows((min_row or 1) - 1, max_row)
+
+    def __rows(self, start, stop):
+        with open(self._filename, newline="", encoding=self._encoding) as file:
+            for row in islice(csv.reader(file, delimiter=self._delimiter), start, stop):
+                yield tuple(value if len(value) > 0 else None for value in row)
@@ -4,20 +4,36 @@ Created on 11.05.2017
 @author: henrik.pilz
 '''
 
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import copy
 import logging
 
 from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.formula import ArrayFormula
+from openpyxl.worksheet.formula import DataTableFormula
 import regex
 
+from datamodel import ArticleLayout
 from datamodel import Feature
 from datamodel import FeatureSet
 from datamodel import Mime
+from datamodel import OrderDetails
 from datamodel import Price
 from datamodel import PriceDetails
 from datamodel import Product
+from datamodel import ProductDetails
 from error import FormulaFoundException
 from error import NumberFormatException
+from error import SeparatorNotDetectableException
+from importer.excel.delimitedTextReader import DelimitedTextReader
+from importer.excel.spreadsheetMLReader import SpreadsheetMLReader
 from transformer import SeparatorTransformer
+from workerLogging import emitLogRecords
+from workerLogging import initializeWorkerLogging
+from workerLogging import takeLogRecords
 
 
 class ExcelImporter(object):
@@ -102,9 +118,14 @@ class ExcelImporter(object):
 
     __fieldsToTransform = [ "priceAmount", "price_amount", "amount", "tax", "factor", "delivery_time", "deliveryTime" ]
 
-    def __init__(self, separatorTransformer=SeparatorTransformer("detect")):
+    def __init__(self, separatorTransformer=SeparatorTransformer("detect"), processes=1, chunkSize=1000, reader="openpyxl"):
         '''
         Constructor
+
+        @param separatorTransformer: Umwandlung der Dezimal- und Tausendertrennzeichen
+        @param processes: Anzahl der Prozesse, mit mehr als einem werden die Artikel in einem Prozesspool erstellt
+        @param chunkSize: Anzahl Zeilen, die ein Arbeitsprozess am Stueck erhaelt
+        @param reader: openpyxl oder spreadsheetml, womit die Zeilen aus der Datei gelesen werden
         '''
         self.__indexForProduct = {}
         self.__indexForProductDetails = {}
@@ -112,14 +133,83 @@ class ExcelImporter(object):
         self.__indexPairsForFeatures = {}
         self.__indexTuplesForPrices = {}
         self.__indexTuplesForMimes = {}
-        self.__currentRowIndex = 1
         self.__currentSheet = None
+        self.__productPlan = []
+        self.__productDetailPlan = []
+        self.__orderDetailPlan = []
+        self.__mimePlan = None
+        self.__pricePlan = None
+        self.__featurePlan = None
         self._separatorTransformer = separatorTransformer
+        self._processes = processes
+        self._chunkSize = chunkSize
+        self._reader = reader
 
         self.articles = []
+        ''' Spaltenaufteilung der erstellten Artikel '''
+        self.layout = ArticleLayout()
+
+    def __getstate__(self):
+        # an die Arbeitsprozesse gehen nur die Konfiguration und der Spaltenplan, nicht das Tabellenblatt und die Artikel
+        state = self.__dict__.copy()
+        state['_ExcelImporter__currentSheet'] = None
+        state['articles'] = []
+        state['layout'] = ArticleLayout()
+        return state
 
     def readWorkbook(self, filename):
-        wb = load_workbook(filename)
+        wb = self.__openWorkbook(filename)
+        try:
+            self.__readWorkbook(wb)
+        finally:
+            wb.close()
+
+    def checkWorkbook(self, filename):
+        '''
+        Vorpruefung der Datei, ohne Artikel zu erstellen
+
+        @return: Liste der PreflightFindings in der Reihenfolge der Zeilen
+        '''
+        wb = self.__openWorkbook(filename)
+        try:
+            return self.__checkRows(self.__selectSheet(wb))
+        finally:
+            wb.close()
+
+    def checkDelimitedText(self, filename, encoding="utf-8-sig", delimiter=None):
+        '''
+        Vorpruefung einer CSV- oder TSV-Datei, ohne Artikel zu erstellen
+
+        @return: Liste der PreflightFindings in der Reihenfolge der Zeilen
+        '''
+        return self.__checkRows(DelimitedTextReader(filename, encoding, delimiter))
+
+    def readDelimitedText(self, filename, encoding="utf-8-sig", delimiter=None):
+        '''
+        Mapping-Master als CSV oder TSV einlesen. Die Feldnamen in der ersten Zeile und die Artikel werden wie bei
+        einem Tabellenblatt ausgewertet.
+
+        @param filename: Name der CSV- oder TSV-Datei
+        @param encoding: Zeichenkodierung der Datei
+        @param delimiter: Trennzeichen der Felder, Standard ergibt sich aus der Dateiendung
+        '''
+        self.__currentSheet = DelimitedTextReader(filename, encoding, delimiter)
+        self.__determineIndexMappings()
+        self.__readArticles()
+
+    def __openWorkbook(self, filename):
+        if self._reader == "spreadsheetml":
+            # streamt das Tabellenblatt direkt aus dem Zip-Archiv und liefert dieselben Zeilentupel wie openpyxl
+            return SpreadsheetMLReader(filename)
+        # read_only liest die Zeilen beim Iterieren aus der Datei, statt das ganze Zellraster im Speicher zu halten
+        return load_workbook(filename, read_only=True)
+
+    def __readWorkbook(self, wb):
+        self.__currentSheet = self.__selectSheet(wb)
+        self.__determineIndexMappings()
+        self.__readArticles()
+
+    def __selectSheet(self, wb):
         countPossibleCandidates = 0
         tablename = None
         for allowedSheetname in self.__allowedTablenames:
@@ -131,19 +221,63 @@ class ExcelImporter(object):
             raise Exception("Das Tabellenblatt mit den Artikelnamen sollte einen der folgenden Namen tragen: '{0}'".format(", ".join(self.__allowedTablenames)))
         if countPossibleCandidates > 1:
             raise Exception("Es darf nur ein Tabellenblatt mit den folgenden Artikelnamen existieren: '{0}'".format(", ".join(self.__allowedTablenames)))
-
-        self.__currentSheet = wb[tablename]
-        self.__determineIndexMappings()
-        self.__readArticles()
+        return wb[tablename]
 
     def __determineIndexMappings(self):
         # gehe durch alle Spalten in Zeile 1 (Headerzeile)
-        for colIndex in range(1, self.__currentSheet.max_column + 1):
-            # hole den aktuellen Feldnamen
-            currentFieldname = self.__currentSheet.cell(column=colIndex, row=1).value
-            # wenn der Feldnam nicht leer ist
-            if currentFieldname is not None and len(currentFieldname.strip()) > 0:
-                self.__detectEntities(currentFieldname, colIndex)
+        for headerRow in self.__currentSheet.iter_rows(min_row=1, max_row=1, values_only=True):
+            for colIndex, currentFieldname in enumerate(headerRow, start=1):
+                self.__detectEntitiesIfFieldnameGiven(currentFieldname, colIndex)
+        self.__compileColumnPlan()
+
+    def __checkRows(self, sheet):
+        '''
+        Liest Kopfzeile und Artikelzeilen in einem Durchlauf und meldet in den zugeordneten Spalten jede Formel und
+        jeden Wert, dessen Trennzeichen der SeparatorTransformer ablehnen wuerde. Die Trennzeichen werden mit einer Kopie
+        des SeparatorTransformers erkannt, damit die Vorpruefung das spaetere Einlesen nicht beeinflusst.
+        '''
+        findings = []
+        columns = None
+        transformer = copy.deepcopy(self._separatorTransformer)
+        for rowIndex, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+            if columns is None:
+                for colIndex, currentFieldname in enumerate(row, start=1):
+                    self.__detectEntitiesIfFieldnameGiven(currentFieldname, colIndex)
+                columns = self.__determineColumnsToCheck()
+                continue
+            rowLength = len(row)
+            for colIndex, fieldname, transform in columns:
+                value = row[colIndex - 1] if colIndex <= rowLength else None
+                if _isFormula(value):
+                    findings.append(PreflightFinding(rowIndex, colIndex, fieldname, getattr(value, "text", value), "Formeleintrag gefunden"))
+                elif transform:
+                    separatorsDetermined = transformer.separatorsDetermined()
+                    try:
+                        transformer.transform(value)
+                    except (NumberFormatException, SeparatorNotDetectableException, ValueError) as e:
+                        findings.append(PreflightFinding(rowIndex, colIndex, fieldname, value, str(e)))
+                        if not separatorsDetermined:
+                            # ein fehlgeschlagener Erkennungsversuch darf die Trennzeichen fuer die folgenden Werte nicht festlegen
+                            transformer = copy.deepcopy(self._separatorTransformer)
+        return sorted(findings, key=lambda finding: (finding.rowIndex, finding.colIndex))
+
+    def __determineColumnsToCheck(self):
+        '''
+        @return: Liste (Spalte, Feldname mit Ordnungsnummer, Trennzeichen umwandeln) in der Reihenfolge des Spaltenplans,
+                 damit die Trennzeichen am selben Wert wie beim Einlesen erkannt werden
+        '''
+        columns = []
+        for mapping in [ self.__indexForProduct, self.__indexForProductDetails, self.__indexForOrderDetails ]:
+            columns += [ (colIndex, fieldname, fieldname in self.__fieldsToTransform) for fieldname, colIndex in mapping.items() ]
+        for mapping in [ self.__indexTuplesForMimes, self.__indexTuplesForPrices, self.__indexPairsForFeatures ]:
+            columns += [ (colIndex, fieldname + order, fieldname in self.__fieldsToTransform)
+                         for fieldname, columnsByOrder in mapping.items() for order, colIndex in columnsByOrder.items() ]
+        return columns
+
+    def __detectEntitiesIfFieldnameGiven(self, currentFieldname, colIndex):
+        # wenn der Feldnam nicht leer ist
+        if currentFieldname is not None and len(currentFieldname.strip()) > 0:
+            self.__detectEntities(currentFieldname, colIndex)
 
     def __detectEntities(self, currentFieldname, colIndex):
         # gib ihn aus
@@ -202,81 +336,163 @@ class ExcelImporter(object):
         else:
             indexForClassFieldName[classFieldName][fieldCount] = colIndex
 
+    def __compileColumnPlan(self):
+        '''
+        Uebersetzt die Spaltenzuordnungen einmal je Tabellenblatt in flache, vorsortierte Listen von Schritten
+        (Objekt, Ordnungsnummer, Spalte, Feldname, Setter, Trennzeichen umwandeln). Jede Zeile wird danach nur noch
+        entlang dieser Listen abgearbeitet, ohne die Zuordnungen erneut zu durchsuchen und zu sortieren.
+        '''
+        self.__productPlan = self.__compileFieldSteps(self.__indexForProduct, Product)
+        self.__productDetailPlan = self.__compileFieldSteps(self.__indexForProductDetails, ProductDetails)
+        self.__orderDetailPlan = self.__compileFieldSteps(self.__indexForOrderDetails, OrderDetails)
+        self.__mimePlan = self.__compileMultipleOrderedSteps(self.__indexTuplesForMimes, Product, Mime)
+        self.__pricePlan = self.__compileMultipleOrderedSteps(self.__indexTuplesForPrices, PriceDetails, Price)
+        self.__featurePlan = self.__compileMultipleOrderedSteps(self.__indexPairsForFeatures, FeatureSet, Feature)
+
+    def __compileFieldSteps(self, mapping, typeOfObject):
+        return [ (0, None, colIndex, fieldname, self.__determineSetter(typeOfObject, fieldname), fieldname in self.__fieldsToTransform)
+                 for fieldname, colIndex in mapping.items() ]
+
+    def __compileMultipleOrderedSteps(self, mapping, typeOfContainer, typeOfMultiples):
+        # die Werte werden in derselben Reihenfolge wie bisher gesetzt, damit bei fehlerhaften Zeilen derselbe Fehler zuerst gemeldet wird
+        orders = sorted({ order for columnsByOrder in mapping.values() for order in columnsByOrder.keys() })
+        itemIndexByOrder = { order : itemIndex for itemIndex, order in enumerate(orders) }
+        steps = [ (itemIndexByOrder[order], order, colIndex, fieldname, self.__determineSetter(typeOfMultiples, fieldname),
+                   fieldname in self.__fieldsToTransform)
+                  for fieldname, columnsByOrder in mapping.items() for order, colIndex in columnsByOrder.items() ]
+        addMethodName = "add" + str(typeOfMultiples.__name__)
+        return orders, steps, typeOfMultiples, addMethodName, getattr(typeOfContainer, addMethodName, None)
+
+    def __determineSetter(self, typeOfObject, fieldname):
+        '''
+        Setter, wie ihn ValidatingObject.add fuer ein neues Objekt waehlen wuerde.
+        Unbekannte Felder bleiben bei add, damit der Fehler wie bisher erst beim Wert auftritt.
+        '''
+        try:
+            currentValue = getattr(typeOfObject(), fieldname)
+        except AttributeError:
+            return _addValue
+        if isinstance(currentValue, (list, array)):
+            return _appendValue
+        return setattr
+
     def __readArticles(self):
-        for rowIndex in range(2, self.__currentSheet.max_row + 1):
-            self.__currentRowIndex = rowIndex
-            self.articles.append(self.__createProduct())
+        # jede Zeile kommt als Tupel der Werte, der Artikel wird nur aus diesem Tupel erstellt
+        rows = enumerate(self.__currentSheet.iter_rows(min_row=2, values_only=True), start=2)
+        if self._processes > 1:
+            self.__readArticlesInParallel(rows)
+            return
+        for rowIndex, row in rows:
+            self.__storeArticle(self._createProduct(rowIndex, row))
+
+    def __storeArticle(self, article):
+        self.articles.append(article)
+        self.layout.addArticle(article)
+
+    def __readArticlesInParallel(self, rows):
+        '''
+        Die Zeilen werden mit ihren Zeilennummern in Teilstuecken an die Arbeitsprozesse gegeben, so dass Fehlermeldungen
+        Zeile und Spalte behalten. Das erste Teilstueck wird im Hauptprozess erstellt, damit alle Teilstuecke mit denselben
+        erkannten Trennzeichen arbeiten. Artikel, Meldungen und Fehler werden in der Reihenfolge der Zeilen uebernommen.
+        Es sind hoechstens doppelt so viele Teilstuecke wie Prozesse unterwegs, damit sich Zeilen und fertige Artikel nicht
+        im Speicher stauen, wenn das Uebernehmen langsamer ist als das Erstellen.
+        '''
+        chunks = self.__splitIntoChunks(rows)
+        for rowIndex, row in next(chunks, []):
+            self.__storeArticle(self._createProduct(rowIndex, row))
+        with ProcessPoolExecutor(max_workers=self._processes, initializer=initializeWorkerLogging,
+                                 initargs=(logging.getLogger().getEffectiveLevel(),)) as executor:
+            pendingChunks = deque()
+            for chunk in chunks:
+                pendingChunks.append(executor.submit(_createProducts, self, chunk))
+                if len(pendingChunks) > self._processes * 2:
+                    self.__storeCreatedChunk(pendingChunks.popleft(), pendingChunks)
+            while len(pendingChunks) > 0:
+                self.__storeCreatedChunk(pendingChunks.popleft(), pendingChunks)
+
+    def __storeCreatedChunk(self, future, pendingChunks):
+        '''
+        Ergebnis eines Teilstuecks uebernehmen, bei einem Fehler die noch ausstehenden Teilstuecke verwerfen
+        '''
+        products, logRecords, exception = future.result()
+        emitLogRecords(logRecords)
+        for product in products:
+            self.__storeArticle(product)
+        if exception is not None:
+            for pendingFuture in pendingChunks:
+                pendingFuture.cancel()
+            raise exception
+
+    def __splitIntoChunks(self, rows):
+        chunk = []
+        for numberedRow in rows:
+            chunk.append(numberedRow)
+            if len(chunk) == self._chunkSize:
+                yield chunk
+                chunk = []
+        if len(chunk) > 0:
+            yield chunk
+
+    def _createProduct(self, rowIndex, row):
+        '''
+        Artikel aus den Werten einer Zeile entlang des uebersetzten Spaltenplans erstellen
 
-    def __createProduct(self):
+        @param rowIndex: Zeilennummer im Tabellenblatt fuer die Fehlermeldungen
+        @param row: Tupel der Zellwerte der Zeile
+        '''
         currentProduct = Product()
-        self.__transferInformationForMapping(self.__indexForProduct, currentProduct)
+        self.__transferInformationForPlan(self.__productPlan, rowIndex, row, [ currentProduct ])
         currentProduct.addDetails()
         try:
-            self.__transferInformationForMapping(self.__indexForProductDetails, currentProduct.details)
+            self.__transferInformationForPlan(self.__productDetailPlan, rowIndex, row, [ currentProduct.details ])
             currentProduct.addOrderDetails()
-            self.__transferInformationForMapping(self.__indexForOrderDetails, currentProduct.orderDetails)
-            self.__addMultipleOrderedObjects(self.__indexTuplesForMimes, currentProduct, Mime)
+            self.__transferInformationForPlan(self.__orderDetailPlan, rowIndex, row, [ currentProduct.orderDetails ])
+            self.__addMultipleOrderedObjects(self.__mimePlan, rowIndex, row, currentProduct)
             priceDetails = PriceDetails()
-            self.__addMultipleOrderedObjects(self.__indexTuplesForPrices, priceDetails, Price)
+            self.__addMultipleOrderedObjects(self.__pricePlan, rowIndex, row, priceDetails)
             currentProduct.addPriceDetails(priceDetails, raiseException=False)
             featureSet = FeatureSet()
-            self.__addMultipleOrderedObjects(self.__indexPairsForFeatures, featureSet, Feature)
+            self.__addMultipleOrderedObjects(self.__featurePlan, rowIndex, row, featureSet)
             currentProduct.addFeatureSet(featureSet)
             currentProduct.validate(raiseException=False)
         except FormulaFoundException as ffe:
             raise FormulaFoundException("{0}: {1}".format(currentProduct.productId, str(ffe)))
         return currentProduct
 
-    def __transferInformationForMapping(self, mapping, objectForValue):
+    def __transferInformationForPlan(self, steps, rowIndex, row, objectsForValues):
         """
-        Überträgt die Informationen vom Objekt über das angegebene Mapping für das Produkt in der Zeile.
+        Überträgt die Informationen aus der Zeile über die Schritte des Plans in die Objekte.
+        Fehler werden mit Zeile und Spalte gemeldet, bei mehrfachen Objekten (Preise, Bilder, Attribute) auch
+        mit der Ordnungsnummer.
         """
-        for fieldname, colIndex in mapping.items():
-            try:
-                self.__determineAndAddValue(colIndex, objectForValue, fieldname)
-            except NumberFormatException as e:
-                raise NumberFormatException("Zeile: {0}/Spalte {1}; '{2}' Fehler: {3}".format(self.__currentRowIndex, colIndex,
-                                                                                              fieldname, str(e)))
-
-    def __addMultipleOrderedObjects(self, mapping, objectContainer, typeOfMultiples):
+        rowLength = len(row)
+        transformValue = self._separatorTransformer.transform
+        try:
+            for itemIndex, order, colIndex, fieldname, setter, transform in steps:
+                value = row[colIndex - 1] if colIndex <= rowLength else None
+                if transform:
+                    value = transformValue(value)
+                if value is not None and len(str(value)) > 0:
+                    setter(objectsForValues[itemIndex], fieldname, value)
+        except NumberFormatException as nfe:
+            raise NumberFormatException("Zeile: {0}/Spalte {1}; '{2}{4}' Fehler: {3}".format(rowIndex, colIndex,
+                                                                                             fieldname, str(nfe), order or ""))
+        except Exception as e:
+            if order is None:
+                raise
+            raise Exception("Zeile: {0}/Spalte {1}; '{2}{4}' Fehler: {3}".format(rowIndex, colIndex,
+                                                                                 fieldname, str(e), order))
+
+    def __addMultipleOrderedObjects(self, plan, rowIndex, row, objectContainer):
         """
         Fügt mehrere Objekte zum Objektcontainer hinzu
         """
-        itemsToAddByOrder = {}
-        for fieldname in mapping.keys():
-            self.__setValueForFieldNameAndTransformDecimalsIfNeeded(mapping, typeOfMultiples, itemsToAddByOrder, fieldname)
-
-        self.__sortAndAddMultipleOrderedObjects(objectContainer, typeOfMultiples, itemsToAddByOrder)
-
-    def __setValueForFieldNameAndTransformDecimalsIfNeeded(self, mapping, typeOfMultiples, itemsToAddByOrder, fieldname):
-        for order, colIndex in mapping[fieldname].items():
-            try:
-                if order not in itemsToAddByOrder.keys():
-                    itemsToAddByOrder[order] = typeOfMultiples()
-                self.__determineAndAddValue(colIndex, itemsToAddByOrder[order], fieldname)
-            except NumberFormatException as nfe:
-                raise NumberFormatException("Zeile: {0}/Spalte {1}; '{2}{4}' Fehler: {3}".format(self.__currentRowIndex, colIndex,
-                                                                                                 fieldname, str(nfe), order))
-            except Exception as e:
-                raise Exception("Zeile: {0}/Spalte {1}; '{2}{4}' Fehler: {3}".format(self.__currentRowIndex, colIndex,
-                                                                                     fieldname, str(e), order))
-
-    def __determineAndAddValue(self, colIndex, objectForValue, fieldname):
-        value = self.__currentSheet.cell(column=colIndex, row=self.__currentRowIndex).value
-        value = self.__transformValueIfSupposedTo(fieldname, value)
-        if value is not None and len(str(value)) > 0:
-            objectForValue.add(fieldname, value)
-
-    def __transformValueIfSupposedTo(self, fieldname, value):
-        if fieldname in self.__fieldsToTransform:
-            return self._separatorTransformer.transform(value)
-        return value
-
-    def __sortAndAddMultipleOrderedObjects(self, objectContainer, typeOfMultiples, itemsToAddByOrder):
-        for key in sorted(itemsToAddByOrder.keys()):
-            item = itemsToAddByOrder[key]
-            self.__setOrderIfNotSet(item, key)
-            self.__exectueAddMethod(objectContainer, "add" + str(typeOfMultiples.__name__), item)
+        orders, steps, typeOfMultiples, addMethodName, addMethod = plan
+        items = [ typeOfMultiples() for _ in orders ]
+        self.__transferInformationForPlan(steps, rowIndex, row, items)
+        for order, item in zip(orders, items):
+            self.__setOrderIfNotSet(item, order)
+            self.__exectueAddMethod(objectContainer, addMethodName, addMethod, item)
 
     def __setOrderIfNotSet(self, objectWithOrder, order):
         try:
@@ -285,9 +501,62 @@ class ExcelImporter(object):
         except AttributeError:
             logging.debug("Order Attribute could not be set for '{0}'.".format(objectWithOrder.__class__.__name__))
 
-    def __exectueAddMethod(self, objectWithAddMethod , addMethodName, arg):
+    def __exectueAddMethod(self, objectWithAddMethod, addMethodName, addMethod, arg):
         try:
-            elementHandler = getattr(objectWithAddMethod, addMethodName)
-            elementHandler(arg)
+            if addMethod is None:
+                raise AttributeError(addMethodName)
+            addMethod(objectWithAddMethod, arg)
         except AttributeError:
             raise NotImplementedError("Class [" + objectWithAddMethod.__class__.__name__ + "] does not implement [" + addMethodName + "]")
+
+
+def _addValue(objectForValue, fieldname, value):
+    objectForValue.add(fieldname, value)
+
+
+def _appendValue(objectForValue, fieldname, value):
+    attributeList = getattr(objectForValue, fieldname)
+    if value not in attributeList:
+        attributeList.append(value)
+
+
+class PreflightFinding(object):
+    '''
+    Fund der Vorpruefung mit Koordinate der Zelle
+    '''
+
+    def __init__(self, rowIndex, colIndex, fieldname, value, message):
+        self.rowIndex = rowIndex
+        self.colIndex = colIndex
+        self.fieldname = fieldname
+        self.value = value
+        self.message = message
+
+    @property
+    def coordinate(self):
+        return "{0}{1}".format(get_column_letter(self.colIndex), self.rowIndex)
+
+    def __str__(self):
+        return "{0} (Zeile: {1}/Spalte {2}; '{3}'): {4} Wert: '{5}'".format(self.coordinate, self.rowIndex, self.colIndex,
+                                                                            self.fieldname, self.message, self.value)
+
+
+def _isFormula(value):
+    if isinstance(value, (ArrayFormula, DataTableFormula)):
+        return True
+    return isinstance(value, str) and value.startswith("=")
+
+
+def _createProducts(importer, chunk):
+    '''
+    Erstellt die Artikel eines Teilstuecks im Arbeitsprozess. Ein Fehler wird mit den bis dahin erstellten Artikeln und
+    den gesammelten Meldungen zurueckgegeben, damit der Hauptprozess ihn an der richtigen Stelle wirft.
+    '''
+    takeLogRecords()
+    products = []
+    try:
+        for rowIndex, row in chunk:
+            products.append(importer._createProduct(rowIndex, row))
+    except Exception as e:
+        return products, takeLogRecords(), e
+    return products, takeLogRecords(), None
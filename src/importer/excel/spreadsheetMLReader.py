@@ -0,0 +1,315 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+import posixpath
+from warnings import warn
+import zipfile
+
+from lxml import etree
+from openpyxl.formula.translate import Translator
+from openpyxl.styles.numbers import builtin_format_code
+from openpyxl.styles.numbers import is_date_format
+from openpyxl.styles.numbers import is_timedelta_format
+from openpyxl.utils.cell import column_index_from_string
+from openpyxl.utils.cell import range_boundaries
+from openpyxl.utils.datetime import CALENDAR_MAC_1904
+from openpyxl.utils.datetime import WINDOWS_EPOCH
+from openpyxl.utils.datetime import from_ISO8601
+from openpyxl.utils.datetime import from_excel
+from openpyxl.worksheet.formula import ArrayFormula
+from openpyxl.worksheet.formula import DataTableFormula
+
+
+SHEET_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIP_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_RELATIONSHIP_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+ROW_TAG = "{%s}row" % SHEET_MAIN_NS
+CELL_TAG = "{%s}c" % SHEET_MAIN_NS
+VALUE_TAG = "{%s}v" % SHEET_MAIN_NS
+FORMULA_TAG = "{%s}f" % SHEET_MAIN_NS
+INLINE_STRING_TAG = "{%s}is" % SHEET_MAIN_NS
+TEXT_TAG = "{%s}t" % SHEET_MAIN_NS
+RUN_TAG = "{%s}r" % SHEET_MAIN_NS
+STRING_ITEM_TAG = "{%s}si" % SHEET_MAIN_NS
+DIMENSION_TAG = "{%s}dimension" % SHEET_MAIN_NS
+
+
+class SpreadsheetMLReader(object):
+    '''
+    Liest die Tabellenblaetter einer xlsx-Datei direkt aus dem Zip-Archiv, ohne das Objektmodell von openpyxl aufzubauen.
+
+    Die Tabelle der gemeinsamen Zeichenketten und die Datumsformate werden einmal beim Oeffnen gelesen, die Zeilen
+    eines Tabellenblatts werden mit lxml iterparse gestreamt. Die Schnittstelle entspricht dem Ausschnitt von
+    load_workbook(read_only=True), den der ExcelImporter nutzt (sheetnames, [name].iter_rows(values_only=True), close),
+    und die Werte der Zellen werden wie dort umgewandelt, so dass beide Wege dieselben Zeilentupel liefern.
+    '''
+
+    def __init__(self, filename):
+        '''
+        Constructor
+
+        @param filename: Name der xlsx-Datei
+        '''
+        self._archive = zipfile.ZipFile(filename)
+        try:
+            workbookPath = self.__findWorkbookPath()
+            workbookRelations = self.__readRelations(workbookPath)
+            self.__sheetPaths = {}
+            self.epoch = WINDOWS_EPOCH
+            self.__readWorkbook(workbookPath, workbookRelations)
+            self.sharedStrings = self.__readSharedStrings(self.__findRelationTarget(workbookRelations, "/sharedStrings"))
+            self.dateFormats, self.timedeltaFormats = self.__readDateFormats(self.__findRelationTarget(workbookRelations, "/styles"))
+        except Exception:
+            self._archive.close()
+            raise
+
+    @property
+    def sheetnames(self):
+        return list(self.__sheetPaths.keys())
+
+    def __getitem__(self, sheetname):
+        if sheetname not in self.__sheetPaths:
+            raise KeyError("Worksheet {0} does not exist.".format(sheetname))
+        return SpreadsheetMLSheet(self, self.__sheetPaths[sheetname])
+
+    def close(self):
+        self._archive.close()
+
+    def __findWorkbookPath(self):
+        relations = self.__readRelations("")
+        for relationType, target in relations.values():
+            if relationType.endswith("/officeDocument"):
+                return target
+        return "xl/workbook.xml"
+
+    def __readRelations(self, partPath):
+        '''
+        @return: Dictionary Id -> (Typ, Pfad im Archiv) aus der .rels-Datei des Teils
+        '''
+        folder, partName = posixpath.split(partPath)
+        relationsPath = posixpath.join(folder, "_rels", partName + ".rels")
+        if relationsPath not in self._archive.namelist():
+            return {}
+        relations = {}
+        root = etree.fromstring(self._archive.read(relationsPath))
+        for relation in root.iter("{%s}Relationship" % PACKAGE_RELATIONSHIP_NS):
+            target = relation.get("Target")
+            if relation.get("TargetMode") == "External":
+                continue
+            if target.startswith("/"):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+            relations[relation.get("Id")] = (relation.get("Type"), target)
+        return relations
+
+    def __findRelationTarget(self, relations, typeSuffix):
+        for relationType, target in relations.values():
+            if relationType.endswith(typeSuffix) and target in self._archive.namelist():
+                return target
+        return None
+
+    def __readWorkbook(self, workbookPath, relations):
+        root = etree.fromstring(self._archive.read(workbookPath))
+        properties = root.find("{%s}workbookPr" % SHEET_MAIN_NS)
+        if properties is not None and properties.get("date1904") in ("1", "true"):
+            self.epoch = CALENDAR_MAC_1904
+        archiveFiles = set(self._archive.namelist())
+        for sheet in root.iter("{%s}sheet" % SHEET_MAIN_NS):
+            relationId = sheet.get("{%s}id" % RELATIONSHIP_NS)
+            if relationId in relations and relations[relationId][1] in archiveFiles:
+                self.__sheetPaths[sheet.get("name")] = relations[relationId][1]
+
+    def __readSharedStrings(self, sharedStringsPath):
+        sharedStrings = []
+        if sharedStringsPath is None:
+            return sharedStrings
+        with self._archive.open(sharedStringsPath) as source:
+            for _, element in etree.iterparse(source, events=("end",), tag=STRING_ITEM_TAG):
+                sharedStrings.append(_textContent(element).replace('x005F_', ''))
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        return sharedStrings
+
+    def __readDateFormats(self, stylesPath):
+        '''
+        @return: Indizes der Zellformate (Attribut s der Zelle), deren Zahlenformat ein Datum bzw. eine Zeitdauer ist
+        '''
+        dateFormats = set()
+        timedeltaFormats = set()
+        if stylesPath is None:
+            return dateFormats, timedeltaFormats
+        root = etree.fromstring(self._archive.read(stylesPath))
+        customFormats = { int(numFmt.get("numFmtId")) : numFmt.get("formatCode")
+                          for numFmt in root.iterfind("{0}numFmts/{0}numFmt".format("{%s}" % SHEET_MAIN_NS)) }
+        for index, xf in enumerate(root.iterfind("{0}cellXfs/{0}xf".format("{%s}" % SHEET_MAIN_NS))):
+            numFmtId = int(xf.get("numFmtId", 0))
+            formatCode = customFormats[numFmtId] if numFmtId in customFormats else builtin_format_code(numFmtId)
+            if is_date_format(formatCode):
+                dateFormats.add(index)
+            if is_timedelta_format(formatCode):
+                timedeltaFormats.add(index)
+        return dateFormats, timedeltaFormats
+
+
+class SpreadsheetMLSheet(object):
+    '''
+    Ein Tabellenblatt, dessen Zeilen bei jedem Aufruf von iter_rows neu aus dem Archiv gestreamt werden.
+    '''
+
+    def __init__(self, reader, sheetPath):
+        self._reader = reader
+        self._sheetPath = sheetPath
+        self.__columnIndexes = {}
+
+    def iter_rows(self, min_row=None, max_row=None, values_only=True):
+        '''
+        Liefert die Zeilen ab min_row bis max_row als Tupel der Werte. Wie bei openpyxl werden fehlende Zeilen als leere
+        Zeilen eingefuegt und die Zeilen auf die Spaltenzahl aus der Angabe dimension aufgefuellt bzw. gekuerzt.
+
+        @param values_only: nur True ist moeglich, der Parameter steht nur fuer die Aufrufe wie bei openpyxl da
+        @raise ValueError: bei values_only=False, Zellobjekte werden nicht erstellt
+        '''
+        if not values_only:
+            raise ValueError("SpreadsheetMLSheet erstellt keine Zellobjekte und liefert nur die Werte der Zellen, "
+                             "iter_rows ist nur mit values_only=True moeglich.")
+        return self.__rowsByIndex(min_row or 1, max_row)
+
+    def __rowsByIndex(self, minRow, maxRow):
+        sharedFormulae = {}
+        counter = minRow
+        rowIndex = 0
+        maxColumn = None
+        emptyRow = []
+        with self._reader._archive.open(self._sheetPath) as source:
+            for _, element in etree.iterparse(source, events=("end",), tag=(DIMENSION_TAG, ROW_TAG)):
+                if element.tag == DIMENSION_TAG:
+                    # die Angabe steht vor sheetData und legt die Breite und Anzahl der Zeilen fest
+                    _, _, maxColumn, dimensionMaxRow = range_boundaries(element.get("ref"))
+                    maxRow = maxRow or dimensionMaxRow
+                    emptyRow = (None,) * maxColumn if maxColumn is not None else []
+                    continue
+
+                rowIndex = int(element.get("r")) if element.get("r") is not None else rowIndex + 1
+                if maxRow is not None and rowIndex > maxRow:
+                    break
+                cells = self.__parseRow(element, rowIndex, sharedFormulae)
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+                # fehlende Zeilen
+                while counter < rowIndex:
+                    counter += 1
+                    yield emptyRow
+                if counter <= rowIndex:
+                    counter += 1
+                    yield self.__valuesOfRow(cells, maxColumn)
+
+        if maxRow is not None and maxRow < rowIndex:
+            for _ in range(counter, maxRow + 1):
+                yield emptyRow
+
+    def __valuesOfRow(self, cells, maxColumn):
+        if not cells and not maxColumn:
+            return ()
+        rowWidth = maxColumn or cells[-1][0]
+        values = [ None ] * rowWidth
+        for column, value in cells:
+            if 1 <= column <= rowWidth:
+                values[column - 1] = value
+        return tuple(values)
+
+    def __parseRow(self, rowElement, rowIndex, sharedFormulae):
+        cells = []
+        column = 0
+        for cellElement in rowElement:
+            coordinate = cellElement.get("r")
+            column = self.__columnIndex(coordinate) if coordinate else column + 1
+            cells.append((column, self.__parseCell(cellElement, coordinate, sharedFormulae)))
+        return cells
+
+    def __columnIndex(self, coordinate):
+        letters = coordinate.rstrip("0123456789")
+        if letters not in self.__columnIndexes:
+            self.__columnIndexes[letters] = column_index_from_string(letters)
+        return self.__columnIndexes[letters]
+
+    def __parseCell(self, cellElement, coordinate, sharedFormulae):
+        dataType = cellElement.get("t", "n")
+        value = None
+        formula = None
+        inlineString = None
+        for child in cellElement:
+            if child.tag == VALUE_TAG:
+                if value is None and dataType != "inlineStr":
+                    value = child.text or None
+            elif child.tag == FORMULA_TAG:
+                formula = child if formula is None else formula
+            elif child.tag == INLINE_STRING_TAG:
+                inlineString = child if inlineString is None else inlineString
+
+        if formula is not None:
+            return self.__parseFormula(formula, coordinate, sharedFormulae)
+        if value is not None:
+            return self.__convertValue(dataType, value, cellElement.get("s"), coordinate)
+        if dataType == "inlineStr" and inlineString is not None:
+            return _textContent(inlineString)
+        return value
+
+    def __convertValue(self, dataType, value, styleId, coordinate):
+        if dataType == "n":
+            value = float(value) if "." in value or "E" in value or "e" in value else int(value)
+            styleIndex = int(styleId) if styleId else 0
+            if styleIndex in self._reader.dateFormats:
+                try:
+                    return from_excel(value, self._reader.epoch, timedelta=styleIndex in self._reader.timedeltaFormats)
+                except (OverflowError, ValueError):
+                    warn("Cell {0} is marked as a date but the serial value {1} is outside the limits for dates. "
+                         "The cell will be treated as an error.".format(coordinate, value))
+                    return "#VALUE!"
+            return value
+        if dataType == "s":
+            return self._reader.sharedStrings[int(value)]
+        if dataType == "b":
+            return bool(int(value))
+        if dataType == "d":
+            return from_ISO8601(value)
+        return value
+
+    def __parseFormula(self, formula, coordinate, sharedFormulae):
+        formulaType = formula.get("t")
+        value = "="
+        if formula.text is not None:
+            value += formula.text
+        if formulaType == "array":
+            return ArrayFormula(ref=formula.get("ref"), text=value)
+        if formulaType == "shared":
+            sharedIndex = formula.get("si")
+            if sharedIndex in sharedFormulae:
+                return sharedFormulae[sharedIndex].translate_formula(coordinate)
+            if value != "=":
+                sharedFormulae[sharedIndex] = Translator(value, coordinate)
+        elif formulaType == "dataTable":
+            return DataTableFormula(**formula.attrib)
+        return value
+
+
+def _textContent(element):
+    '''
+    Text eines Elements vom Typ CT_Rst (gemeinsame oder eingebettete Zeichenkette) ohne Formatierung
+    '''
+    plain = None
+    runs = []
+    for child in element:
+        if child.tag == TEXT_TAG:
+            plain = child.text
+        elif child.tag == RUN_TAG:
+            text = child.find(TEXT_TAG)
+            if text is not None and text.text is not None:
+                runs.append(text.text)
+    return (plain or "") + "".join(runs)
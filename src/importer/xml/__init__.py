@@ -1 +1,8 @@
+from importer.xml.articleValidationPipeline import ArticleValidationPipeline
 from importer.xml.bmecatImportHandler import BMEcatImportHandler
+from importer.xml.bmecatInputStream import BMEcatInputStream
+from importer.xml.bmecatInputStream import ImportProgress
+from importer.xml.bmecatIterparseImporter import BMEcatIterparseImporter
+from importer.xml.bmecatLayoutScanner import BMEcatLayoutScanner
+from importer.xml.bmecatParallelImporter import BMEcatParallelImporter
+from importer.xml.bmecatSaxImporter import BMEcatSaxImporter
@@ -0,0 +1,107 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import os
+
+from workerLogging import emitLogRecords
+from workerLogging import initializeWorkerLogging
+from workerLogging import takeLogRecords
+
+
+class ArticleValidationPipeline(object):
+    '''
+    Validiert fertig eingelesene Artikel in Arbeitsprozessen, waehrend der Parser schon die naechsten Artikel liest.
+
+    Die Artikel werden in einer begrenzten Warteschlange gehalten. Ist sie voll, wartet der Parser auf den aeltesten Artikel.
+    Die validierten Artikel werden in der urspruenglichen Reihenfolge zurueckgegeben. Warnungen der Validierung werden in den
+    Arbeitsprozessen gesammelt und mit dem Artikel im Hauptprozess ausgegeben, Fehler werden beim betroffenen Artikel
+    geworfen.
+    '''
+
+    def __init__(self, processes=None, queueSize=None):
+        '''
+        Constructor
+
+        @param processes: Anzahl der Arbeitsprozesse, Standard ist die Anzahl der Kerne
+        @param queueSize: maximale Anzahl Artikel in der Warteschlange, Standard sind 16 je Prozess
+        '''
+        self._processes = processes or os.cpu_count() or 1
+        self._queueSize = queueSize or self._processes * 16
+        self._pendingArticles = deque()
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exceptionType, exceptionValue, traceback):
+        if exceptionType is not None:
+            self.discard()
+        self.close()
+
+    def submit(self, mode, article):
+        '''
+        Artikel zur Validierung einreihen
+
+        @return: Liste der bereits validierten Artikel als (mode, article) in Dokumentreihenfolge
+        '''
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._processes, initializer=initializeWorkerLogging,
+                                                 initargs=(logging.getLogger().getEffectiveLevel(),))
+        self._pendingArticles.append((mode, self._executor.submit(_validateArticle, article)))
+        finishedArticles = []
+        while len(self._pendingArticles) > 0 and (len(self._pendingArticles) > self._queueSize or self._pendingArticles[0][1].done()):
+            finishedArticles.append(self.__takeOldestArticle())
+        return finishedArticles
+
+    def finish(self):
+        '''
+        auf alle Artikel warten
+
+        @return: Liste der restlichen validierten Artikel als (mode, article) in Dokumentreihenfolge
+        '''
+        finishedArticles = []
+        while len(self._pendingArticles) > 0:
+            finishedArticles.append(self.__takeOldestArticle())
+        return finishedArticles
+
+    def discard(self):
+        '''
+        Nach einem Abbruch des Einlesens auf die restlichen Artikel warten und nur ihre Meldungen ausgeben,
+        damit dieselben Warnungen wie bei der direkten Validierung erscheinen. Die Artikel und ihre Fehler werden verworfen.
+        '''
+        while len(self._pendingArticles) > 0:
+            try:
+                self.__takeOldestArticle()
+            except Exception:
+                pass
+
+    def close(self):
+        for _, future in self._pendingArticles:
+            future.cancel()
+        self._pendingArticles.clear()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __takeOldestArticle(self):
+        mode, future = self._pendingArticles.popleft()
+        article, logRecords, exception = future.result()
+        emitLogRecords(logRecords)
+        if exception is not None:
+            raise exception
+        return mode, article
+
+
+def _validateArticle(article):
+    takeLogRecords()
+    exception = None
+    try:
+        article.validate(False)
+    except Exception as e:
+        exception = e
+    return article, takeLogRecords(), exception
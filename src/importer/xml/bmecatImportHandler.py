@@ -4,10 +4,11 @@ Created on 05.05.2017
 @author: henrik.pilz
 '''
 from array import array
-from datetime import datetime
 from xml.sax import handler
+import copy
 import logging
 
+from datamodel import ArticleLayout
 from datamodel import Feature
 from datamodel import FeatureSet
 from datamodel import Mime
@@ -18,6 +19,8 @@ from datamodel import Reference
 from datamodel import TreatmentClass
 from datamodel import ValidatingObject
 from datamodel import Variant
+from error import DTDEntityException
+from transformer import DateTransformer
 from transformer import SeparatorTransformer
 
 
@@ -136,9 +139,25 @@ class BMEcatImportHandler(handler.ContentHandler):
     __fieldsToTransform = [ "amount", "tax", "factor"]
 
     ''' Konstruktor '''
-    def __init__(self, dateFormat, separatorTransformer=SeparatorTransformer("detect")):
+    def __init__(self, dateFormat, separatorTransformer=SeparatorTransformer("detect"), articleSink=None, validationPipeline=None):
         self.__dateFormat = dateFormat
+        ''' Datumsangaben mit Cache, die Zaehler erscheinen in der Statistik des Einlesens '''
+        self.dateTransformer = DateTransformer(dateFormat)
         self._separatorTransformer = separatorTransformer
+        '''
+        optionaler Abnehmer fuer fertige Artikel, wird mit (mode, article) aufgerufen sobald ein Artikel geschlossen wird.
+        Ist er gesetzt, werden die Artikel nicht in articles gesammelt.
+        '''
+        self._articleSink = articleSink
+        '''
+        optionale ArticleValidationPipeline, die die Artikel in Arbeitsprozessen validiert, waehrend weitergelesen wird.
+        Ohne Pipeline wird jeder Artikel direkt beim Schliessen validiert.
+        '''
+        self._validationPipeline = validationPipeline
+        ''' Anzahl der bisher gespeicherten Artikel, z.B. fuer die Fortschrittsmeldungen '''
+        self.articleCount = 0
+        ''' Spaltenaufteilung der gespeicherten Artikel fuer den Export in den Mapping-Master '''
+        self.layout = ArticleLayout()
 
         '''articles by SKU and Product Structure as Value'''
         self.articles = { "new" : [], "update" : [], "delete" : [], "failed" : [] }
@@ -150,6 +169,9 @@ class BMEcatImportHandler(handler.ContentHandler):
         self.__currentPriceDetails = None
         self.__currentElement = None
         self.__currentContent = ""
+        ''' Textstuecke des aktuellen Elements, werden erst beim Schliessen des Elements zusammengefuegt '''
+        self.__contentChunks = []
+        self.__contentEndsWithBlank = False
         self.__dateType = None
         self.__currentFeatureSet = None
         self.__currentFeature = None
@@ -159,6 +181,17 @@ class BMEcatImportHandler(handler.ContentHandler):
         self.__currentVariantSet = None
         self.__lineFeedToHTML = False
         self.__currentArticleMode = "failed"
+        ''' bereits ermittelte Handler je Tagname, wie er im Dokument steht '''
+        self.__startHandlerCache = {}
+        self.__endHandlerCache = {}
+
+    ''' neuen Handler mit gleichem Datumsformat und einer Kopie der (ggf. schon erkannten) Trennzeichen erstellen, optional mit eigenem Abnehmer '''
+    def copyConfiguration(self, articleSink=None):
+        return self.__class__(self.__dateFormat, copy.copy(self._separatorTransformer), articleSink)
+
+    ''' stehen die Trennzeichen fest, d.h. vorgegeben oder bereits erkannt? '''
+    def separatorsDetermined(self):
+        return self._separatorTransformer.separatorsDetermined()
 
     ''' Starte aktuelles XML Element '''
     def startElement(self, name, attrs):
@@ -170,23 +203,38 @@ class BMEcatImportHandler(handler.ContentHandler):
 
     ''' Handler ermitteln, der die Arbeit macht. '''
     def _workOnElement(self, name, attrs, bOpen):
-        logging.debug("Call for Tag <" + name + ">")
-        method = None
+        handlerCache = self.__startHandlerCache if bOpen else self.__endHandlerCache
         try:
-            handlerInfo = self._determineTagHandlername(name, bOpen)
-            if handlerInfo is None:
-                self.__currentContent = ""
-                return
-
-            if isinstance(handlerInfo, (tuple)):
-                method = getattr(self, handlerInfo[0])
-                method(handlerInfo[1], handlerInfo[2])
-            else:
-                method = getattr(self, handlerInfo)
-                method(attrs)
-            self.__currentContent = ""
+            method = handlerCache[name]
+        except KeyError:
+            method = handlerCache[name] = self._compileTagHandler(name, bOpen)
+        if not bOpen:
+            self.__currentContent = self._joinContent()
+        try:
+            method(attrs)
         except AttributeError:
             raise NotImplementedError("Class [{0}] does not implement [{1}]".format(self.__class__.__name__, method))
+        self._resetContent()
+
+    ''' Handler fuer das XML-Element einmalig ermitteln und als aufrufbare Methode mit Parameter attrs zurueckgeben. '''
+    def _compileTagHandler(self, tag, bOpen):
+        logging.debug("Ermittle Handler fuer Tag <" + tag + ">")
+        handlerInfo = self._determineTagHandlername(tag, bOpen)
+        if handlerInfo is None:
+            return self._ignoreElement
+
+        handlerName = handlerInfo[0] if isinstance(handlerInfo, (tuple)) else handlerInfo
+        try:
+            method = getattr(self, handlerName)
+        except AttributeError:
+            raise NotImplementedError("Class [{0}] does not implement [{1}]".format(self.__class__.__name__, handlerName))
+
+        if isinstance(handlerInfo, (tuple)):
+            return lambda attrs: method(handlerInfo[1], handlerInfo[2])
+        return method
+
+    def _ignoreElement(self, attrs=None):
+        pass
 
     ''' Handlernamen fuer das XML-Element ermitteln. '''
     def _determineTagName(self, tag, bOpen):
@@ -216,7 +264,7 @@ class BMEcatImportHandler(handler.ContentHandler):
         self.__currentMime = None
         self.__currentPriceDetails = None
         self.__currentElement = None
-        self.__currentContent = ""
+        self._resetContent()
         self.__dateType = None
         self.__currentFeatureSet = None
         self.__currentFeature = None
@@ -231,7 +279,7 @@ class BMEcatImportHandler(handler.ContentHandler):
                            "werden. Es wird schon ein Artikel verarbeitet.",
                            True)
         self.__currentArticle = Product()
-        self.__currentContent = ""
+        self._resetContent()
         self.__currentElement = self.__currentArticle
         if 'mode' in attrs.getNames():
             self.__currentArticleMode = attrs.getValue('mode')
@@ -243,12 +291,35 @@ class BMEcatImportHandler(handler.ContentHandler):
     def saveProduct(self, attr=None):
         logging.info("Produkt validieren: " + self.__currentArticle.productId)
         self._objectIsNotNone(self.__currentArticle , "Es wurde kein aktuell zu bearbeitender Artikel gefunden.", True)
-        self.__currentArticle.validate(False)
-        logging.debug("Neues Produkt erstellt. Modus: " + self.__currentArticleMode)
-        self.articles[self.__currentArticleMode].append(self.__currentArticle)
+        if self._validationPipeline is None:
+            self.__currentArticle.validate(False)
+            logging.debug("Neues Produkt erstellt. Modus: " + self.__currentArticleMode)
+            self.storeArticle(self.__currentArticleMode, self.__currentArticle)
+        else:
+            self._storeArticles(self._validationPipeline.submit(self.__currentArticleMode, self.__currentArticle))
         logging.debug("Produktende")
         self._resetAll()
 
+    ''' Dokumentende: noch in der Pipeline befindliche Artikel abholen '''
+    def endDocument(self):
+        if self._validationPipeline is not None:
+            self._storeArticles(self._validationPipeline.finish())
+
+    ''' validierte Artikel aus der Pipeline in Dokumentreihenfolge speichern '''
+    def _storeArticles(self, validatedArticles):
+        for mode, article in validatedArticles:
+            logging.debug("Neues Produkt erstellt. Modus: " + mode)
+            self.storeArticle(mode, article)
+
+    ''' Artikel an den Abnehmer weiterreichen oder sammeln, z.B. auch die in Arbeitsprozessen gelesenen Artikel '''
+    def storeArticle(self, mode, article):
+        self.articleCount += 1
+        self.layout.addArticle(article)
+        if self._articleSink is None:
+            self.articles[mode].append(article)
+        else:
+            self._articleSink(mode, article)
+
     ''' ---------------------------------------------------------------------'''
     def createProductDetails(self, attrs):
         self._objectIsNotNone(self.__currentArticle,
@@ -360,7 +431,7 @@ class BMEcatImportHandler(handler.ContentHandler):
                            "Fehler im BMEcat: Neues Attributset soll erstellt werden. Es wird schon ein Attributset verarbeitet.",
                            True)
         self.__currentFeatureSet = FeatureSet()
-        self.__currentContent = ""
+        self._resetContent()
 
     def saveFeatureSet(self, attrs=None):
         self._objectIsNotNone(self.__currentArticle,
@@ -373,7 +444,7 @@ class BMEcatImportHandler(handler.ContentHandler):
         self._objectIsNone(self.__currentFeature, "Fehler im BMEcat: Neues Attribut soll erstellt werden. Es wird schon ein Attribut verarbeitet.", True)
         self.__currentFeature = Feature()
         self.__currentElement = self.__currentFeature
-        self.__currentContent = ""
+        self._resetContent()
 
     def saveFeature(self, attrs=None):
         if self._objectIsNotNone(self.__currentFeatureSet, "Attribut soll gespeichert werden. Aber es ist kein Attributset vorhanden", False):
@@ -518,24 +589,45 @@ class BMEcatImportHandler(handler.ContentHandler):
             logging.warning("Kein Datumstyp gesetzt. Datum kann nicht gespeichert werden.")
         elif self.__dateType == 'valid_start_date':
             logging.debug("Datum [" + self.__currentContent + "] wird als Startdatum gespeichert.")
-            self.__currentElement.validFrom = datetime.strptime(self.__currentContent, self.__dateFormat)
+            self.__currentElement.validFrom = self.dateTransformer.transform(self.__currentContent)
         elif self.__dateType == 'valid_end_date':
             logging.debug("Datum [" + self.__currentContent + "] wird als Enddatum gespeichert.")
-            self.__currentElement.validTo = datetime.strptime(self.__currentContent, self.__dateFormat)
+            self.__currentElement.validTo = self.dateTransformer.transform(self.__currentContent)
         else:
             logging.warning("Datum [" + self.__dateType + "] kann nicht gespeichert werden.")
 
+    ''' ---------------------------------------------------------------------'''
+    ''' Entitaet, deren Definition nur in der (nicht geladenen) DTD stehen kann. Der Text waere ohne sie unvollstaendig. '''
+    def skippedEntity(self, name):
+        raise DTDEntityException("Die Entitaet '&{0};' ist im BMEcat nicht definiert und wird in der DTD erwartet. ".format(name) +
+                                 "Die DTD wurde nicht geladen (--dtd=skip) oder definiert die Entitaet nicht.")
+
     ''' ---------------------------------------------------------------------'''
     '''aktuellen Inhalt des XML-Elements ermitteln'''
     def characters(self, content):
-        logging.debug("Original input: '{0}'".format(content))
         if self.__lineFeedToHTML:
-            self.__currentContent += content.replace("\n", "<br>").strip()
+            chunk = content.replace("\n", "<br>").strip()
         else:
-            if len(self.__currentContent) > 0 and len(content) > len(content.strip()):
-                self.__currentContent = self.__currentContent.strip() + ' '
-            self.__currentContent += content.strip()
-        logging.debug("Saved input: '{0}'".format(self.__currentContent))
+            chunk = content.strip()
+            if len(chunk) < len(content) and (self.__contentChunks or self.__contentEndsWithBlank):
+                self.__contentEndsWithBlank = True
+        if chunk:
+            if self.__contentEndsWithBlank:
+                self.__contentChunks.append(' ')
+                self.__contentEndsWithBlank = False
+            self.__contentChunks.append(chunk)
+
+    ''' gesammelte Textstuecke einmalig zusammenfuegen '''
+    def _joinContent(self):
+        content = "".join(self.__contentChunks)
+        if self.__contentEndsWithBlank:
+            content += ' '
+        return content
+
+    def _resetContent(self):
+        self.__contentChunks = []
+        self.__contentEndsWithBlank = False
+        self.__currentContent = ""
 
     def _noValidatingObject(self, elementToCheck, msg, raiseException):
         if not isinstance(elementToCheck, ValidatingObject):
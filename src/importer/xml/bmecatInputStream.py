@@ -0,0 +1,157 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+import io
+import logging
+import mmap
+import os
+import time
+
+from compressedFile import isCompressed
+from compressedFile import wrapFile
+
+
+class BMEcatInputStream(io.RawIOBase):
+    '''
+    Liest einen BMEcat ueber ein mmap der Datei in Bloecken von hoechstens readSize Bytes und meldet den Fortschritt an
+    ImportProgress.
+
+    Leere Dateien lassen sich nicht mappen und werden direkt gelesen. Der Dateiname bleibt als name erhalten,
+    damit relative DTDs wie beim Lesen ueber den Dateinamen gefunden werden.
+
+    Komprimierte Dateien (*.gz, *.zst) werden beim Lesen entpackt. Die Bloecke enden ebenso nach einem Zeilenumbruch,
+    der Fortschritt wird in Bytes der komprimierten Datei gemeldet.
+    '''
+
+    defaultReadSize = 1024 * 1024
+
+    def __init__(self, filename, readSize=None, progress=None):
+        '''
+        Constructor
+
+        @param filename: Name des BMEcats
+        @param readSize: Anzahl Bytes, die der Parser je Block erhaelt
+        @param progress: optionales ImportProgress
+        '''
+        super().__init__()
+        self.name = filename
+        self.readSize = readSize or self.defaultReadSize
+        self.__file = open(filename, "rb")
+        self.size = os.fstat(self.__file.fileno()).st_size
+        self.__stream = None
+        if isCompressed(filename):
+            self.__stream = wrapFile(self.__file, filename, "rb")
+            self.__remainder = b""
+            self.__data = None
+        else:
+            self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ) if self.size > 0 else b""
+        self.__position = 0
+        self.__progress = progress
+        if self.__progress is not None:
+            self.__progress.start(self.size)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        if self.__stream is not None:
+            return self.__readDecompressed(size)
+        if size is None or size < 0:
+            size = self.size - self.__position
+        end = min(self.__position + min(size, self.readSize), self.size)
+        if end < self.size:
+            # Bloecke enden nach einem Zeilenumbruch, damit der Parser Texte unabhaengig von readSize an denselben Stellen teilt
+            lineEnd = self.__data.rfind(b"\n", self.__position, end)
+            if lineEnd >= self.__position:
+                end = lineEnd + 1
+        data = self.__data[self.__position:end]
+        self.__position = end
+        if self.__progress is not None:
+            self.__progress.update(self.__position)
+        return data
+
+    def __readDecompressed(self, size):
+        size = self.readSize if size is None or size < 0 else min(size, self.readSize)
+        block = self.__remainder
+        if len(block) < size:
+            block += self.__stream.read(size - len(block))
+        block, self.__remainder = block[:size], block[size:]
+        if len(block) == size:
+            # erst ein kuerzerer Block zeigt das Ende der Datei an
+            lineEnd = block.rfind(b"\n")
+            if lineEnd >= 0:
+                block, self.__remainder = block[:lineEnd + 1], block[lineEnd + 1:] + self.__remainder
+        self.__position = self.__file.tell()
+        if self.__progress is not None:
+            self.__progress.update(self.__position)
+        return block
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            if isinstance(self.__data, mmap.mmap):
+                self.__data.close()
+            if self.__stream is not None:
+                self.__stream.close()
+            self.__file.close()
+            if self.__progress is not None:
+                self.__progress.finish(self.__position)
+        super().close()
+
+
+class ImportProgress(object):
+    '''
+    Gibt alle interval Sekunden die gelesenen Bytes, die Artikel pro Sekunde und die geschaetzte Restzeit aus,
+    damit sich ein haengender Import von einem langsamen unterscheiden laesst.
+    '''
+
+    def __init__(self, interval, articleCounter, clock=time.monotonic):
+        '''
+        Constructor
+
+        @param interval: Sekunden zwischen zwei Meldungen
+        @param articleCounter: liefert die Anzahl der bisher eingelesenen Artikel
+        @param clock: Zeitquelle in Sekunden
+        '''
+        self._interval = interval
+        self._articleCounter = articleCounter
+        self._clock = clock
+        self.totalBytes = 0
+        self.__startTime = None
+        self.__nextReport = None
+
+    def start(self, totalBytes):
+        self.totalBytes = totalBytes
+        self.__startTime = self._clock()
+        self.__nextReport = self.__startTime + self._interval
+
+    def update(self, processedBytes):
+        now = self._clock()
+        if now >= self.__nextReport:
+            self.__nextReport = now + self._interval
+            self.report(processedBytes, now)
+
+    def finish(self, processedBytes):
+        logging.info(self.describe(processedBytes, self._clock()))
+
+    def report(self, processedBytes, now):
+        message = self.describe(processedBytes, now)
+        logging.info(message)
+        print(message)
+
+    def describe(self, processedBytes, now):
+        elapsed = max(now - self.__startTime, 1e-9)
+        articlesPerSecond = self._articleCounter() / elapsed
+        percent = 100.0 * processedBytes / self.totalBytes if self.totalBytes > 0 else 100.0
+        message = "Eingelesen: {0:.1f} MB von {1:.1f} MB ({2:.1f}%), {3:.0f} Artikel/s".format(processedBytes / 1048576, self.totalBytes / 1048576,
+                                                                                               percent, articlesPerSecond)
+        if 0 < processedBytes < self.totalBytes:
+            remainingSeconds = int((self.totalBytes - processedBytes) * elapsed / processedBytes)
+            message += ", Restzeit ca. {0:02d}:{1:02d}:{2:02d}".format(remainingSeconds // 3600, remainingSeconds // 60 % 60, remainingSeconds % 60)
+        return message
@@ -0,0 +1,161 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+from xml.sax.xmlreader import AttributesImpl
+import logging
+import os
+import re
+
+from lxml import etree
+
+from error import DTDEntityException
+from importer.xml.bmecatInputStream import BMEcatInputStream
+from resolver import DTDResolver
+
+
+class BMEcatIterparseImporter(object):
+    '''
+    Liest BMEcats mit lxml.etree.iterparse statt mit dem Sax2Parser.
+
+    Die Start- und Endtags werden an den uebergebenen BMEcatImportHandler weitergereicht, damit dieselben Aliase
+    (z.B. ARTICLE aus BMEcat 1.2 und PRODUCT aus BMEcat 2005) und dieselben Datenobjekte wie beim SAX-Import entstehen.
+    Der Text eines Elements wird wie beim Sax2Parser zeilenweise an den Handler uebergeben.
+    Jedes abgeschlossene Element wird geleert und seine Vorgaenger werden entfernt, so dass der Baum nicht anwaechst.
+    Mit loadDTD wird die DTD wie beim SAX-Import ueber den DTDResolver geladen, externe allgemeine Entitaeten werden nie
+    aufgeloest.
+    Die Datei wird ueber einen BMEcatInputStream in Bloecken von hoechstens readSize Bytes gelesen.
+    '''
+
+    __lineSplitter = re.compile(r'(\n)')
+    __noAttributes = AttributesImpl({})
+    __undeclaredEntity = re.compile(r"Entity '([^']*)' not defined")
+
+    def __init__(self, importHandler, loadDTD=True, readSize=None, progress=None):
+        '''
+        Constructor
+
+        @param importHandler: BMEcatImportHandler, der die Artikel erstellt
+        @param loadDTD: externe DTD laden oder ueberspringen
+        @param readSize: Anzahl Bytes, die je Block gelesen werden
+        @param progress: optionales ImportProgress fuer die Fortschrittsmeldungen
+        '''
+        self._importHandler = importHandler
+        self._loadDTD = loadDTD
+        self._readSize = readSize
+        self._progress = progress
+
+    def parse(self, filename):
+        with BMEcatInputStream(filename, self._readSize, self._progress) as file:
+            self._parseFile(file)
+
+    def _parseFile(self, file):
+        try:
+            self.__parseEvents(self._createIterparse(file))
+        except etree.XMLSyntaxError as syntaxError:
+            if syntaxError.code != etree.ErrorTypes.WAR_UNDECLARED_ENTITY:
+                raise
+            self.__reportUndeclaredEntity(syntaxError.msg)
+
+    def _createIterparse(self, file):
+        if not self._loadDTD:
+            return etree.iterparse(file, events=("start", "end"), no_network=True, huge_tree=True)
+        events = etree.iterparse(file, events=("start", "end"), no_network=True, huge_tree=True, load_dtd=True, resolve_entities=True)
+        events.resolvers.add(_LxmlDTDResolver(os.path.dirname(os.path.abspath(file.name)) if hasattr(file, "name") else None))
+        return events
+
+    def __parseEvents(self, events):
+        self._importHandler.startDocument()
+        checkedMessages = 0
+        for event, element in events:
+            if event == "end" and len(events.error_log) > checkedMessages:
+                checkedMessages = self.__checkErrorLog(events.error_log, checkedMessages)
+            tag = element.tag
+            if tag[0] == "{":
+                tag = tag[tag.index("}") + 1:]
+            if event == "start":
+                attributes = element.attrib
+                self._importHandler.startElement(tag, AttributesImpl(dict(attributes)) if len(attributes) > 0 else self.__noAttributes)
+            else:
+                self.__passText(self.__determineTextBeforeEndTag(element))
+                self._importHandler.endElement(tag)
+                self.__releaseElement(element)
+        self._importHandler.endDocument()
+
+    def __checkErrorLog(self, errorLog, checkedMessages):
+        '''
+        libxml2 meldet Entitaeten, die nur in der (nicht geladenen) DTD definiert sein koennen, als Warnung und bricht erst am
+        Ende des Dokuments ab. Sie werden wie beim SAX-Import sofort an den Handler gemeldet.
+        '''
+        for message in list(errorLog)[checkedMessages:]:
+            if message.type == etree.ErrorTypes.WAR_UNDECLARED_ENTITY:
+                self.__reportUndeclaredEntity(message.message)
+        return len(errorLog)
+
+    def __reportUndeclaredEntity(self, message):
+        entityName = self.__undeclaredEntity.search(message)
+        self._importHandler.skippedEntity(entityName.group(1) if entityName is not None else message)
+
+    def __determineTextBeforeEndTag(self, element):
+        '''
+        Text zwischen dem letzten Kindelement und dem Endtag, Kommentare und Processing Instructions werden uebersprungen.
+        '''
+        textParts = []
+        for child in reversed(element):
+            textParts.append(child.tail or "")
+            if isinstance(child.tag, str):
+                break
+        else:
+            textParts.append(element.text or "")
+        return "".join(reversed(textParts))
+
+    def __passText(self, text):
+        if len(text) == 0:
+            return
+        for line in self.__lineSplitter.split(text):
+            if len(line) > 0:
+                self._importHandler.characters(line)
+
+    def __releaseElement(self, element):
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+class _LxmlDTDResolver(etree.Resolver):
+    '''
+    Leitet die DTDs der BMEcats fuer lxml auf die Dateien aus dem DTDResolver um. Andere DTDs werden nur aus dem
+    Verzeichnis des Dokuments geladen, jede weitere externe Quelle wird als leer aufgeloest.
+
+    resolve_entities="internal" laesst sich nicht nutzen, damit laedt libxml2 auch die externen Parameterentitaeten der
+    BMEcat-DTDs (z.B. %BASE;) nicht mehr. Da lxml DTDs und externe allgemeine Entitaeten ueber denselben Resolver laedt,
+    werden neben dem Dokument nur Dateien mit der Endung .dtd geladen.
+    '''
+
+    def __init__(self, documentDirectory=None):
+        super().__init__()
+        self.__bmecatVersions = DTDResolver().bmecatVersions
+        self.__documentDirectory = documentDirectory
+
+    def resolve(self, url, publicId, context):
+        name = os.path.basename(url)
+        if name in self.__bmecatVersions:
+            return self.resolve_filename(self.__bmecatVersions[name], context)
+        if "://" in url or not url.lower().endswith(".dtd") or not self.__isInDocumentDirectory(url):
+            logging.warning("Externe Entitaet '{0}' ist keine bekannte DTD und wird nicht geladen.".format(url))
+            return self.resolve_string("", context)
+        if not os.path.exists(url):
+            raise FileNotFoundError("DTD '{0}' wurde nicht gefunden.".format(url))
+        return None
+
+    def __isInDocumentDirectory(self, path):
+        if self.__documentDirectory is None:
+            return False
+        try:
+            return os.path.commonpath([ self.__documentDirectory, os.path.abspath(path) ]) == self.__documentDirectory
+        except ValueError:
+            # unter Windows auf einem anderen Laufwerk
+            return False
@@ -0,0 +1,92 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+from xml.sax import handler
+
+from datamodel import ArticleLayout
+from importer.xml.bmecatImportHandler import BMEcatImportHandler
+
+
+class BMEcatLayoutScanner(handler.ContentHandler):
+    '''
+    Erster Durchlauf fuer den Export in den Mapping-Master ohne Zwischenspeicher aller Artikel.
+
+    Zaehlt je Artikel die Preise, Bilder, Attribute und Spezialbehandlungsklassen nur anhand der Start- und Endtags und
+    erstellt keine Datenobjekte. Die Engines versorgen ihn wie den BMEcatImportHandler, die Aliase aus BMEcat 2005
+    werden ebenso beruecksichtigt. Eintraege, die der Import spaeter als ungueltig verwirft, werden mitgezaehlt,
+    ihre Spalten bleiben dann leer.
+    '''
+
+    __countedElements = { "article" : "article",
+                          "product" : "article",
+                          "price" : "price",
+                          "article_price" : "price",
+                          "product_price" : "price",
+                          "mime" : "mime",
+                          "feature" : "feature",
+                          "variant" : "variant",
+                          "special_treatment_class" : "specialTreatmentClass" }
+
+    def __init__(self):
+        super().__init__()
+        self.layout = ArticleLayout()
+        ''' Anzahl der bisher gezaehlten Artikel, z.B. fuer die Fortschrittsmeldungen '''
+        self.articleCount = 0
+        ''' Art des Elements je Tagname, wie er im Dokument steht '''
+        self.__kindByTag = {}
+        self.__inArticle = False
+        self.__resetCounts()
+
+    def __resetCounts(self):
+        self.__numberOfPrices = 0
+        self.__numberOfMimes = 0
+        self.__numberOfAttributes = 0
+        self.__numberOfSpecialTreatmentClasses = 0
+        self.__numberOfVariants = 1
+        self.__variantsOfFeature = 0
+
+    def __determineKind(self, tag):
+        try:
+            return self.__kindByTag[tag]
+        except KeyError:
+            kind = self.__kindByTag[tag] = self.__countedElements.get(tag.lower())
+            return kind
+
+    def startElement(self, name, attrs):
+        kind = self.__determineKind(name)
+        if kind is None:
+            return
+        if kind == "article":
+            self.__inArticle = True
+            self.__resetCounts()
+        elif not self.__inArticle:
+            return
+        elif kind == "price":
+            self.__numberOfPrices += 1
+        elif kind == "mime":
+            self.__numberOfMimes += 1
+        elif kind == "feature":
+            self.__numberOfAttributes += 1
+            self.__variantsOfFeature = 0
+        elif kind == "variant":
+            self.__variantsOfFeature += 1
+        else:
+            self.__numberOfSpecialTreatmentClasses += 1
+
+    def endElement(self, name):
+        kind = self.__determineKind(name)
+        if not self.__inArticle:
+            return
+        if kind == "feature" and self.__variantsOfFeature > 0:
+            # wie im Produkt: Anzahl bestehender Varianten multipliziert mit den Varianten dieses Attributs
+            self.__numberOfVariants *= self.__variantsOfFeature
+        elif kind == "article":
+            self.layout.add(self.__numberOfPrices, self.__numberOfMimes, self.__numberOfAttributes,
+                            self.__numberOfSpecialTreatmentClasses, self.__numberOfVariants)
+            self.articleCount += 1
+            self.__inArticle = False
+
+    ''' Entitaeten aus der nicht geladenen DTD schon im ersten Durchlauf melden, der Import wuerde daran scheitern '''
+    skippedEntity = BMEcatImportHandler.skippedEntity
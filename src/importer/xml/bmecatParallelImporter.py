@@ -0,0 +1,256 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from xml.sax import SAXException
+from xml.sax import SAXParseException
+import io
+import logging
+import mmap
+import os
+import re
+
+from compressedFile import isCompressed
+from importer.xml.bmecatIterparseImporter import BMEcatIterparseImporter
+from importer.xml.bmecatSaxImporter import BMEcatSaxImporter
+from workerLogging import emitLogRecords
+from workerLogging import initializeWorkerLogging
+from workerLogging import takeLogRecords
+
+
+class BMEcatParallelImporter(object):
+    '''
+    Liest grosse BMEcats parallel in mehreren Prozessen.
+
+    Zuerst werden in einem schnellen Durchlauf ueber die Bytes der Datei die Grenzen der ARTICLE- bzw. PRODUCT-Elemente
+    innerhalb von T_NEW_CATALOG gesucht und der Katalog in Teilstuecke zerlegt. Jedes Teilstueck wird mit dem Kopf der
+    Datei (XML-Deklaration, DOCTYPE, Wurzelelement mit Namespaces, HEADER und Start von T_NEW_CATALOG) sowie den
+    passenden Endtags zu einem eigenstaendigen Dokument ergaenzt und von einer Kopie des BMEcatImportHandlers gelesen.
+    Die Artikel werden in der Reihenfolge des Dokuments an den uebergebenen Handler weitergereicht. Es sind hoechstens
+    doppelt so viele Teilstuecke wie Prozesse unterwegs, damit sich die gelesenen Artikel nicht im Speicher stauen.
+
+    Laesst sich die Datei nicht zerlegen (kein T_NEW_CATALOG, UTF-16, zu klein, komprimiert), wird sie wie bisher am
+    Stueck gelesen.
+    '''
+
+    __catalogStart = re.compile(rb"<T_NEW_CATALOG[\s>]")
+    __catalogEnd = b"</T_NEW_CATALOG"
+    __rootStart = re.compile(rb"<([^?!\s>/]+)")
+    __articleStart = re.compile(rb"<(?:ARTICLE|PRODUCT)[\s>]")
+
+    def __init__(self, importHandler, processes=None, engine="sax", loadDTD=True, minimumChunkSize=4 * 1024 * 1024, readSize=None, progress=None):
+        '''
+        Constructor
+
+        @param importHandler: BMEcatImportHandler, an den die Artikel in Dokumentreihenfolge uebergeben werden
+        @param processes: Anzahl der Prozesse, Standard ist die Anzahl der Kerne
+        @param engine: sax oder lxml, mit welcher Engine die Teilstuecke gelesen werden
+        @param loadDTD: externe DTD laden oder ueberspringen
+        @param minimumChunkSize: minimale Groesse eines Teilstuecks in Bytes
+        @param readSize: Anzahl Bytes je Block, wenn die Datei am Stueck gelesen wird
+        @param progress: optionales ImportProgress, wird nach jedem uebernommenen Teilstueck aktualisiert
+        '''
+        self._importHandler = importHandler
+        self._processes = processes or os.cpu_count() or 1
+        self._engine = engine
+        self._loadDTD = loadDTD
+        self._minimumChunkSize = minimumChunkSize
+        self._readSize = readSize
+        self._progress = progress
+
+    def parse(self, filename):
+        catalog = self.scan(filename)
+        if catalog is None or len(catalog.chunks) < 2:
+            logging.info("BMEcat wird nicht zerlegt und am Stueck gelesen.")
+            _createImporter(self._importHandler, self._engine, self._loadDTD, self._readSize, self._progress).parse(filename)
+            return
+        logging.info("BMEcat wird in {0} Teilstuecken mit {1} Prozessen gelesen.".format(len(catalog.chunks), self._processes))
+
+        firstChunk = catalog.chunks[0]
+        if self._progress is not None:
+            self._progress.start(os.path.getsize(filename))
+        with ProcessPoolExecutor(max_workers=self._processes, initializer=initializeWorkerLogging,
+                                 initargs=(logging.getLogger().getEffectiveLevel(),)) as executor:
+            remainingChunks = iter(catalog.chunks[1:])
+            pendingChunks = deque()
+            if self._importHandler.separatorsDetermined():
+                for chunk in islice(remainingChunks, self._processes * 2):
+                    pendingChunks.append(self.__submitChunk(executor, filename, catalog, chunk))
+                self.__parseFirstChunk(filename, catalog, firstChunk)
+            else:
+                # erst das erste Teilstueck lesen, damit alle Teilstuecke mit denselben erkannten Trennzeichen arbeiten
+                self.__parseFirstChunk(filename, catalog, firstChunk)
+            self.__updateProgress(firstChunk.end)
+            for chunk in remainingChunks:
+                pendingChunks.append(self.__submitChunk(executor, filename, catalog, chunk))
+                if len(pendingChunks) > self._processes * 2:
+                    self.__storeParsedChunk(pendingChunks.popleft(), pendingChunks)
+            while len(pendingChunks) > 0:
+                self.__storeParsedChunk(pendingChunks.popleft(), pendingChunks)
+        if self._progress is not None:
+            self._progress.finish(os.path.getsize(filename))
+
+    def __updateProgress(self, position):
+        if self._progress is not None:
+            self._progress.update(position)
+
+    def __parseFirstChunk(self, filename, catalog, chunk):
+        with open(filename, "rb") as file:
+            _parseChunkStream(self._importHandler, file, catalog.prolog, chunk, catalog.epilog, self._engine, self._loadDTD)
+
+    def __submitChunk(self, executor, filename, catalog, chunk):
+        chunkHandler = self._importHandler.copyConfiguration()
+        return chunk, executor.submit(_parseChunk, filename, catalog.prolog, chunk, catalog.epilog, chunkHandler, self._engine, self._loadDTD)
+
+    def __storeParsedChunk(self, parsedChunk, pendingChunks):
+        '''
+        Ergebnis eines Teilstuecks uebernehmen, bei einem Fehler die noch ausstehenden Teilstuecke verwerfen
+        '''
+        chunk, future = parsedChunk
+        articles, logRecords, dateHits, dateMisses, exception = future.result()
+        emitLogRecords(logRecords)
+        self._importHandler.dateTransformer.addStatistics(dateHits, dateMisses)
+        for mode, article in articles:
+            self._importHandler.storeArticle(mode, article)
+        if exception is not None:
+            for pendingChunk, pendingFuture in pendingChunks:
+                pendingFuture.cancel()
+            raise exception
+        self.__updateProgress(chunk.end)
+
+    def scan(self, filename):
+        '''
+        Sucht die Grenzen der Teilstuecke, ohne das XML zu parsen.
+
+        @return: BMEcatChunks oder None, wenn die Datei nicht zerlegt werden kann
+        '''
+        if isCompressed(filename):
+            # komprimierte Dateien lassen sich nur von vorne lesen
+            return None
+        with open(filename, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return None
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return self.__scanData(data)
+
+    def __scanData(self, data):
+        if data[:2] in (b"\xff\xfe", b"\xfe\xff"):
+            return None
+        catalogStart = self.__catalogStart.search(data)
+        catalogEnd = data.rfind(self.__catalogEnd)
+        root = self.__rootStart.search(data, 0, catalogStart.start()) if catalogStart is not None else None
+        if root is None or catalogEnd < catalogStart.start():
+            return None
+
+        bodyStart = data.find(b">", catalogStart.start()) + 1
+        chunkSize = max(self._minimumChunkSize, (catalogEnd - bodyStart) // (self._processes * 4))
+        boundaries = [ bodyStart ]
+        while boundaries[-1] + chunkSize < catalogEnd:
+            nextArticle = self.__articleStart.search(data, boundaries[-1] + chunkSize, catalogEnd)
+            if nextArticle is None:
+                break
+            boundaries.append(nextArticle.start())
+        boundaries.append(catalogEnd)
+        chunks = [ BMEcatChunk(start, end) for start, end in zip(boundaries[:-1], boundaries[1:]) ]
+
+        epilog = b"</T_NEW_CATALOG></" + root.group(1) + b">"
+        return BMEcatChunks(data[:bodyStart], chunks, epilog)
+
+
+class BMEcatChunks(object):
+    '''
+    Ergebnis der Vorpruefung: Kopf der Datei, Teilstuecke und abschliessende Endtags
+    '''
+
+    def __init__(self, prolog, chunks, epilog):
+        self.prolog = prolog
+        self.chunks = chunks
+        self.epilog = epilog
+
+
+class BMEcatChunk(object):
+    '''
+    Bytebereich eines Teilstuecks innerhalb von T_NEW_CATALOG
+    '''
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+
+class _ChunkStream(io.RawIOBase):
+    '''
+    Liefert Kopf, Bytebereich des Teilstuecks und Endtags als einen zusammenhaengenden Datenstrom.
+    Der Name der Datei bleibt erhalten, damit relative DTDs wie beim Lesen am Stueck gefunden werden.
+    '''
+
+    def __init__(self, file, prolog, chunk, epilog):
+        super().__init__()
+        self.name = file.name
+        file.seek(chunk.start)
+        self.__parts = [ io.BytesIO(prolog), _LimitedReader(file, chunk.end - chunk.start), io.BytesIO(epilog) ]
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while len(self.__parts) > 0:
+            data = self.__parts[0].read(len(buffer))
+            if len(data) > 0:
+                buffer[:len(data)] = data
+                return len(data)
+            self.__parts.pop(0)
+        return 0
+
+
+class _LimitedReader(object):
+
+    def __init__(self, file, length):
+        self.__file = file
+        self.__remaining = length
+
+    def read(self, size):
+        data = self.__file.read(min(size, self.__remaining))
+        self.__remaining -= len(data)
+        return data
+
+
+def _createImporter(importHandler, engine, loadDTD, readSize=None, progress=None):
+    if engine == "lxml":
+        return BMEcatIterparseImporter(importHandler, loadDTD, readSize, progress)
+    return BMEcatSaxImporter(importHandler, loadDTD, readSize, progress)
+
+
+def _parseChunkStream(importHandler, file, prolog, chunk, epilog, engine, loadDTD):
+    _createImporter(importHandler, engine, loadDTD)._parseFile(_ChunkStream(file, prolog, chunk, epilog))
+
+
+def _parseChunk(filename, prolog, chunk, epilog, handlerConfiguration, engine, loadDTD):
+    '''
+    Liest ein Teilstueck im Arbeitsprozess und gibt die Artikel als Liste von (mode, article), die gesammelten Meldungen
+    ohne die zum Kopf der Datei und die Zaehler des Datumscaches zurueck. Ein Fehler wird mit den bis dahin gelesenen
+    Artikeln zurueckgegeben, damit der Hauptprozess ihn nach den Meldungen des Teilstuecks wirft. Der Abnehmer fuer die
+    Artikel laesst sich nicht an den Arbeitsprozess uebergeben, daher wird der Handler erst hier mit ihm erstellt.
+    '''
+    articles = []
+    chunkHandler = handlerConfiguration.copyConfiguration(lambda mode, article: articles.append((mode, article)))
+    exception = None
+    with open(filename, "rb") as file:
+        # die Meldungen zum Kopf der Datei hat der Hauptprozess schon beim ersten Teilstueck ausgegeben
+        takeLogRecords()
+        _parseChunkStream(handlerConfiguration.copyConfiguration(lambda mode, article: None), file, prolog,
+                          BMEcatChunk(chunk.start, chunk.start), epilog, engine, loadDTD)
+        numberOfPrologRecords = len(takeLogRecords())
+        try:
+            _parseChunkStream(chunkHandler, file, prolog, chunk, epilog, engine, loadDTD)
+        except SAXParseException as parseException:
+            # SAXParseException haelt den Parser fest und laesst sich nicht an den Hauptprozess uebergeben
+            exception = SAXException("{0} (Teilstueck ab Byte {1})".format(str(parseException), chunk.start))
+        except Exception as e:
+            exception = e
+    logRecords = takeLogRecords()[numberOfPrologRecords:]
+    return articles, logRecords, chunkHandler.dateTransformer.hits, chunkHandler.dateTransformer.misses, exception
@@ -0,0 +1,91 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+from xml.sax import expatreader
+from xml.sax import saxutils
+from xml.sax import xmlreader
+from xml.sax.handler import feature_external_ges
+from xml.sax.handler import feature_external_pes
+from xml.sax.xmlreader import InputSource
+import urllib.error
+
+from importer.xml.bmecatInputStream import BMEcatInputStream
+from resolver import DTDResolver
+
+
+class BMEcatSaxImporter(object):
+    '''
+    Liest BMEcats mit dem Sax2Parser.
+
+    Mit loadDTD werden die DTD aus dem DOCTYPE und die darin eingebundenen Parameterentitaeten ueber den DTDResolver
+    geladen. Externe allgemeine Entitaeten werden in keinem Fall geladen, feature_external_ges bleibt aus.
+    Ohne loadDTD wird der Parser so eingestellt, dass er keine externen Entitaeten und keine externe DTD anfasst.
+    Die Datei wird ueber einen BMEcatInputStream in Bloecken von readSize Bytes an den Parser gegeben.
+    '''
+
+    def __init__(self, importHandler, loadDTD=True, readSize=None, progress=None):
+        '''
+        Constructor
+
+        @param importHandler: BMEcatImportHandler, der die Artikel erstellt
+        @param loadDTD: externe DTD laden oder ueberspringen
+        @param readSize: Anzahl Bytes, die der Parser je Block liest
+        @param progress: optionales ImportProgress fuer die Fortschrittsmeldungen
+        '''
+        self._importHandler = importHandler
+        self._loadDTD = loadDTD
+        self._readSize = readSize or BMEcatInputStream.defaultReadSize
+        self._progress = progress
+
+    def parse(self, filename):
+        with BMEcatInputStream(filename, self._readSize, self._progress) as file:
+            self._parseFile(file)
+
+    def _parseFile(self, file):
+        source = InputSource()
+        source.setByteStream(file)
+        # Dateiname als systemId, damit relative DTDs wie beim Lesen ueber den Dateinamen gefunden werden
+        if hasattr(file, "name"):
+            source.setSystemId("file:" + file.name)
+        self._parseSource(source)
+
+    def _parseSource(self, source):
+        try:
+            self._createParser().parse(source)
+        except urllib.error.URLError as urlError:
+            raise FileNotFoundError(urlError)
+
+    def _createParser(self):
+        parser = _DTDExpatParser(bufsize=self._readSize) if self._loadDTD else expatreader.create_parser(bufsize=self._readSize)
+        parser.setContentHandler(self._importHandler)
+        parser.setFeature(feature_external_ges, False)
+        parser.setFeature(feature_external_pes, False)
+        if self._loadDTD:
+            parser.setEntityResolver(DTDResolver())
+        return parser
+
+
+class _DTDExpatParser(expatreader.ExpatParser):
+    '''
+    Laedt nur die externe DTD aus dem DOCTYPE und die darin eingebundenen Parameterentitaeten ueber den EntityResolver.
+    Externe allgemeine Entitaeten wie <!ENTITY x SYSTEM "file:///etc/passwd"> bleiben leer, so dass keine Dateien des
+    Rechners in die Artikel gelangen.
+    '''
+
+    def external_entity_ref(self, context, base, sysid, pubid):
+        # expat uebergibt nur fuer allgemeine Entitaeten einen Kontext, fuer die DTD und Parameterentitaeten None
+        if context is not None:
+            return 1
+
+        source = saxutils.prepare_input_source(self._ent_handler.resolveEntity(pubid, sysid), self._source.getSystemId() or "")
+        self._entity_stack.append((self._parser, self._source))
+        self._parser = self._parser.ExternalEntityParserCreate(context)
+        self._source = source
+        try:
+            xmlreader.IncrementalParser.parse(self, source)
+        except Exception:
+            return 0
+        (self._parser, self._source) = self._entity_stack.pop()
+        return 1
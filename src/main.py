@@ -25,11 +25,14 @@ def printHelp():
                  "   The BMEcat-Converter has to be used with the following " +
                  "arguments:\n\n\t-i \"%path_to_inputfile%\"\n" +
                  "\tthis can be a relative or absolute path, it has to be " +
-                 "either an Excelfile (*.xlsm or *.xlsx) or a BMEcat-file " +
-                 "(*.xml).\n\t-o \"%path_to_outputfile%\"\n" +
+                 "either an Excelfile (*.xlsm or *.xlsx), a Mapping-Master " +
+                 "exported as delimited text (*.csv or *.tsv) or a BMEcat-file " +
+                 "(*.xml, compressed *.xml.gz or *.xml.zst). *.xml.zst needs the optional " +
+                 "package zstandard (pip install zstandard), without it the conversion " +
+                 "stops with a wrong conversion mode.\n\t-o \"%path_to_outputfile%\"\n" +
                  "\tthis can be a relative or absolute path, it has to be " +
                  "either an Excelfile (*.xlsm or *.xlsx) or a BMEcat-file " +
-                 "(*.xml).\n\t--dateformat=\"%Y-%m-%d\"\n" +
+                 "(*.xml, compressed *.xml.gz or *.xml.zst).\n\t--dateformat=\"%Y-%m-%d\"\n" +
                  "\tthe dateformat has to be provided, if you convert from " +
                  "XML to Excel (Case one). You can usually derive the " +
                  "dateformat from the generation date of the BMEcat. If you " +
@@ -74,7 +77,69 @@ def printHelp():
                  "to dot.\n" +
                  "\t- german:\n" +
                  "\t\tset thousandsseparator to dot and decimalseparator " +
-                 "to comma.\n\n")
+                 "to comma.\n" +
+                 "\t--engine=sax\n\ttwo import engines for BMEcats are possible\n" +
+                 "\t- sax:\n" +
+                 "\t\tdefault, reads the BMEcat with the python SAX parser.\n" +
+                 "\t- lxml:\n" +
+                 "\t\treads the BMEcat with lxml iterparse, finished elements are released.\n" +
+                 "\t--processes=1\n\tnumber of processes used when reading a BMEcat or an Excel file and when " +
+                 "writing a BMEcat. With more " +
+                 "than one process the articles of T_NEW_CATALOG are split into chunks, which " +
+                 "are read in parallel with the chosen engine. The rows of an Excel file are split " +
+                 "into chunks, whose articles are created and validated in parallel. The ARTICLE " +
+                 "elements of a BMEcat are created and serialized in parallel in chunks.\n" +
+                 "\t--dtd=load\n\ttwo modes for the DTD of a BMEcat are possible\n" +
+                 "\t- load:\n" +
+                 "\t\tdefault, loads the DTD given in the DOCTYPE from the " +
+                 "documents folder.\n" +
+                 "\t- skip:\n" +
+                 "\t\tdoes not load the DTD or any other external entity. If the " +
+                 "BMEcat uses entities defined in the DTD, the conversion fails.\n" +
+                 "\t--validators=0\n\tnumber of processes validating the articles of a BMEcat while " +
+                 "the parser reads on. With 0 every article is validated directly after it is read.\n" +
+                 "\t--progress=10\n\tinterval in seconds between the progress messages while reading a " +
+                 "BMEcat (bytes read, articles per second and estimated remaining time). 0 disables them.\n" +
+                 "\t--readsize=1048576\n\tnumber of bytes handed to the parser per block when reading a " +
+                 "BMEcat from the memory mapped file.\n" +
+                 "\t--excelreader=openpyxl\n\ttwo readers for Excel files are possible\n" +
+                 "\t- openpyxl:\n" +
+                 "\t\tdefault, reads the sheet with openpyxl in read only mode.\n" +
+                 "\t- spreadsheetml:\n" +
+                 "\t\tstreams the sheet directly from the xlsx archive with lxml iterparse, " +
+                 "which is faster on large files. The created articles are the same.\n" +
+                 "\t--encoding=utf-8-sig\n\tencoding of a *.csv or *.tsv input file.\n" +
+                 "\t--delimiter=\n\tdelimiter of a *.csv or *.tsv input file, a single character " +
+                 "or 'tab'. Default is comma for *.csv and tab for *.tsv.\n" +
+                 "\t--preflight=none\n\tpreflight check when converting from Excel into BMEcat\n" +
+                 "\t- none:\n" +
+                 "\t\tdefault, no preflight check.\n" +
+                 "\t- check:\n" +
+                 "\t\treads the file once before the conversion and reports every formula and every " +
+                 "number with wrong separators together with its cell. If anything is found, the " +
+                 "conversion stops.\n" +
+                 "\t- only:\n" +
+                 "\t\tlike check, but stops after the preflight check.\n" +
+                 "\t--excelexport=memory\n\texport when converting from BMEcat into Excel\n" +
+                 "\t- memory:\n" +
+                 "\t\tdefault, reads all articles and writes the workbook afterwards.\n" +
+                 "\t- streaming:\n" +
+                 "\t\treads the BMEcat twice, first counting the columns and then writing every " +
+                 "article right after it is read into a write-only workbook. The memory usage does not depend on the size of the BMEcat.\n" +
+                 "\t--workbook=cells\n\tworkbook written by --excelexport=memory\n" +
+                 "\t- cells:\n" +
+                 "\t\tdefault, a normal openpyxl workbook which keeps every cell in memory until it is saved.\n" +
+                 "\t- writeonly:\n" +
+                 "\t\ta write-only workbook, every row is appended and streamed into the file. Needs less memory and time.\n" +
+                 "\t--dry-run\n\tonly reads and validates the articles with the given validation mode, " +
+                 "reports the number of invalid articles and writes no output file.\n" +
+                 "\t--xmlstyle=pretty\n\toutput style when converting from Excel into BMEcat\n" +
+                 "\t- pretty:\n" +
+                 "\t\tdefault, every element on its own line, indented by two spaces.\n" +
+                 "\t- compact:\n" +
+                 "\t\tno whitespace between the elements, smaller and faster to write.\n" +
+                 "\t- canonical:\n" +
+                 "\t\tCanonical XML 2.0 of the compact output, e.g. to compare or sign BMEcats.\n\n")
 
 
 def findNextFreeLogfilename(logfilename):
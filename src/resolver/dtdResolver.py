@@ -4,30 +4,67 @@ Created on 30.06.2017
 @author: henrik.pilz
 '''
 from xml.sax.handler import EntityResolver
+from xml.sax.xmlreader import InputSource
+import io
 import logging
 import os
+import urllib.parse
 
 
 class DTDResolver(EntityResolver):
     '''
-    classdocs
+    Loest die DTDs der BMEcats aus documents/BMEcat/version auf.
+
+    Der Index der DTDs wird je Verzeichnis nur einmal im Prozess aufgebaut und erst neu erstellt, wenn sich die
+    Aenderungszeit eines der durchsuchten Verzeichnisse geaendert hat. Die Inhalte der DTDs werden ebenfalls im Prozess
+    gehalten und als InputSource mit eigenem Bytestream zurueckgegeben. Index und Inhalte werden nicht in eine Datei
+    geschrieben: jeder neue Prozess (jeder Aufruf des Konverters, gestartete Arbeitsprozesse) durchsucht die Verzeichnisse
+    einmal neu, danach werden nur noch ihre Aenderungszeiten geprueft.
+
+    Aufgeloest werden nur DTDs aus dem Index und relative Pfade, die der Parser neben dem Dokument bzw. der einbindenden
+    DTD sucht. Jede andere externe Entitaet (z.B. file:///etc/passwd) wird als leere Quelle zurueckgegeben.
     '''
 
-    def __init__(self, params=None):
+    ''' DTD-Index je Wurzelverzeichnis: (DTDs nach Dateiname, Aenderungszeiten der Verzeichnisse) '''
+    _dtdIndexes = {}
+
+    ''' Inhalte der DTDs je Pfad: (Aenderungszeit, Inhalt) '''
+    _dtdContents = {}
+
+    def __init__(self, bmecatDataPath=None):
         '''
         Constructor
         '''
-        self.bmecatVersions = {}
-        bmecatDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "documents", "BMEcat", "version")
+        if bmecatDataPath is None:
+            bmecatDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "documents", "BMEcat", "version")
+        self.bmecatVersions = self._loadIndex(os.path.abspath(bmecatDataPath))
+
+    def _loadIndex(self, path):
+        index = self._dtdIndexes.get(path)
+        if index is None or not self._indexIsValid(index[1]):
+            logging.debug("Erstelle DTD-Index fuer '{0}'".format(path))
+            index = ({}, {})
+            self._checkSubDirectories(path, index[0], index[1])
+            self._dtdIndexes[path] = index
+        return index[0]
 
-        self._checkSubDirectories(bmecatDataPath)
+    def _indexIsValid(self, directoryTimes):
+        try:
+            return all(os.stat(directory).st_mtime_ns == mtime for directory, mtime in directoryTimes.items())
+        except OSError:
+            return False
 
-    def _checkSubDirectories(self, path):
-        if os.path.isfile(path) and path.endswith('.dtd'):
-            self.bmecatVersions[os.path.basename(path)] = os.path.abspath(path)
-        if os.path.isdir(path):
-            for subelement in os.listdir(path):
-                self._checkSubDirectories(os.path.join(path, subelement))
+    def _checkSubDirectories(self, path, bmecatVersions, directoryTimes):
+        try:
+            directoryTimes[path] = os.stat(path).st_mtime_ns
+            entries = list(os.scandir(path))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir():
+                self._checkSubDirectories(entry.path, bmecatVersions, directoryTimes)
+            elif entry.name.endswith('.dtd'):
+                bmecatVersions[entry.name] = os.path.abspath(entry.path)
 
     def resolveEntity(self, publicId, systemId):
         """Resolve the system identifier of an entity and return either
@@ -35,6 +72,36 @@ class DTDResolver(EntityResolver):
         to read from."""
         logging.debug("ResolverEntity: PID: '{0}' /SID: '{1}'".format(publicId, systemId))
         if systemId in self.bmecatVersions.keys():
-            return self.bmecatVersions[systemId]
-        else:
+            return self._createInputSource(self.bmecatVersions[systemId])
+        if _isNextToDocument(systemId):
             return systemId
+        logging.warning("Externe Entitaet '{0}' ist keine bekannte DTD und wird nicht geladen.".format(systemId))
+        return self._createEmptyInputSource(systemId)
+
+    def _createInputSource(self, path):
+        inputSource = InputSource(path)
+        inputSource.setByteStream(io.BytesIO(self._readDTD(path)))
+        return inputSource
+
+    def _createEmptyInputSource(self, systemId):
+        inputSource = InputSource(systemId)
+        inputSource.setByteStream(io.BytesIO(b""))
+        return inputSource
+
+    def _readDTD(self, path):
+        mtime = os.stat(path).st_mtime_ns
+        content = self._dtdContents.get(path)
+        if content is None or content[0] != mtime:
+            with open(path, "rb") as dtdFile:
+                content = (mtime, dtdFile.read())
+            self._dtdContents[path] = content
+        return content[1]
+
+
+def _isNextToDocument(systemId):
+    '''
+    relativer Pfad ohne Schema, der nicht aus dem Verzeichnis des Dokuments bzw. der einbindenden DTD herausfuehrt
+    '''
+    if urllib.parse.urlparse(systemId).scheme != "" or os.path.isabs(systemId):
+        return False
+    return not os.path.normpath(systemId).startswith(os.pardir)
@@ -3,4 +3,5 @@ from test.datamodel import *
 from test.handler import *
 from test.integration import *
 from test.mapping import *
+from test.resolver import *
 from test.transformer import *
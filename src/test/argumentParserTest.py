@@ -102,6 +102,140 @@ class ArgumentParserTest(unittest.TestCase):
         self.assertEqual(argumentParser.manufacturer, "Test", "Manufacturer nicht richtig gesetzt.")
         self.assertEqual(argumentParser.validation, "strict", "Validationmodus nicht richtig gesetzt.")
 
+    def testParseArgumentsWithImportEngine(self):
+        argumentParser = ArgumentParser()
+        argv = ['-i', 'test.xml', '-o', 'test.xlsx']
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['importEngine'], "sax", "Importengine nicht richtig gesetzt.")
+
+        argv.append('--engine=lxml')
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['importEngine'], "lxml", "Importengine nicht richtig gesetzt.")
+
+    def testParseArgumentsWithProcesses(self):
+        argumentParser = ArgumentParser()
+        argv = ['-i', 'test.xml', '-o', 'test.xlsx']
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['processes'], 1, "Anzahl Prozesse nicht richtig gesetzt.")
+
+        argv.append('--processes=4')
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['processes'], 4, "Anzahl Prozesse nicht richtig gesetzt.")
+
+        self.assertRaises(MissingArgumentException, argumentParser.parse, argv + ['--processes=0'])
+        self.assertRaises(MissingArgumentException, argumentParser.parse, argv + ['--processes=viele'])
+
+    def testParseArgumentsWithDtdMode(self):
+        argumentParser = ArgumentParser()
+        argv = ['-i', 'test.xml', '-o', 'test.xlsx']
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['dtdMode'], "load", "DTD-Modus nicht richtig gesetzt.")
+
+        argv.append('--dtd=skip')
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['dtdMode'], "skip", "DTD-Modus nicht richtig gesetzt.")
+
+    def testParseArgumentsWithValidators(self):
+        argumentParser = ArgumentParser()
+        argv = ['-i', 'test.xml', '-o', 'test.xlsx']
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['validators'], 0, "Anzahl Validierungsprozesse nicht richtig gesetzt.")
+
+        argv.append('--validators=2')
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['validators'], 2, "Anzahl Validierungsprozesse nicht richtig gesetzt.")
+
+        self.assertRaises(MissingArgumentException, argumentParser.parse, argv + ['--validators=-1'])
+        self.assertRaises(MissingArgumentException, argumentParser.parse, argv + ['--validators=alle'])
+
+    def testParseArgumentsWithProgressAndReadSize(self):
+        argumentParser = ArgumentParser()
+        argv = ['-i', 'test.xml', '-o', 'test.xlsx']
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['progressInterval'], 10, "Intervall der Fortschrittsmeldungen nicht richtig gesetzt.")
+        self.assertEqual(argumentParser.getConfig()['readSize'], 1024 * 1024, "Blockgroesse nicht richtig gesetzt.")
+
+        argv += ['--progress=0.5', '--readsize=65536']
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['progressInterval'], 0.5, "Intervall der Fortschrittsmeldungen nicht richtig gesetzt.")
+        self.assertEqual(argumentParser.getConfig()['readSize'], 65536, "Blockgroesse nicht richtig gesetzt.")
+
+        self.assertRaises(MissingArgumentException, argumentParser.parse, argv + ['--progress=-1'])
+        self.assertRaises(MissingArgumentException, argumentParser.parse, argv + ['--readsize=0'])
+        self.assertRaises(MissingArgumentException, argumentParser.parse, argv + ['--readsize=1MB'])
+
+    def testParseArgumentsWithExcelReader(self):
+        argumentParser = ArgumentParser()
+        argv = ['-i', 'test.xlsx', '-o', 'test.xml']
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['excelReader'], 'openpyxl', "Excel-Reader nicht richtig gesetzt.")
+
+        argv.append('--excelreader=spreadsheetml')
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['excelReader'], 'spreadsheetml', "Excel-Reader nicht richtig gesetzt.")
+
+    def testParseArgumentsWithEncodingAndDelimiter(self):
+        argumentParser = ArgumentParser()
+        argv = ['-i', 'test.csv', '-o', 'test.xml']
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['encoding'], 'utf-8-sig', "Zeichenkodierung nicht richtig gesetzt.")
+        self.assertIsNone(argumentParser.getConfig()['delimiter'], "Trennzeichen nicht richtig gesetzt.")
+
+        argumentParser.parse(argv + ['--encoding=latin-1', '--delimiter=;'])
+        self.assertEqual(argumentParser.getConfig()['encoding'], 'latin-1', "Zeichenkodierung nicht richtig gesetzt.")
+        self.assertEqual(argumentParser.getConfig()['delimiter'], ';', "Trennzeichen nicht richtig gesetzt.")
+
+        argumentParser.parse(argv + ['--delimiter=tab'])
+        self.assertEqual(argumentParser.getConfig()['delimiter'], '\t', "Trennzeichen nicht richtig gesetzt.")
+
+        self.assertRaises(MissingArgumentException, argumentParser.parse, argv + ['--encoding=keine'])
+        self.assertRaises(MissingArgumentException, argumentParser.parse, argv + ['--delimiter=;;'])
+
+    def testParseArgumentsWithPreflight(self):
+        argumentParser = ArgumentParser()
+        argv = ['-i', 'test.xlsx', '-o', 'test.xml']
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['preflight'], 'none', "Vorpruefung nicht richtig gesetzt.")
+
+        argumentParser.parse(argv + ['--preflight=only'])
+        self.assertEqual(argumentParser.getConfig()['preflight'], 'only', "Vorpruefung nicht richtig gesetzt.")
+
+    def testParseArgumentsWithExcelExport(self):
+        argumentParser = ArgumentParser()
+        argv = ['-i', 'test.xml', '-o', 'test.xlsx']
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['excelExport'], 'memory', "Excel-Export nicht richtig gesetzt.")
+
+        argumentParser.parse(argv + ['--excelexport=streaming'])
+        self.assertEqual(argumentParser.getConfig()['excelExport'], 'streaming', "Excel-Export nicht richtig gesetzt.")
+
+    def testParseArgumentsWithWorkbookMode(self):
+        argumentParser = ArgumentParser()
+        argv = ['-i', 'test.xml', '-o', 'test.xlsx']
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['workbookMode'], 'cells', "Mappe nicht richtig gesetzt.")
+
+        argumentParser.parse(argv + ['--workbook=writeonly'])
+        self.assertEqual(argumentParser.getConfig()['workbookMode'], 'writeonly', "Mappe nicht richtig gesetzt.")
+
+    def testParseArgumentsWithDryRun(self):
+        argumentParser = ArgumentParser()
+        argv = ['-i', 'test.xlsx', '-o', 'test.xml']
+        argumentParser.parse(argv)
+        self.assertFalse(argumentParser.getConfig()['dryRun'], "Trockenlauf nicht richtig gesetzt.")
+
+        argumentParser.parse(argv + ['--dry-run'])
+        self.assertTrue(argumentParser.getConfig()['dryRun'], "Trockenlauf nicht richtig gesetzt.")
+
+    def testParseArgumentsWithXmlStyle(self):
+        argumentParser = ArgumentParser()
+        argv = ['-i', 'test.xlsx', '-o', 'test.xml']
+        argumentParser.parse(argv)
+        self.assertEqual(argumentParser.getConfig()['xmlStyle'], 'pretty', "XML-Stil nicht richtig gesetzt.")
+
+        argumentParser.parse(argv + ['--xmlstyle=canonical'])
+        self.assertEqual(argumentParser.getConfig()['xmlStyle'], 'canonical', "XML-Stil nicht richtig gesetzt.")
+
     def testParseArgumentsWithValidationmode(self):
         argumentParser = ArgumentParser()
         argv = ['-i', 'test.xml', '-o', 'test.xlsx', '--dateformat="%Y-%m-%d"', '--separators="english"']
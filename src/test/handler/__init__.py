@@ -1,2 +1,3 @@
 from test.handler.excel import *
 from test.handler.xml import *
+from test.handler.dryRunExporterTest import DryRunExporterTest
@@ -0,0 +1,48 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+import os
+import tempfile
+import unittest
+
+from datamodel import Product
+from error import DataErrorException
+from exporter import BMEcatExporter
+from exporter import DryRunExporter
+from importer.excel import ExcelImporter
+from transformer import SeparatorTransformer
+
+
+class DryRunExporterTest(unittest.TestCase):
+
+    def testReportsSameNumberOfErrorsAsBMEcatExporter(self):
+        testDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test_data")
+        importer = ExcelImporter(SeparatorTransformer("detect"))
+        importer.readWorkbook(os.path.join(testDataPath, "testCreateBMEcatFromExcelFullDataNonStrictValidation.xlsx"))
+        articles = { 'new' : importer.articles + [ Product() ], 'update' : [ Product() ] }
+
+        for validation, expectedErrors in [ ("strict", 3), ("nonstrict", 2) ]:
+            with self.subTest(validation=validation):
+                with tempfile.TemporaryDirectory() as directory:
+                    exporter = BMEcatExporter(articles, os.path.join(directory, "export.xml"), validation)
+                    with self.assertLogs(level="WARNING"):
+                        self.assertRaisesRegex(DataErrorException, "Found {0} errors".format(expectedErrors), exporter.writeBMEcatAsXML)
+
+                dryRunExporter = DryRunExporter(validation)
+                dryRunExporter.addArticles(articles)
+                self.assertEqual(dryRunExporter.numberOfArticles, len(importer.articles) + 2)
+                with self.assertLogs(level="WARNING"):
+                    self.assertRaisesRegex(DataErrorException, "Found {0} errors".format(expectedErrors), dryRunExporter.finish)
+
+    def testValidArticlesFinishWithoutError(self):
+        testDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "..", "test_data")
+        importer = ExcelImporter(SeparatorTransformer("detect"))
+        importer.readWorkbook(os.path.join(testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx"))
+
+        dryRunExporter = DryRunExporter()
+        for article in importer.articles:
+            dryRunExporter.addArticle('new', article)
+        dryRunExporter.finish()
+        self.assertEqual(dryRunExporter.numberOfArticles, len(importer.articles))
@@ -1,2 +1,4 @@
 from test.handler.excel.excelTransformationTest import ExcelTransformationNonStrictValidationTest
 from test.handler.excel.excelTransformationsForStrictValidationTest import ExcelTransformationsForStrictValidationTest
+from test.handler.excel.excelImporterTest import ExcelImporterTest
+from test.handler.excel.pyxelExporterTest import PyxelExporterTest
@@ -0,0 +1,193 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+import csv
+import datetime
+import glob
+import logging
+import os
+import tempfile
+import unittest
+
+from openpyxl import Workbook
+from openpyxl import load_workbook
+
+from datamodel import ArticleLayout
+from error import FormulaFoundException
+from error import NumberFormatException
+from importer.excel import DelimitedTextReader
+from importer.excel import ExcelImporter
+from importer.excel import SpreadsheetMLReader
+from transformer import SeparatorTransformer
+
+
+class ExcelImporterTest(unittest.TestCase):
+
+    header = [ "supplierArticleId", "descriptionShort", "orderUnit", "contentUnit",
+               "mimeSource2", "mimeType2", "mimePurpose2", "mimeSource1", "mimeType1", "mimePurpose1",
+               "priceType1", "priceAmount1", "tax1", "currency1",
+               "attributeName1", "attributeValue1", "attributeName2", "attributeValue2" ]
+
+    def testColumnPlanCreatesProductsFromRows(self):
+        rows = [ [ "4711", "Artikel 1", "C62", "C62", "bild_2.jpg", "image/jpeg", "normal", "bild_1.jpg", "image/jpeg", "normal",
+                   "net_customer", "1,234.5", 0.19, "EUR", "Farbe", "rot", "Gewicht", 12 ],
+                 [ "4712", "Artikel 2", "C62", "C62", None, None, None, "bild_3.jpg", "image/jpeg", "normal",
+                   "net_customer", 3, 0.19, "EUR", "Farbe", "blau" ] ]
+        articles = self.__readWorkbook(rows)
+
+        self.assertEqual([ article.productId for article in articles ], [ "4711", "4712" ])
+        self.assertEqual([ (mime.order, mime.source) for mime in articles[0].mimeInfo ], [ (1, "bild_1.jpg"), (2, "bild_2.jpg") ])
+        self.assertEqual([ (mime.order, mime.source) for mime in articles[1].mimeInfo ], [ (1, "bild_3.jpg") ])
+        self.assertEqual(articles[0].priceDetails[0].prices[0].amount, 1234.5)
+        self.assertEqual([ (feature.name, feature.values) for feature in articles[0].featureSets[0].features ],
+                         [ ("Farbe", [ "rot" ]), ("Gewicht", [ 12 ]) ])
+        self.assertEqual([ (feature.name, feature.values) for feature in articles[1].featureSets[0].features ], [ ("Farbe", [ "blau" ]) ])
+
+    def testNumberFormatErrorsKeepRowAndColumn(self):
+        validRow = [ "4711", "Artikel 1", "C62", "C62", None, None, None, "bild_1.jpg", "image/jpeg", "normal", "net_customer", 1.5, 0.19, "EUR" ]
+        invalidRow = [ "4712", "Artikel 2", "C62", "C62", None, None, None, "bild_2.jpg", "image/jpeg", "normal", "net_customer", "1,2,3", 0.19, "EUR" ]
+        with self.assertRaisesRegex(NumberFormatException, r"^Zeile: 3/Spalte 12; 'amount1' Fehler: "):
+            self.__readWorkbook([ validRow, invalidRow ])
+
+    def testProcessPoolCreatesIdenticalProductsAndMessages(self):
+        rows = [ [ str(4711 + rowIndex), "Artikel", "C62", "C62", None, None, None, "bild.jpg", "image/jpeg", "normal",
+                   "net_customer", "1,234.5", 0.19, "EUR", "Farbe", "rot" if rowIndex % 2 else None ] for rowIndex in range(7) ]
+        invalidRows = rows[:5] + [ rows[5][:11] + [ "1,2,3" ] + rows[5][12:] ] + rows[6:]
+        with tempfile.TemporaryDirectory() as directory:
+            for testRows in [ rows, invalidRows ]:
+                filename = self.__createWorkbook(directory, testRows)
+                # mit chunkSize=1 sind mehr Teilstuecke zu vergeben als gleichzeitig unterwegs sein duerfen
+                for chunkSize in [ 2, 1 ]:
+                    with self.subTest(invalidRows=testRows is invalidRows, chunkSize=chunkSize):
+                        self.assertEqual(self.__importWithMessages(filename, ExcelImporter(SeparatorTransformer("detect"))),
+                                         self.__importWithMessages(filename, ExcelImporter(SeparatorTransformer("detect"), processes=2,
+                                                                                           chunkSize=chunkSize)))
+
+    def testProcessPoolCreatesIdenticalProductsForAllTestData(self):
+        testDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "test_data")
+        for filename in sorted(glob.glob(os.path.join(testDataPath, "*.xlsx"))):
+            with self.subTest(filename=os.path.basename(filename)):
+                self.assertEqual(self.__importWithMessages(filename, ExcelImporter(SeparatorTransformer("detect"))),
+                                 self.__importWithMessages(filename, ExcelImporter(SeparatorTransformer("detect"), processes=2, chunkSize=1)))
+
+    def testLayoutIsCollectedWhileArticlesAreCreated(self):
+        testDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "test_data")
+        filename = os.path.join(testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx")
+        for processes in [ 1, 2 ]:
+            with self.subTest(processes=processes):
+                importer = ExcelImporter(SeparatorTransformer("detect"), processes=processes, chunkSize=1)
+                importer.readWorkbook(filename)
+                self.assertTrue(importer.layout.maxNumberOfPrices > 0)
+                self.assertEqual(vars(importer.layout), vars(ArticleLayout.fromArticles({ 'new' : importer.articles })))
+
+    def testSpreadsheetMLReaderCreatesIdenticalProductsForAllTestData(self):
+        testDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "test_data")
+        for filename in sorted(glob.glob(os.path.join(testDataPath, "*.xlsx"))):
+            with self.subTest(filename=os.path.basename(filename)):
+                self.assertEqual(self.__importWithMessages(filename, ExcelImporter(SeparatorTransformer("detect"))),
+                                 self.__importWithMessages(filename, ExcelImporter(SeparatorTransformer("detect"), reader="spreadsheetml")))
+
+    def testSpreadsheetMLReaderFillsRowsLikeOpenpyxl(self):
+        rows = [ [ "4711", None, "C62" ], [], [ None, "Text", None, None, 2.5 ], [ "=A2&\"x\"", True, datetime.datetime(2026, 10, 18, 12, 30) ] ]
+        with tempfile.TemporaryDirectory() as directory:
+            filename = self.__createWorkbook(directory, rows)
+            workbook = load_workbook(filename, read_only=True)
+            reader = SpreadsheetMLReader(filename)
+            try:
+                self.assertEqual(reader.sheetnames, workbook.sheetnames)
+                for minRow, maxRow in [ (None, None), (1, 1), (2, None), (3, 4) ]:
+                    with self.subTest(minRow=minRow, maxRow=maxRow):
+                        self.assertEqual(list(reader["Mapping-Master"].iter_rows(min_row=minRow, max_row=maxRow, values_only=True)),
+                                         list(workbook["Mapping-Master"].iter_rows(min_row=minRow, max_row=maxRow, values_only=True)))
+                with self.assertRaisesRegex(ValueError, "values_only=True"):
+                    reader["Mapping-Master"].iter_rows(values_only=False)
+            finally:
+                reader.close()
+                workbook.close()
+
+    def testDelimitedTextCreatesSameProductsAsWorkbook(self):
+        rows = [ [ "4711", "Artikel 1", "C62", "C62", "bild_2.jpg", "image/jpeg", "normal", "bild_1.jpg", "image/jpeg", "normal",
+                   "net_customer", "1.234,5", "0,19", "EUR", "Farbe", "rot", "Gewicht", "12" ],
+                 [ "4712", "Artikel 2 mit Ä", "C62", "C62", None, None, None, "bild_3.jpg", "image/jpeg", "normal",
+                   "net_customer", "3", "0,19", "EUR", "Farbe", "blau; hell" ] ]
+        underscoreHeader = [ "supplierArticleId", "descriptionShort", "orderUnit", "contentUnit",
+                             "mime_source_2", "mime_type_2", "mime_purpose_2", "mime_source_1", "mime_type_1", "mime_purpose_1",
+                             "price_type_1", "price_amount_1", "tax_1", "currency_1",
+                             "attribute_name_1", "attribute_value_1", "attribute_name_2", "attribute_value_2" ]
+        with tempfile.TemporaryDirectory() as directory:
+            expected = self.__importWithMessages(self.__createWorkbook(directory, rows), ExcelImporter(SeparatorTransformer("german")))
+            for header, extension, encoding, delimiter in [ (self.header, ".csv", "utf-8-sig", None),
+                                                            (underscoreHeader, ".tsv", "utf-8-sig", None),
+                                                            (self.header, ".csv", "latin-1", ";") ]:
+                with self.subTest(extension=extension, encoding=encoding, delimiter=delimiter):
+                    filename = os.path.join(directory, "mappingMaster" + extension)
+                    with open(filename, "w", newline="", encoding=encoding) as file:
+                        writer = csv.writer(file, delimiter=delimiter or ("\t" if extension == ".tsv" else ","))
+                        writer.writerow(header)
+                        for row in rows:
+                            writer.writerow([ "" if value is None else value for value in row ])
+                    importer = ExcelImporter(SeparatorTransformer("german"))
+                    self.assertEqual(self.__importWithMessages(filename, importer, lambda: importer.readDelimitedText(filename, encoding, delimiter)),
+                                     expected)
+                    with self.assertRaisesRegex(ValueError, "values_only=True"):
+                        DelimitedTextReader(filename, encoding, delimiter).iter_rows(values_only=False)
+
+    def testPreflightReportsAllFormulasAndSeparatorErrorsWithCoordinates(self):
+        rows = [ [ "4711", "Artikel 1", "C62", "C62", None, None, None, "=A2&\".jpg\"", "image/jpeg", "normal", "net_customer", "1,2,3", 0.19, "EUR" ],
+                 [ "4712", "Artikel 2", "C62", "C62", None, None, None, "bild.jpg", "image/jpeg", "normal", "net_customer", 1.5, 0.19, "EUR" ],
+                 [ "4713", "=B3", "C62", "C62", None, None, None, "bild.jpg", "image/jpeg", "normal", "net_customer", "10.5", "0.1.9", "EUR" ] ]
+        with tempfile.TemporaryDirectory() as directory:
+            filename = self.__createWorkbook(directory, rows)
+            for reader in [ "openpyxl", "spreadsheetml" ]:
+                with self.subTest(reader=reader):
+                    importer = ExcelImporter(SeparatorTransformer("english"), reader=reader)
+                    findings = importer.checkWorkbook(filename)
+                    self.assertEqual([ (finding.coordinate, finding.fieldname) for finding in findings ],
+                                     [ ("H2", "source1"), ("L2", "amount1"), ("B4", "title"), ("M4", "tax1") ])
+                    self.assertEqual(str(findings[1]), "L2 (Zeile: 2/Spalte 12; 'amount1'): Thousandseparator ',' found in wrong position "
+                                                       "for value '1,2,3'. Wert: '1,2,3'")
+                    self.assertEqual(importer.articles, [])
+                    with self.assertRaisesRegex(FormulaFoundException, r"^4711: Im Objekt vom Typ 'Mime' wurde im Feld source"):
+                        importer.readWorkbook(filename)
+
+    def __importWithMessages(self, filename, importer, read=None):
+        with self.assertLogs(level=logging.WARNING) as logs:
+            # assertLogs schlaegt fehl, wenn nichts geloggt wird
+            logging.warning("Import")
+            try:
+                if read is None:
+                    importer.readWorkbook(filename)
+                else:
+                    read()
+                error = None
+            except Exception as e:
+                error = "{0}: {1}".format(e.__class__.__name__, str(e))
+        return self.__describe(importer.articles), error, logs.output
+
+    def __describe(self, value):
+        if isinstance(value, (list, tuple)):
+            return [self.__describe(entry) for entry in value]
+        if hasattr(value, "__dict__"):
+            return (value.__class__.__name__, self.__describe(vars(value)))
+        if isinstance(value, dict):
+            return { key : self.__describe(entry) for key, entry in value.items() }
+        return value
+
+    def __createWorkbook(self, directory, rows):
+        filename = os.path.join(directory, "mappingMaster.xlsx")
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = "Mapping-Master"
+        sheet.append(self.header)
+        for row in rows:
+            sheet.append(row)
+        workbook.save(filename)
+        return filename
+
+    def __readWorkbook(self, rows):
+        with tempfile.TemporaryDirectory() as directory:
+            importer = ExcelImporter(SeparatorTransformer("english"))
+            importer.readWorkbook(self.__createWorkbook(directory, rows))
+        return importer.articles
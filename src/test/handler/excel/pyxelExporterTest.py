@@ -0,0 +1,105 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+import copy
+import os
+import tempfile
+import unittest
+
+from openpyxl import load_workbook
+
+from datamodel import ArticleLayout
+from exporter.excel import PyxelExporter
+from importer.excel import ExcelImporter
+from transformer import SeparatorTransformer
+
+
+class PyxelExporterTest(unittest.TestCase):
+
+    def testExportWorksOnTheArticlesWithoutChangingThem(self):
+        articles = self.__readTestArticles()
+        expectedArticles = copy.deepcopy(articles)
+
+        with tempfile.TemporaryDirectory() as directory:
+            exporter = PyxelExporter(articles, os.path.join(directory, "export.xlsx"))
+            exporter.createNewWorkbook()
+
+        self.assertIs(exporter._articles, articles)
+        self.assertEqual(len(articles['new']), len(expectedArticles['new']))
+        for article, expectedArticle in zip(articles['new'], expectedArticles['new']):
+            self.assertEqual(article, expectedArticle)
+
+    def testWriteOnlyWorkbookHasSameSheetsAndValues(self):
+        articles = self.__readTestArticles()
+        with tempfile.TemporaryDirectory() as directory:
+            contents = []
+            for writeOnly in [ True, False ]:
+                filename = os.path.join(directory, "export{0}.xlsx".format(writeOnly))
+                PyxelExporter(articles, filename, writeOnly=writeOnly).createNewWorkbook()
+                contents.append(self.__readValues(filename))
+
+        self.assertEqual(contents[0][0], [ "Artikel", "Artikelbeziehungen", "Artikelsuchbegriffe", "Sheet" ])
+        self.assertEqual(contents[0], contents[1])
+
+    def testLayoutFromImportGivesSameWorkbookAsCountingPass(self):
+        testDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "test_data")
+        importer = ExcelImporter(SeparatorTransformer("detect"))
+        importer.readWorkbook(os.path.join(testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx"))
+        articles = { 'new' : importer.articles }
+        with tempfile.TemporaryDirectory() as directory:
+            contents = []
+            for layout in [ importer.layout, None ]:
+                filename = os.path.join(directory, "export{0}.xlsx".format(layout is None))
+                PyxelExporter(articles, filename, layout=layout).createNewWorkbook()
+                contents.append(self.__readValues(filename))
+
+        self.assertEqual(contents[0], contents[1])
+
+    def testArticlesAddedOneByOneGiveSameWorkbook(self):
+        articles = self.__readTestArticles()
+        layout = ArticleLayout.fromArticles(articles)
+        # ein zusaetzliches Bild verbreitert nur die Kopfzeile
+        layout.add(0, layout.maxNumberOfMimes + 1, 0, 0, 0)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "export.xlsx")
+            PyxelExporter(articles, filename).createNewWorkbook()
+            expected = self.__readValues(filename)
+
+            exporter = PyxelExporter({}, filename, layout=layout)
+            exporter.startWorkbook()
+            for article in articles['new']:
+                exporter.addArticle('new', article)
+            exporter.finishWorkbook()
+            sheetnames, values = self.__readValues(filename)
+
+            exporter = PyxelExporter({}, os.path.join(directory, "discarded.xlsx"), layout=layout)
+            exporter.startWorkbook()
+            exporter.addArticle('new', articles['new'][0])
+            exporter.discardWorkbook()
+            self.assertFalse(os.path.exists(os.path.join(directory, "discarded.xlsx")))
+
+        self.assertEqual(sheetnames, expected[0])
+        self.assertEqual(len(values['Artikel'][0]), len(expected[1]['Artikel'][0]) + 5)
+        for name in sheetnames:
+            # die Spalten des zusaetzlichen Bildes bleiben leer
+            self.assertEqual(self.__rowsByColumnName(values[name]), self.__rowsByColumnName(expected[1][name]))
+
+    def __rowsByColumnName(self, rows):
+        if len(rows) == 0:
+            return rows
+        return [ { columnName : value for columnName, value in zip(rows[0], row) if value is not None } for row in rows[1:] ]
+
+    def __readTestArticles(self):
+        testDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "test_data")
+        importer = ExcelImporter(SeparatorTransformer("detect"))
+        importer.readWorkbook(os.path.join(testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx"))
+        return { 'new' : importer.articles }
+
+    def __readValues(self, filename):
+        workbook = load_workbook(filename, read_only=True)
+        try:
+            return workbook.sheetnames, { name : list(workbook[name].iter_rows(values_only=True)) for name in workbook.sheetnames }
+        finally:
+            workbook.close()
@@ -1,3 +1,5 @@
 from test.handler.xml.xmlImportTest import XMLImportTest
 from test.handler.xml.xmlTransformationTest import XmlTransformationNonStrictValidationTest
 from test.handler.xml.xmlTransformationsForStrictValidationTest import XmlTransformationForStrictValidationTest
+from test.handler.xml.xmlImportEngineTest import XMLImportEngineTest
+from test.handler.xml.bmecatExporterTest import BMEcatExporterTest
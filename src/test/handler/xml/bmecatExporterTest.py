@@ -0,0 +1,128 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+from datetime import datetime
+import gzip
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from lxml import etree
+
+import compressedFile
+from datamodel import Product
+from error import ConversionModeException
+from error import DataErrorException
+from exporter.xml import BMEcatExporter
+from exporter.xml import bmecatExporter
+from importer.excel import ExcelImporter
+from transformer import SeparatorTransformer
+
+
+class _FixedDatetime(datetime):
+    '''
+    Zeitpunkt fuer den HEADER, damit zwei Exporte byteweise verglichen werden koennen
+    '''
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 10, 18, 10, 14, 50)
+
+
+class BMEcatExporterTest(unittest.TestCase):
+
+    def testStreamedOutputEqualsPrettyPrintedTree(self):
+        articles = self.__readTestArticles()
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "export.xml")
+            BMEcatExporter({ 'new' : articles }, filename).writeBMEcatAsXML()
+            with open(filename, "rb") as file:
+                content = file.read()
+
+        # so hat der Exporter die Datei geschrieben, bevor er sie gestreamt hat
+        tree = etree.fromstring(content, etree.XMLParser(remove_blank_text=True))
+        self.assertEqual(content, etree.tostring(tree, encoding="UTF-8", pretty_print=True, xml_declaration=True))
+        namespaces = { "bmecat" : "http://www.bmecat.org/bmecat/1.2/bmecat_new_catalog" }
+        self.assertEqual(len(tree.findall("bmecat:T_NEW_CATALOG/bmecat:ARTICLE", namespaces)), len(articles))
+        self.assertEqual(len(tree.findall("bmecat:T_NEW_CATALOG/bmecat:ARTICLE_TO_CATALOGGROUP_MAP", namespaces)), len(articles))
+
+    def testParallelOutputEqualsSequentialOutput(self):
+        articles = { 'new' : self.__readTestArticles() }
+        articles['update'] = articles['new'][:3]
+        with tempfile.TemporaryDirectory() as directory:
+            contents = []
+            for processes in [ 1, 2 ]:
+                filename = os.path.join(directory, "export{0}.xml".format(processes))
+                with self.__fixedGenerationDate():
+                    BMEcatExporter(articles, filename, processes=processes, chunkSize=2).writeBMEcatAsXML()
+                with open(filename, "rb") as file:
+                    contents.append(file.read())
+
+        self.assertEqual(contents[0], contents[1])
+
+    def testCompactAndCanonicalOutputHaveSameElements(self):
+        articles = { 'new' : self.__readTestArticles() }
+        articles['new'][0].productId = "A&B <C>"
+        with tempfile.TemporaryDirectory() as directory:
+            contents = {}
+            for outputStyle in [ "pretty", "compact", "canonical" ]:
+                for processes in [ 1, 2 ]:
+                    filename = os.path.join(directory, "export{0}{1}.xml".format(outputStyle, processes))
+                    with self.__fixedGenerationDate():
+                        BMEcatExporter(articles, filename, "nonstrict", processes, 2, outputStyle).writeBMEcatAsXML()
+                    with open(filename, "rb") as file:
+                        contents[outputStyle, processes] = file.read()
+
+        tree = etree.fromstring(contents["pretty", 1], etree.XMLParser(remove_blank_text=True))
+        compact = etree.tostring(tree, encoding="UTF-8", xml_declaration=True)
+        canonical = etree.canonicalize(etree.tostring(tree, encoding="unicode")).encode("UTF-8")
+        for processes in [ 1, 2 ]:
+            self.assertEqual(contents["compact", processes], compact)
+            self.assertEqual(contents["canonical", processes], canonical)
+        self.assertIn(b"<ART_ID>A&amp;B &lt;C&gt;</ART_ID>", compact)
+        self.assertTrue(canonical.startswith(b'<BMECAT xmlns="http://www.bmecat.org/bmecat/1.2/bmecat_new_catalog" version="1.2" xml:lang="de"><HEADER>'))
+
+    def testCompressedOutputHasSameContent(self):
+        articles = { 'new' : self.__readTestArticles() }
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "export.xml")
+            with self.__fixedGenerationDate():
+                BMEcatExporter(articles, filename).writeBMEcatAsXML()
+                BMEcatExporter(articles, filename + ".gz", processes=2, chunkSize=2).writeBMEcatAsXML()
+            with open(filename, "rb") as file, gzip.open(filename + ".gz", "rb") as compressedFile:
+                self.assertEqual(file.read(), compressedFile.read())
+
+    def testZstandardIsNeededForZstOutput(self):
+        articles = { 'new' : self.__readTestArticles() }
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "export.xml.zst")
+            exporter = BMEcatExporter(articles, filename)
+            if compressedFile.zstandard is None:
+                self.assertRaisesRegex(ConversionModeException, "zstandard", exporter.writeBMEcatAsXML)
+                return
+            exporter.writeBMEcatAsXML()
+            with open(filename, "rb") as file:
+                content = compressedFile.zstandard.ZstdDecompressor().stream_reader(file).read()
+        self.assertTrue(content.startswith(b"<?xml version='1.0' encoding='UTF-8'?>"))
+
+    def testAllArticleErrorsAreReported(self):
+        for processes in [ 1, 2 ]:
+            with self.subTest(processes=processes):
+                articles = { 'new' : [ Product(), self.__readTestArticles()[0], Product() ] }
+                with tempfile.TemporaryDirectory() as directory:
+                    exporter = BMEcatExporter(articles, os.path.join(directory, "export.xml"), processes=processes, chunkSize=1)
+                    with self.assertLogs(level="ERROR") as logs:
+                        self.assertRaisesRegex(DataErrorException, "Found 2 errors", exporter.writeBMEcatAsXML)
+                self.assertEqual(logs.output.count("ERROR:root:Der Artikel hat keine Artikelnummer."), 4)
+
+    def __fixedGenerationDate(self):
+        return mock.patch.object(bmecatExporter, "datetime", _FixedDatetime)
+
+    def __readTestArticles(self):
+        testDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "test_data")
+        importer = ExcelImporter(SeparatorTransformer("detect"))
+        importer.readWorkbook(os.path.join(testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx"))
+        return importer.articles
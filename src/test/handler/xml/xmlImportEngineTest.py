@@ -0,0 +1,348 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+from collections import Counter
+import glob
+import gzip
+import logging
+import os
+import tempfile
+import unittest
+from urllib.request import pathname2url
+
+from datamodel import ArticleLayout
+from error import DTDEntityException
+from importer.xml import ArticleValidationPipeline
+from importer.xml import BMEcatImportHandler
+from importer.xml import BMEcatInputStream
+from importer.xml import BMEcatIterparseImporter
+from importer.xml import BMEcatLayoutScanner
+from importer.xml import BMEcatParallelImporter
+from importer.xml import BMEcatSaxImporter
+from importer.xml import ImportProgress
+from transformer import SeparatorTransformer
+
+
+class XMLImportEngineTest(unittest.TestCase):
+
+    testDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "test_data")
+
+    def testEnginesCreateIdenticalArticlesForAllTestData(self):
+        filenames = sorted(glob.glob(os.path.join(self.testDataPath, "*.xml")))
+        self.assertTrue(len(filenames) > 0, "Keine Testdaten gefunden.")
+        for filename in filenames:
+            with self.subTest(filename=os.path.basename(filename)):
+                self.assertEqual(self.__importWithSax(filename), self.__importWithIterparse(filename))
+
+    def testSkipDTDCreatesSameArticlesWithoutLoadingTheDTD(self):
+        filenameDTDMissing = os.path.join(self.testDataPath, "testCreateExcelFullDataWithCategoryTreeAndDTDNotExistent.xml")
+        filenameDTDExists = os.path.join(self.testDataPath, "testCreateExcelFullDataWithCategoryTreeAndDTD.xml")
+        self.assertEqual(self.__importWithSax(filenameDTDMissing), "FileNotFoundError")
+        for importerClass in [BMEcatSaxImporter, BMEcatIterparseImporter]:
+            with self.subTest(importer=importerClass.__name__):
+                importHandler = BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect"))
+                articles = self.__runImport(importHandler, lambda: importerClass(importHandler, loadDTD=False).parse(filenameDTDMissing))
+                self.assertEqual(self.__importWithSax(filenameDTDExists), articles)
+
+    def testEntitiesFromDTDAreReported(self):
+        bmecat = """<?xml version="1.0" encoding="UTF-8"?>
+            <!DOCTYPE BMECAT SYSTEM "bmecat_new_catalog_1_2.dtd">
+            <BMECAT version="1.2"><HEADER/><T_NEW_CATALOG><ARTICLE mode="new"><SUPPLIER_AID>1</SUPPLIER_AID>
+            <ARTICLE_DETAILS><DESCRIPTION_SHORT>Gr&ouml;&szlig;e</DESCRIPTION_SHORT></ARTICLE_DETAILS>
+            </ARTICLE></T_NEW_CATALOG></BMECAT>"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "entities.xml")
+            with open(filename, "w", encoding="UTF-8") as file:
+                file.write(bmecat.lstrip())
+            for importerClass in [BMEcatSaxImporter, BMEcatIterparseImporter]:
+                for loadDTD in [True, False]:
+                    with self.subTest(importer=importerClass.__name__, loadDTD=loadDTD):
+                        importer = importerClass(BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect")), loadDTD)
+                        with self.assertRaisesRegex(DTDEntityException, "&ouml;"):
+                            importer.parse(filename)
+
+    def testExternalGeneralEntitiesAreNotExpanded(self):
+        bmecat = """<?xml version="1.0" encoding="UTF-8"?>
+            <!DOCTYPE BMECAT SYSTEM "bmecat_new_catalog_1_2.dtd" [
+            <!ENTITY absolut SYSTEM "file://{0}">
+            <!ENTITY relativ SYSTEM "secret.txt">
+            ]>
+            <BMECAT version="1.2"><HEADER/><T_NEW_CATALOG><ARTICLE mode="new"><SUPPLIER_AID>1</SUPPLIER_AID>
+            <ARTICLE_DETAILS><DESCRIPTION_SHORT>a&absolut;b&relativ;c</DESCRIPTION_SHORT></ARTICLE_DETAILS>
+            <ARTICLE_ORDER_DETAILS><ORDER_UNIT>C62</ORDER_UNIT><CONTENT_UNIT>C62</CONTENT_UNIT><NO_CU_PER_OU>1</NO_CU_PER_OU></ARTICLE_ORDER_DETAILS>
+            </ARTICLE></T_NEW_CATALOG></BMECAT>"""
+        with tempfile.TemporaryDirectory() as directory:
+            secretFilename = os.path.join(directory, "secret.txt")
+            with open(secretFilename, "w", encoding="UTF-8") as file:
+                file.write("geheim")
+            filename = os.path.join(directory, "entities.xml")
+            with open(filename, "w", encoding="UTF-8") as file:
+                file.write(bmecat.format(pathname2url(secretFilename)).lstrip())
+            for importerClass in [BMEcatSaxImporter, BMEcatIterparseImporter]:
+                with self.subTest(importer=importerClass.__name__):
+                    importHandler = BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect"))
+                    importerClass(importHandler).parse(filename)
+                    self.assertEqual(importHandler.articles['new'][0].details.title, "abc")
+
+    def testParallelImportCreatesIdenticalArticlesForAllTestData(self):
+        filenames = sorted(glob.glob(os.path.join(self.testDataPath, "*.xml")))
+        for filename in filenames:
+            for engine in ["sax", "lxml"]:
+                with self.subTest(filename=os.path.basename(filename), engine=engine):
+                    self.assertEqual(self.__importWithSax(filename), self.__importInParallel(filename, engine))
+
+    def testParallelImportKeepsOrderAndDetectedSeparators(self):
+        # Die Trennzeichen werden am ersten Artikel erkannt und gelten auch fuer die Artikel der anderen Teilstuecke.
+        article = """<ARTICLE mode="{0}"><SUPPLIER_AID>{1}</SUPPLIER_AID>
+            <ARTICLE_DETAILS><DESCRIPTION_SHORT>Zeile 1
+                Zeile 2</DESCRIPTION_SHORT>{2}</ARTICLE_DETAILS>
+            <ARTICLE_ORDER_DETAILS><ORDER_UNIT>C62</ORDER_UNIT><CONTENT_UNIT>C62</CONTENT_UNIT><NO_CU_PER_OU>1</NO_CU_PER_OU></ARTICLE_ORDER_DETAILS>
+            <ARTICLE_PRICE_DETAILS>
+                <ARTICLE_PRICE price_type="net_customer"><PRICE_AMOUNT>{3}</PRICE_AMOUNT><PRICE_CURRENCY>EUR</PRICE_CURRENCY><TAX>0,19</TAX></ARTICLE_PRICE>
+            </ARTICLE_PRICE_DETAILS>
+            </ARTICLE>
+            """
+        articles = [ article.format("new", "1", "", "1,5"),
+                     article.format("update", "2", "<DESCRIPTION_LONG>Text</DESCRIPTION_LONG>", "2.000"),
+                     article.format("new", "3", "", "3") ]
+        bmecat = '<?xml version="1.0" encoding="UTF-8"?>\n<BMECAT version="1.2"><HEADER/><T_NEW_CATALOG>' + "".join(articles) + "</T_NEW_CATALOG></BMECAT>"
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "parallel.xml")
+            with open(filename, "w", encoding="UTF-8") as file:
+                file.write(bmecat)
+            parallelImporter = BMEcatParallelImporter(BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect")), 2, minimumChunkSize=1)
+            self.assertEqual(len(parallelImporter.scan(filename).chunks), 3)
+            for engine in ["sax", "lxml"]:
+                with self.subTest(engine=engine):
+                    receivedArticles = []
+                    importHandler = BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect"),
+                                                        articleSink=lambda mode, article: receivedArticles.append((mode, article)))
+                    BMEcatParallelImporter(importHandler, 2, engine, minimumChunkSize=1).parse(filename)
+
+                    self.assertEqual([ (mode, article.productId) for mode, article in receivedArticles ], [ ("new", "1"), ("update", "2"), ("new", "3") ])
+                    self.assertEqual([ article.priceDetails[0].prices[0].amount for _, article in receivedArticles ], [ 1.5, 2000, 3 ])
+                    self.assertEqual([ article.details.description for _, article in receivedArticles ], [ None, "Text", None ])
+                    self.assertEqual(self.__importWithSax(filename), self.__importInParallel(filename, engine))
+
+    def testParallelImportWithMoreChunksThanPendingOnes(self):
+        # mit einem Prozess sind hoechstens zwei Teilstuecke unterwegs, die weiteren werden erst spaeter vergeben
+        article = """<ARTICLE mode="new"><SUPPLIER_AID>{0}</SUPPLIER_AID><ARTICLE_DETAILS><DESCRIPTION_SHORT>Artikel {0}</DESCRIPTION_SHORT>
+            </ARTICLE_DETAILS><ARTICLE_ORDER_DETAILS><ORDER_UNIT>C62</ORDER_UNIT><CONTENT_UNIT>C62</CONTENT_UNIT><NO_CU_PER_OU>1</NO_CU_PER_OU>
+            </ARTICLE_ORDER_DETAILS><ARTICLE_PRICE_DETAILS><ARTICLE_PRICE price_type="net_customer"><PRICE_AMOUNT>{0},5</PRICE_AMOUNT>
+            <PRICE_CURRENCY>EUR</PRICE_CURRENCY><TAX>0,19</TAX></ARTICLE_PRICE></ARTICLE_PRICE_DETAILS></ARTICLE>
+            """
+        articles = "".join(article.format(articleId) for articleId in range(1, 13))
+        bmecat = '<?xml version="1.0" encoding="UTF-8"?>\n<BMECAT version="1.2"><HEADER/><T_NEW_CATALOG>' + articles + "</T_NEW_CATALOG></BMECAT>"
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "parallel.xml")
+            with open(filename, "w", encoding="UTF-8") as file:
+                file.write(bmecat)
+            for separators in ["detect", "german"]:
+                with self.subTest(separators=separators):
+                    parallelImporter = BMEcatParallelImporter(BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer(separators)), 1,
+                                                              minimumChunkSize=1)
+                    self.assertGreater(len(parallelImporter.scan(filename).chunks), 3)
+                    receivedArticles = []
+                    importHandler = BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer(separators),
+                                                        articleSink=lambda mode, article: receivedArticles.append(article))
+                    BMEcatParallelImporter(importHandler, 1, minimumChunkSize=1).parse(filename)
+
+                    self.assertEqual([ article.productId for article in receivedArticles ], [ str(articleId) for articleId in range(1, 13) ])
+                    self.assertEqual([ article.priceDetails[0].prices[0].amount for article in receivedArticles ],
+                                     [ articleId + 0.5 for articleId in range(1, 13) ])
+
+    def testParallelImportSplitsCatalogAtArticles(self):
+        filename = os.path.join(self.testDataPath, "testCreateExcelWithPriceValidity.xml")
+        catalog = BMEcatParallelImporter(BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect")), 2, minimumChunkSize=1).scan(filename)
+        with open(filename, "rb") as file:
+            data = file.read()
+
+        self.assertTrue(len(catalog.chunks) > 1, "Katalog wurde nicht zerlegt.")
+        self.assertTrue(catalog.prolog.endswith(b"<T_NEW_CATALOG>"), "Kopf endet nicht mit T_NEW_CATALOG.")
+        self.assertEqual(catalog.epilog, b"</T_NEW_CATALOG></BMECAT>")
+        for chunk in catalog.chunks[1:]:
+            self.assertRegex(data[chunk.start:chunk.end], rb"^<(ARTICLE|PRODUCT)[\s>]")
+        self.assertEqual(catalog.chunks[-1].end, data.rindex(b"</T_NEW_CATALOG"))
+
+    def testSmallReadSizeCreatesIdenticalArticles(self):
+        # die Datei wird in vielen Bloecken gelesen, ihre Zeilen sind kuerzer als ein Block
+        filename = os.path.join(self.testDataPath, "testCreateExcelWithPriceValidity.xml")
+        for importerClass in [BMEcatSaxImporter, BMEcatIterparseImporter]:
+            with self.subTest(importer=importerClass.__name__):
+                importHandler = BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect"))
+                articles = self.__runImport(importHandler, lambda: importerClass(importHandler, readSize=1024).parse(filename))
+                self.assertEqual(self.__importWithSax(filename), articles)
+
+    def testInputStreamReadsInBlocksAndReportsProgress(self):
+        clock = iter(range(100))
+        progress = ImportProgress(2, lambda: 10, clock=lambda: next(clock))
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "progress.xml")
+            with open(filename, "wb") as file:
+                file.write(b"x" * 30 + b"\n" + b"x" * 69)
+            with self.assertLogs(level=logging.INFO) as logs:
+                with BMEcatInputStream(filename, 40, progress) as stream:
+                    blocks = [ stream.read(1000), stream.read(1000), stream.read(1000), stream.read(1000) ]
+            emptyFilename = os.path.join(directory, "empty.xml")
+            open(emptyFilename, "wb").close()
+            with BMEcatInputStream(emptyFilename) as stream:
+                self.assertEqual(stream.read(), b"")
+
+        # der erste Block endet nach dem Zeilenumbruch
+        self.assertEqual([ len(block) for block in blocks ], [ 31, 40, 29, 0 ])
+        # Start bei 0, Meldungen fruehestens nach 2 Sekunden, Abschluss beim Schliessen
+        self.assertEqual(logs.output, [ "INFO:root:Eingelesen: 0.0 MB von 0.0 MB (71.0%), 5 Artikel/s, Restzeit ca. 00:00:00",
+                                        "INFO:root:Eingelesen: 0.0 MB von 0.0 MB (100.0%), 2 Artikel/s",
+                                        "INFO:root:Eingelesen: 0.0 MB von 0.0 MB (100.0%), 2 Artikel/s" ])
+
+    def testCompressedInputCreatesIdenticalArticlesForAllTestData(self):
+        filenames = sorted(glob.glob(os.path.join(self.testDataPath, "*.xml")))
+        with tempfile.TemporaryDirectory() as directory:
+            for filename in filenames:
+                compressedFilename = os.path.join(directory, os.path.basename(filename) + ".gz")
+                with open(filename, "rb") as file, gzip.open(compressedFilename, "wb") as compressedFile:
+                    compressedFile.write(file.read())
+                with self.subTest(filename=os.path.basename(filename)):
+                    expectedArticles = self.__importWithSax(filename)
+                    self.assertEqual(expectedArticles, self.__importWithSax(compressedFilename))
+                    self.assertEqual(expectedArticles, self.__importWithIterparse(compressedFilename))
+                    # komprimierte Dateien werden nicht zerlegt
+                    self.assertEqual(expectedArticles, self.__importInParallel(compressedFilename, "sax"))
+
+    def testCompressedInputStreamReadsSameBlocksAndReportsCompressedBytes(self):
+        content = b"x" * 30 + b"\n" + b"x" * 69
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "progress.xml.gz")
+            with gzip.open(filename, "wb") as file:
+                file.write(content)
+            progress = ImportProgress(1000, lambda: 0)
+            with BMEcatInputStream(filename, 40, progress) as stream:
+                blocks = [ stream.read(1000), stream.read(1000), stream.read(1000), stream.read(1000) ]
+                self.assertEqual(stream.size, os.path.getsize(filename))
+
+        self.assertEqual([ len(block) for block in blocks ], [ 31, 40, 29, 0 ])
+        self.assertEqual(b"".join(blocks), content)
+        self.assertEqual(progress.totalBytes, stream.size)
+
+    def testValidationPipelineCreatesIdenticalArticlesAndWarningsForAllTestData(self):
+        filenames = sorted(glob.glob(os.path.join(self.testDataPath, "*.xml")))
+        for filename in filenames:
+            with self.subTest(filename=os.path.basename(filename)):
+                articles, warnings = self.__importWithWarnings(lambda: self.__importWithSax(filename))
+                pipelineArticles, pipelineWarnings = self.__importWithWarnings(lambda: self.__importWithValidationPipeline(filename))
+                self.assertEqual(articles, pipelineArticles)
+                # die Warnungen der Validierung erscheinen erst, wenn der Artikel aus der Pipeline abgeholt wird
+                self.assertEqual(Counter(warnings), Counter(pipelineWarnings))
+
+    def testProcessPoolReportsWarningsInDocumentOrder(self):
+        filenames = sorted(glob.glob(os.path.join(self.testDataPath, "*.xml")))
+        for filename in filenames:
+            with self.subTest(filename=os.path.basename(filename)):
+                articles, warnings = self.__importWithWarnings(lambda: self.__importWithSax(filename))
+                parallelArticles, parallelWarnings = self.__importWithWarnings(lambda: self.__importInParallel(filename, "sax"))
+                self.assertEqual(articles, parallelArticles)
+                self.assertEqual(warnings, parallelWarnings)
+
+    def testLayoutIsCollectedWhileArticlesAreStored(self):
+        filenames = sorted(glob.glob(os.path.join(self.testDataPath, "*.xml")))
+        for filename in filenames:
+            for parallel in [ False, True ]:
+                with self.subTest(filename=os.path.basename(filename), parallel=parallel):
+                    importHandler = BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect"))
+                    if parallel:
+                        importer = BMEcatParallelImporter(importHandler, 2, "sax", minimumChunkSize=1)
+                    else:
+                        importer = BMEcatSaxImporter(importHandler)
+                    if isinstance(self.__runImport(importHandler, lambda: importer.parse(filename)), str):
+                        continue
+                    self.assertEqual(vars(importHandler.layout), vars(ArticleLayout.fromArticles(importHandler.articles)))
+
+    def testLayoutScannerCountsAtLeastTheStoredEntries(self):
+        filenames = sorted(glob.glob(os.path.join(self.testDataPath, "*.xml")))
+        for filename in filenames:
+            importHandler = BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect"))
+            if isinstance(self.__runImport(importHandler, lambda: BMEcatSaxImporter(importHandler).parse(filename)), str):
+                continue
+            for importerClass in [BMEcatSaxImporter, BMEcatIterparseImporter]:
+                with self.subTest(filename=os.path.basename(filename), importer=importerClass.__name__):
+                    scanner = BMEcatLayoutScanner()
+                    importerClass(scanner).parse(filename)
+                    self.assertEqual(scanner.articleCount, importHandler.articleCount)
+                    for name, count in vars(importHandler.layout).items():
+                        self.assertGreaterEqual(getattr(scanner.layout, name), count, name)
+
+    def testLayoutScannerCountsElementsPerArticle(self):
+        bmecat = """<?xml version="1.0" encoding="UTF-8"?>
+            <BMECAT version="2005"><HEADER/><T_NEW_CATALOG>
+            <PRODUCT mode="new"><SUPPLIER_PID>1</SUPPLIER_PID>
+            <PRODUCT_FEATURES><FEATURE><FNAME>Farbe</FNAME><VARIANTS><VARIANT/><VARIANT/><VARIANT/></VARIANTS></FEATURE>
+            <FEATURE><FNAME>Groesse</FNAME><VARIANTS><VARIANT/><VARIANT/></VARIANTS></FEATURE><FEATURE/></PRODUCT_FEATURES>
+            <PRODUCT_PRICE_DETAILS><PRODUCT_PRICE/><PRODUCT_PRICE/></PRODUCT_PRICE_DETAILS>
+            <PRODUCT_PRICE_DETAILS><PRODUCT_PRICE/></PRODUCT_PRICE_DETAILS>
+            <MIME_INFO><MIME/></MIME_INFO><SPECIAL_TREATMENT_CLASS type="GGVS">1</SPECIAL_TREATMENT_CLASS></PRODUCT>
+            <PRODUCT mode="new"><SUPPLIER_PID>2</SUPPLIER_PID><MIME_INFO><MIME/><MIME/></MIME_INFO></PRODUCT>
+            </T_NEW_CATALOG></BMECAT>"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "layout.xml")
+            with open(filename, "w", encoding="UTF-8") as file:
+                file.write(bmecat.lstrip())
+            scanner = BMEcatLayoutScanner()
+            BMEcatIterparseImporter(scanner, loadDTD=False).parse(filename)
+        self.assertEqual(vars(scanner.layout), { 'maxNumberOfPrices' : 3, 'maxNumberOfMimes' : 2, 'maxNumberOfAttributes' : 3,
+                                                 'maxNumberOfSpecialTreatmentClasses' : 1, 'numberOfArticles' : 7 })
+        self.assertEqual(scanner.articleCount, 2)
+
+    def __importWithWarnings(self, importMethod):
+        # assertLogs schlaegt fehl, wenn nichts geloggt wird
+        with self.assertLogs(level=logging.WARNING) as logs:
+            logging.warning("Import")
+            articles = importMethod()
+        return articles, logs.output
+
+    def __importWithValidationPipeline(self, filename):
+        validationPipeline = ArticleValidationPipeline(2, queueSize=2)
+        importHandler = BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect"), validationPipeline=validationPipeline)
+        return self.__runImport(importHandler, lambda: self.__parseWithValidationPipeline(importHandler, validationPipeline, filename))
+
+    def __parseWithValidationPipeline(self, importHandler, validationPipeline, filename):
+        with validationPipeline:
+            BMEcatSaxImporter(importHandler).parse(filename)
+
+    def __importWithSax(self, filename):
+        importHandler = BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect"))
+        return self.__runImport(importHandler, lambda: BMEcatSaxImporter(importHandler).parse(filename))
+
+    def __importWithIterparse(self, filename):
+        importHandler = BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect"))
+        return self.__runImport(importHandler, lambda: BMEcatIterparseImporter(importHandler).parse(filename))
+
+    def __importInParallel(self, filename, engine):
+        importHandler = BMEcatImportHandler("%Y-%m-%d", SeparatorTransformer("detect"))
+        parallelImporter = BMEcatParallelImporter(importHandler, 2, engine, minimumChunkSize=1)
+        return self.__runImport(importHandler, lambda: parallelImporter.parse(filename))
+
+    def __runImport(self, importHandler, parseMethod):
+        try:
+            parseMethod()
+        except OSError as e:
+            # fehlende Dateien melden die Engines mit unterschiedlichen Texten
+            return e.__class__.__name__
+        except Exception as e:
+            return "{0}: {1}".format(e.__class__.__name__, str(e))
+        return self.__describe(importHandler.articles)
+
+    def __describe(self, value):
+        '''
+        vollstaendige Beschreibung aller Attribute, da __eq__ der Datenobjekte nicht alle Felder vergleicht
+        '''
+        if isinstance(value, (list, tuple)):
+            return [self.__describe(entry) for entry in value]
+        if isinstance(value, dict):
+            return { key : self.__describe(entry) for key, entry in value.items() }
+        if hasattr(value, "__dict__"):
+            return (value.__class__.__name__, self.__describe(vars(value)))
+        return value
@@ -4,6 +4,7 @@ Created on 15.01.2018
 @author: henrik.pilz
 '''
 from xml.sax import make_parser
+from xml.sax import parseString
 import os
 import unittest
 
@@ -29,14 +30,53 @@ class XMLImportTest(unittest.TestCase):
         importedArticle = self.__runImporter(inputFilename)
         self.__checkArticles(article, importedArticle)
 
-    def __runImporter(self, filename):
+    def testImportWithArticleSink(self):
+        inputFilename = "testImportFromBMEcatFullDataPricenamesDifferent.xml"
+        article = self.__createFullArticle()
+        receivedArticles = []
+        importHandler = BMEcatImportHandler("%Y-%m-%d", articleSink=lambda mode, article: receivedArticles.append((mode, article)))
+        self.__parse(importHandler, inputFilename)
+
+        self.assertEqual(len(receivedArticles), 1, "Anzahl Artikel")
+        self.assertEqual(receivedArticles[0][0], "new", "Modus")
+        self.__checkArticles(article, receivedArticles[0][1])
+        for mode, articles in importHandler.articles.items():
+            self.assertEqual(len(articles), 0, "Artikel im Modus '{0}' gesammelt".format(mode))
+
+    def testCharacterChunksAreJoinedAtEndOfElement(self):
+        # Entitaeten und Zeilenumbrueche liefern die Texte in vielen kleinen Stuecken
+        bmecat = b"""<BMECAT><T_NEW_CATALOG><ARTICLE mode="new"><SUPPLIER_AID>  4711 </SUPPLIER_AID>
+            <ARTICLE_DETAILS>
+                <DESCRIPTION_SHORT>  Kurz &amp;
+                    knapp  </DESCRIPTION_SHORT>
+                <DESCRIPTION_LONG>Zeile 1
+  Zeile &lt;2&gt;
+Zeile 3</DESCRIPTION_LONG>
+            </ARTICLE_DETAILS>
+            <ARTICLE_ORDER_DETAILS><ORDER_UNIT>C62</ORDER_UNIT><CONTENT_UNIT>C62</CONTENT_UNIT><NO_CU_PER_OU>1</NO_CU_PER_OU></ARTICLE_ORDER_DETAILS>
+            <ARTICLE_PRICE_DETAILS>
+                <ARTICLE_PRICE price_type="net_customer"><PRICE_AMOUNT>1.5</PRICE_AMOUNT><PRICE_CURRENCY>EUR</PRICE_CURRENCY><TAX>0.19</TAX></ARTICLE_PRICE>
+            </ARTICLE_PRICE_DETAILS>
+            </ARTICLE></T_NEW_CATALOG></BMECAT>"""
+        importHandler = BMEcatImportHandler("%Y-%m-%d")
+        parseString(bmecat, importHandler)
+        article = importHandler.articles['new'][0]
+
+        self.assertEqual(article.productId, "4711", "Artikelnummer")
+        self.assertEqual(article.details.title, "Kurz& knapp", "title")
+        self.assertEqual(article.details.description, "Zeile 1<br>Zeile<2><br>Zeile 3", "description")
+
+    def __parse(self, importHandler, filename):
         testDataPath = os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "test_data")
-        # import again
         parser = make_parser()
-        importHandler = BMEcatImportHandler("%Y-%m-%d")
         parser.setContentHandler(importHandler)
         parser.setEntityResolver(DTDResolver())
         parser.parse("file:" + os.path.join(testDataPath, filename))
+
+    def __runImporter(self, filename):
+        # import again
+        importHandler = BMEcatImportHandler("%Y-%m-%d")
+        self.__parse(importHandler, filename)
         return importHandler.articles['new'][0]
 
     def __createFullArticle(self):
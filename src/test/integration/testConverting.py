@@ -6,6 +6,7 @@ Created on 28.11.2017
 import os
 import unittest
 
+import compressedFile
 import main
 
 
@@ -95,6 +96,20 @@ class TestMainConverter(unittest.TestCase):
         args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"']
         self.__runAndAssertSystemExitAndNotOutputfile(args, outputFilePath, 5)
 
+    def testCreateExcelFullDataDTDNotExistentButSkipped(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelFullDataWithCategoryTreeAndDTDNotExistent.xml")
+        outputFilePath = os.path.join(self.outputPath, "testCreateExcelFullDataDTDNotExistentButSkipped.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--dtd=skip']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+    def testUnknownDtdMode(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelFullDataWithCategoryTreeAndDTD.xml")
+        outputFilePath = os.path.join(self.outputPath, "testUnknownDtdMode.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--dtd=validate']
+        self.__runAndAssertSystemExitAndNotOutputfile(args, outputFilePath, 2)
+
     def testCreateExcelNestedArticleDetailsException(self):
         inputFilePath = os.path.join(self.testDataPath, "testCreateExcelNestedArticleDetailsException.xml")
         outputFilePath = os.path.join(self.outputPath, "testCreateExcelNestedArticleDetailsException.xlsx")
@@ -130,6 +145,82 @@ class TestMainConverter(unittest.TestCase):
         args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"']
         self.__runAndAssertSystemExitAndNotOutputfile(args, outputFilePath, 7)
 
+    def testPreflightReportsFormulasAndStopsConversion(self):
+        inputFilePath = os.path.join(self.testDataPath, "testConvertExcelToBMEcatExceptionFormulaFound.xlsx")
+        outputFilePath = os.path.join(self.outputPath, "testPreflightReportsFormulasAndStopsConversion.xml")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--preflight=check']
+        self.__runAndAssertSystemExitAndNotOutputfile(args, outputFilePath, 7)
+
+    def testPreflightOnlyWritesNoOutput(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx")
+        outputFilePath = os.path.join(self.outputPath, "testPreflightOnlyWritesNoOutput.xml")
+
+        main.main(['-i', inputFilePath, '-o', outputFilePath, '--preflight=only'])
+        self.assertFalse(os.path.exists(outputFilePath))
+
+    def testCompressedBMEcat(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx")
+        outputFilePath = os.path.join(self.outputPath, "testCompressedBMEcat.xml.gz")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath]
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+        inputFilePath = outputFilePath
+        outputFilePath = os.path.join(self.outputPath, "testCompressedBMEcat.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat=%Y-%m-%d', '--validation=nonstrict']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+    def testCompactBMEcat(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx")
+        outputFilePath = os.path.join(self.outputPath, "testCompactBMEcat.xml")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--xmlstyle=compact']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+    def testUnknownXmlStyle(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx")
+        outputFilePath = os.path.join(self.outputPath, "testUnknownXmlStyle.xml")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--xmlstyle=unknown']
+        self.__runAndAssertSystemExitAndNotOutputfile(args, outputFilePath, 2)
+
+    def testZstdBMEcatNeedsZstandard(self):
+        if compressedFile.zstandard is not None:
+            self.skipTest("Paket zstandard ist installiert.")
+        inputFilePath = os.path.join(self.testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx")
+        outputFilePath = os.path.join(self.outputPath, "testZstdBMEcatNeedsZstandard.xml.zst")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath]
+        self.__runAndAssertSystemExitAndNotOutputfile(args, outputFilePath, 2)
+
+    def testDryRunWritesNoOutput(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx")
+        outputFilePath = os.path.join(self.outputPath, "testDryRunWritesNoOutput.xml")
+
+        main.main(['-i', inputFilePath, '-o', outputFilePath, '--dry-run'])
+        self.assertFalse(os.path.exists(outputFilePath))
+
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelFromBMEcatFullDataStrictValidation.xml")
+        outputFilePath = os.path.join(self.outputPath, "testDryRunWritesNoOutput.xlsx")
+
+        main.main(['-i', inputFilePath, '-o', outputFilePath, '--dateformat=%Y-%m-%d', '--validation=nonstrict', '--dry-run'])
+        self.assertFalse(os.path.exists(outputFilePath))
+
+    def testDryRunReportsInvalidArticles(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateBMEcatFromExcelFullDataNonStrictValidation.xlsx")
+        outputFilePath = os.path.join(self.outputPath, "testDryRunReportsInvalidArticles.xml")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dry-run']
+        self.__runAndAssertSystemExitAndNotOutputfile(args, outputFilePath, 7)
+
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelFromBMEcatFullDataStrictValidation.xml")
+        outputFilePath = os.path.join(self.outputPath, "testDryRunReportsInvalidArticles.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat=%Y-%m-%d', '--dry-run', '--validators=2']
+        self.__runAndAssertSystemExitAndNotOutputfile(args, outputFilePath, 7)
+
     def __runAndAssertSystemExitAndNotOutputfile(self, args, outputFilePath, exitcode):
         with self.assertRaises(SystemExit) as cm:
             main.main(args)
@@ -184,6 +275,27 @@ class TestMainConverter(unittest.TestCase):
         args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"']
         self.__runTestAssertOutputFileExists(args, outputFilePath)
 
+    def testCreateBMEcatFromExcelFullDataStrictValidationWithProcesses(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx")
+        outputFilePath = os.path.join(self.outputPath, "testCreateBMEcatFromExcelFullDataStrictValidationWithProcesses.xml")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--processes=2']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+    def testCreateBMEcatFromExcelFullDataStrictValidationWithSpreadsheetMLReader(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateBMEcatFromExcelFullDataStrictValidation.xlsx")
+        outputFilePath = os.path.join(self.outputPath, "testCreateBMEcatFromExcelFullDataStrictValidationWithSpreadsheetMLReader.xml")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--excelreader=spreadsheetml']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+    def testCreateBMEcatFromCsvMappingMaster(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateBMEcatFromCsvMappingMaster.tsv")
+        outputFilePath = os.path.join(self.outputPath, "testCreateBMEcatFromCsvMappingMaster.xml")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
     def testCreateBMEcatFromExcelFullDataGTINAlsZahl(self):
         inputFilePath = os.path.join(self.testDataPath, "testCreateBMEcatFromExcelFullDataGTINAlsZahl.xlsx")
         outputFilePath = os.path.join(self.outputPath, "testCreateBMEcatFromExcelFullDataGTINAlsZahl.xml")
@@ -212,6 +324,83 @@ class TestMainConverter(unittest.TestCase):
         args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"']
         self.__runTestAssertOutputFileExists(args, outputFilePath)
 
+    def testCreateExcelUserDefinedExtensionHaveFeaturesWithLxmlEngine(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelUserDefinedExtensionHaveFeatures.xml")
+        outputFilePath = os.path.join(self.outputPath, "testCreateExcelUserDefinedExtensionHaveFeaturesWithLxmlEngine.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--engine=lxml']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+    def testCreateExcelUserDefinedExtensionHaveFeaturesWithProcesses(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelUserDefinedExtensionHaveFeatures.xml")
+        outputFilePath = os.path.join(self.outputPath, "testCreateExcelUserDefinedExtensionHaveFeaturesWithProcesses.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--processes=2']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+    def testCreateExcelUserDefinedExtensionHaveFeaturesWithValidators(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelUserDefinedExtensionHaveFeatures.xml")
+        outputFilePath = os.path.join(self.outputPath, "testCreateExcelUserDefinedExtensionHaveFeaturesWithValidators.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--validators=2']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+    def testCreateExcelUserDefinedExtensionHaveFeaturesWithProgressAndSmallReadSize(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelUserDefinedExtensionHaveFeatures.xml")
+        outputFilePath = os.path.join(self.outputPath, "testCreateExcelUserDefinedExtensionHaveFeaturesWithProgressAndSmallReadSize.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--progress=0.001', '--readsize=512']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+    def testCreateExcelUserDefinedExtensionHaveFeaturesStreaming(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelUserDefinedExtensionHaveFeatures.xml")
+        outputFilePath = os.path.join(self.outputPath, "testCreateExcelUserDefinedExtensionHaveFeaturesStreaming.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--excelexport=streaming']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+    def testCreateExcelUserDefinedExtensionHaveFeaturesStreamingWithLxmlEngineAndValidators(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelUserDefinedExtensionHaveFeatures.xml")
+        outputFilePath = os.path.join(self.outputPath, "testCreateExcelUserDefinedExtensionHaveFeaturesStreamingWithLxmlEngineAndValidators.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--excelexport=streaming', '--engine=lxml', '--validators=2']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+    def testStreamingStopsOnErrorWithoutOutput(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelArticleDetailsOutOfArticleException.xml")
+        outputFilePath = os.path.join(self.outputPath, "testStreamingStopsOnErrorWithoutOutput.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--excelexport=streaming']
+        self.__runAndAssertSystemExitAndNotOutputfile(args, outputFilePath, 6)
+
+    def testCreateExcelUserDefinedExtensionHaveFeaturesWriteOnlyWorkbook(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelUserDefinedExtensionHaveFeatures.xml")
+        outputFilePath = os.path.join(self.outputPath, "testCreateExcelUserDefinedExtensionHaveFeaturesWriteOnlyWorkbook.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--workbook=writeonly']
+        self.__runTestAssertOutputFileExists(args, outputFilePath)
+
+    def testUnknownWorkbookMode(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelUserDefinedExtensionHaveFeatures.xml")
+        outputFilePath = os.path.join(self.outputPath, "testUnknownWorkbookMode.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--workbook=unknown']
+        self.__runAndAssertSystemExitAndNotOutputfile(args, outputFilePath, 2)
+
+    def testUnknownExcelExportMode(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelUserDefinedExtensionHaveFeatures.xml")
+        outputFilePath = os.path.join(self.outputPath, "testUnknownExcelExportMode.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--excelexport=unknown']
+        self.__runAndAssertSystemExitAndNotOutputfile(args, outputFilePath, 2)
+
+    def testUnknownImportEngine(self):
+        inputFilePath = os.path.join(self.testDataPath, "testCreateExcelUserDefinedExtensionHaveFeatures.xml")
+        outputFilePath = os.path.join(self.outputPath, "testUnknownImportEngine.xlsx")
+
+        args = ['-i', inputFilePath, '-o', outputFilePath, '--dateformat="%Y-%m-%d"', '--engine=unknown']
+        self.__runAndAssertSystemExitAndNotOutputfile(args, outputFilePath, 2)
+
     def testDateWithoutType(self):
         inputFilePath = os.path.join(self.testDataPath, "testDateWithoutType.xml")
         outputFilePath = os.path.join(self.outputPath, "testDateWithoutType.xlsx")
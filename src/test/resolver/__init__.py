@@ -0,0 +1 @@
+from .dtdResolverTest import DTDResolverTest
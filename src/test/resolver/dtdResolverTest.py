@@ -0,0 +1,72 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from resolver import DTDResolver
+
+
+class DTDResolverTest(unittest.TestCase):
+
+    def testResolveBMEcatDTDFromDocuments(self):
+        resolver = DTDResolver()
+        inputSource = resolver.resolveEntity(None, "bmecat_new_catalog_1_2.dtd")
+
+        self.assertTrue(inputSource.getSystemId().endswith(os.path.join("1.2", "bmecat_new_catalog_1_2.dtd")), "Pfad der DTD")
+        with open(inputSource.getSystemId(), "rb") as dtdFile:
+            self.assertEqual(inputSource.getByteStream().read(), dtdFile.read(), "Inhalt der DTD")
+        self.assertEqual(resolver.resolveEntity(None, "unknown.dtd"), "unknown.dtd", "relativer Pfad neben dem Dokument")
+
+    def testOtherExternalEntitiesAreNotLoaded(self):
+        resolver = DTDResolver()
+        for systemId in [ "http://www.example.com/unknown.dtd", "file:///etc/passwd", "/etc/passwd", os.path.join("..", "secret.txt") ]:
+            with self.subTest(systemId=systemId):
+                inputSource = resolver.resolveEntity(None, systemId)
+                self.assertEqual(inputSource.getSystemId(), systemId)
+                self.assertEqual(inputSource.getByteStream().read(), b"")
+
+    def testIndexIsBuiltOnceAndInvalidatedByMtime(self):
+        with tempfile.TemporaryDirectory() as directory:
+            versionPath = os.path.join(directory, "1.2")
+            os.makedirs(versionPath)
+            self.__writeFile(os.path.join(versionPath, "bmecat_1_2.dtd"), b"<!ELEMENT BMECAT ANY>", 1000000000)
+
+            resolver = DTDResolver(directory)
+            self.assertEqual(list(resolver.bmecatVersions.keys()), ["bmecat_1_2.dtd"])
+            self.assertIs(DTDResolver(directory).bmecatVersions, resolver.bmecatVersions, "Index wurde neu erstellt.")
+
+            self.__writeFile(os.path.join(versionPath, "bmecat_2005.dtd"), b"<!ELEMENT BMECAT ANY>", 1000000000)
+            os.utime(versionPath, (1000000100, 1000000100))
+            self.assertEqual(sorted(DTDResolver(directory).bmecatVersions.keys()), ["bmecat_1_2.dtd", "bmecat_2005.dtd"])
+
+    def testSecondResolverDoesNotSearchTheDirectoriesAgain(self):
+        with tempfile.TemporaryDirectory() as directory:
+            versionPath = os.path.join(directory, "2005")
+            os.makedirs(versionPath)
+            self.__writeFile(os.path.join(versionPath, "bmecat_2005.dtd"), b"<!ELEMENT BMECAT ANY>", 1000000000)
+            DTDResolver(directory)
+
+            with mock.patch("resolver.dtdResolver.os.scandir", wraps=os.scandir) as scandir:
+                resolver = DTDResolver(directory)
+            scandir.assert_not_called()
+            self.assertEqual(list(resolver.bmecatVersions.keys()), ["bmecat_2005.dtd"])
+
+    def testContentIsCachedAndInvalidatedByMtime(self):
+        with tempfile.TemporaryDirectory() as directory:
+            dtdPath = os.path.join(directory, "bmecat.dtd")
+            self.__writeFile(dtdPath, b"<!ELEMENT BMECAT ANY>", 1000000000)
+            resolver = DTDResolver(directory)
+            self.assertEqual(resolver.resolveEntity(None, "bmecat.dtd").getByteStream().read(), b"<!ELEMENT BMECAT ANY>")
+
+            self.__writeFile(dtdPath, b"<!ELEMENT BMECAT EMPTY>", 1000000100)
+            self.assertEqual(resolver.resolveEntity(None, "bmecat.dtd").getByteStream().read(), b"<!ELEMENT BMECAT EMPTY>")
+
+    def __writeFile(self, path, content, mtime):
+        with open(path, "wb") as file:
+            file.write(content)
+        os.utime(path, (mtime, mtime))
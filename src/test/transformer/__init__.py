@@ -1 +1,2 @@
 from .separatorTest import SeparatorTransformerTest
+from .dateTransformerTest import DateTransformerTest
@@ -0,0 +1,50 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+from datetime import datetime
+import unittest
+
+from transformer import DateTransformer
+
+
+class DateTransformerTest(unittest.TestCase):
+
+    def testIsoFormatLikeStrptime(self):
+        dateTransformer = DateTransformer("%Y-%m-%d")
+        for value in ["2018-01-08", "2018-9-18", "2018-02-29", "2018-13-01", "18-01-01", "2018-01-08 ", "08.01.2018"]:
+            with self.subTest(value=value):
+                try:
+                    expectedDate = datetime.strptime(value, "%Y-%m-%d")
+                except ValueError as ve:
+                    with self.assertRaisesRegex(ValueError, str(ve)):
+                        dateTransformer.transform(value)
+                else:
+                    self.assertEqual(dateTransformer.transform(value), expectedDate)
+
+    def testOtherFormats(self):
+        self.assertEqual(DateTransformer("%d.%m.%Y").transform("08.01.2018"), datetime(2018, 1, 8))
+        self.assertEqual(DateTransformer("%Y%m%d").transform("20180108"), datetime(2018, 1, 8))
+        self.assertRaises(ValueError, DateTransformer("%d.%m.%Y").transform, "2018-01-08")
+
+    def testCacheIsKeyedByValueAndFormat(self):
+        dateTransformer = DateTransformer("%Y-%d-%m")
+        self.assertEqual(dateTransformer.transform("2018-01-08"), datetime(2018, 8, 1))
+        self.assertEqual(dateTransformer.transform("2018-01-08"), datetime(2018, 8, 1))
+        self.assertEqual((dateTransformer.hits, dateTransformer.misses), (1, 1))
+
+        isoDateTransformer = DateTransformer("%Y-%m-%d")
+        self.assertEqual(isoDateTransformer.transform("2018-01-08"), datetime(2018, 1, 8))
+        self.assertEqual((isoDateTransformer.hits, isoDateTransformer.misses), (0, 1))
+
+        isoDateTransformer.addStatistics(5, 2)
+        self.assertEqual((isoDateTransformer.hits, isoDateTransformer.misses), (5, 3))
+
+    def testCacheIsBounded(self):
+        dateTransformer = DateTransformer("%j/%Y")
+        for day in range(1, 366):
+            for year in range(2000, 2020):
+                dateTransformer.transform("{0}/{1}".format(day, year))
+        self.assertEqual(dateTransformer.misses, 365 * 20)
+        self.assertTrue(len(DateTransformer._cache) <= DateTransformer._maxCacheSize)
@@ -1 +1,2 @@
+from transformer.dates import DateTransformer
 from transformer.separators import SeparatorTransformer
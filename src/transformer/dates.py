@@ -0,0 +1,66 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+from collections import OrderedDict
+from datetime import datetime
+import re
+
+
+class DateTransformer(object):
+    '''
+    Wandelt Datumsangaben mit dem angegebenen Datumsformat in datetime-Objekte um.
+
+    In preislastigen Katalogen wiederholen sich wenige Gueltigkeitsdaten sehr oft. Deshalb werden die Ergebnisse in
+    einem begrenzten Cache gehalten, der nach Text und Format gefuehrt und von allen Instanzen geteilt wird. Fuer das
+    ISO-Format %Y-%m-%d wird strptime gar nicht erst bemueht. Treffer und Fehlversuche werden je Instanz gezaehlt.
+    '''
+
+    _isoFormat = "%Y-%m-%d"
+    _isoDate = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+
+    _maxCacheSize = 4096
+    _cache = OrderedDict()
+
+    def __init__(self, dateFormat):
+        '''
+        Constructor
+        @param dateFormat Datumsformat wie bei datetime.strptime
+        '''
+        self._dateFormat = dateFormat
+        self.hits = 0
+        self.misses = 0
+
+    def transform(self, value):
+        key = (value, self._dateFormat)
+        try:
+            date = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            date = self._parse(value)
+            self._cache[key] = date
+            if len(self._cache) > self._maxCacheSize:
+                self._cache.popitem(last=False)
+            return date
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return date
+
+    def _parse(self, value):
+        if self._dateFormat == self._isoFormat:
+            isoDate = self._isoDate.fullmatch(value)
+            if isoDate is not None:
+                try:
+                    return datetime(int(isoDate.group(1)), int(isoDate.group(2)), int(isoDate.group(3)))
+                except ValueError:
+                    # strptime liefert die gewohnte Fehlermeldung
+                    pass
+        return datetime.strptime(value, self._dateFormat)
+
+    def addStatistics(self, hits, misses):
+        '''
+        Zaehler eines anderen DateTransformers (z.B. aus einem Arbeitsprozess) uebernehmen
+        '''
+        self.hits += hits
+        self.misses += misses
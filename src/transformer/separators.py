@@ -55,6 +55,12 @@ class SeparatorTransformer(object):
             self._decimalSeparator = None
             self._thousandSeparator = None
 
+    def separatorsDetermined(self):
+        '''
+        gibt an, ob die Trennzeichen vorgegeben oder schon erkannt wurden
+        '''
+        return self._decimalSeparator is not None
+
     def transform(self, value):
         if value is None:
             return None
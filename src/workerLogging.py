@@ -0,0 +1,57 @@
+'''
+Created on 18.10.2026
+
+@author: henrik.pilz
+'''
+import logging
+
+
+class _LogRecordCollector(logging.Handler):
+    '''
+    sammelt die Meldungen eines Arbeitsprozesses, damit der Hauptprozess sie in der richtigen Reihenfolge ausgeben kann
+    '''
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        # Argumente und Tracebacks lassen sich nicht immer an den Hauptprozess uebergeben
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.records.append(record)
+
+
+_logRecordCollector = None
+
+
+def initializeWorkerLogging(logLevel):
+    '''
+    Initializer fuer die Arbeitsprozesse eines ProcessPoolExecutors: statt der Handler des Hauptprozesses
+    werden alle Meldungen ab logLevel gesammelt.
+    '''
+    global _logRecordCollector
+    _logRecordCollector = _LogRecordCollector()
+    rootLogger = logging.getLogger()
+    for handler in list(rootLogger.handlers):
+        rootLogger.removeHandler(handler)
+    rootLogger.addHandler(_logRecordCollector)
+    rootLogger.setLevel(logLevel)
+
+
+def takeLogRecords():
+    '''
+    im Arbeitsprozess gesammelte Meldungen abholen
+    '''
+    logRecords = _logRecordCollector.records
+    _logRecordCollector.records = []
+    return logRecords
+
+
+def emitLogRecords(logRecords):
+    '''
+    Meldungen eines Arbeitsprozesses im Hauptprozess ausgeben
+    '''
+    for logRecord in logRecords:
+        logging.getLogger(logRecord.name).handle(logRecord)